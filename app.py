@@ -7,6 +7,9 @@ import os
 from api.health import health_bp
 from api.asteroids import asteroids_bp
 from backend.api.game import game_bp
+from backend.api.mitigation import mitigation_bp
+from backend.api.environment import environment_bp
+from backend.services.tsunami_service import prepare_travel_time_graphs
 from utils.errors import handle_error
 from config import config, setup_logging, get_logger, RequestLoggingMiddleware
 
@@ -50,6 +53,15 @@ def create_app():
     # Game mode endpoints - separate from simulation
     app.register_blueprint(game_bp, url_prefix='/api')
 
+    # Mitigation analyses run as background jobs
+    app.register_blueprint(mitigation_bp, url_prefix='/api')
+
+    # Environmental intensity map tiles
+    app.register_blueprint(environment_bp, url_prefix='/api')
+
+    # Build the global tsunami travel-time graphs in the background
+    prepare_travel_time_graphs(config.TSUNAMI_PRELOAD_RESOLUTIONS_DEG)
+
     # Register error handlers
     app.register_error_handler(Exception, handle_error)
     logger.info("Registered error handlers")
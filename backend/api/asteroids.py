@@ -1,12 +1,15 @@
 from flask import Blueprint, jsonify, request
 from datetime import datetime, timedelta
-from backend.clients.nasa_api import nasa_api_client
 from backend.services.asteroid_service import (
     get_cached_asteroids, 
     find_asteroid_in_cache, 
     get_complete_asteroid_data
 )
+from backend.services.catalog_service import find_asteroid_in_catalog
 from backend.services.elevation_service import get_impact_context
+from backend.services.feed_service import (
+    FeedRequestBudgetError, get_asteroids_by_date, get_close_approaches, parse_date_range
+)
 
 asteroids_bp = Blueprint('asteroids', __name__)
 
@@ -16,14 +19,19 @@ CACHED_ASTEROIDS = get_cached_asteroids()
 def _get_asteroid_data(asteroid_id: str):
     """
     Helper function to retrieve asteroid data.
-    First checks the local cache, then falls back to the live API.
+    First checks the local cache and catalog, then falls back to the live API.
     """
     # 1. Check the cache first
     asteroid = find_asteroid_in_cache(asteroid_id, CACHED_ASTEROIDS)
     if asteroid:
         return asteroid
+
+    # 2. Then the bulk-built catalog
+    asteroid = find_asteroid_in_catalog(asteroid_id)
+    if asteroid:
+        return asteroid
     
-    # 2. If not in cache, try the live API
+    # 3. If not in either, try the live API
     return get_complete_asteroid_data(asteroid_id)
 
 
@@ -44,13 +52,14 @@ def list_cached_asteroids():
 def get_current_asteroids():
     """
     Gets a list of asteroids approaching Earth in the next 7 days.
-    This endpoint always uses the live NASA API.
+    Served from the day-bucketed feed cache; only days not yet cached
+    (usually just the newest one) are fetched from the NASA API.
     """
     try:
         start_date = datetime.now().strftime('%Y-%m-%d')
         end_date = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
         
-        result = nasa_api_client.get_asteroids_by_date(start_date, end_date)
+        result = get_asteroids_by_date(start_date, end_date)
         
         if result["error"]:
             return jsonify({"error": result["error"]}), 500
@@ -60,6 +69,34 @@ def get_current_asteroids():
         return jsonify({"error": "An internal server error occurred."}), 500
 
 
+@asteroids_bp.route('/asteroids/approaches', methods=['GET'])
+def list_close_approaches():
+    """
+    Lists close approaches between start_date and end_date (YYYY-MM-DD),
+    in time order. Pass hazardous=true for potentially hazardous asteroids only.
+    """
+    start_date = request.args.get('start_date')
+    end_date = request.args.get('end_date')
+    if not start_date or not end_date:
+        return jsonify({"error": "start_date and end_date are required (YYYY-MM-DD)."}), 400
+    hazardous_only = request.args.get('hazardous', '').lower() in ('1', 'true', 'yes')
+
+    try:
+        parse_date_range(start_date, end_date)
+    except ValueError as e:
+        return jsonify({"error": f"Invalid date range: {e}"}), 400
+
+    try:
+        result = get_close_approaches(start_date, end_date, hazardous_only)
+        if result["error"]:
+            return jsonify({"error": result["error"]}), 500
+        return jsonify({"approaches": result["data"], "count": len(result["data"])}), 200
+    except FeedRequestBudgetError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
 @asteroids_bp.route('/asteroids/<string:asteroid_id>', methods=['GET'])
 def get_asteroid(asteroid_id):
     """
@@ -0,0 +1,241 @@
+from flask import Blueprint, Response, jsonify, request
+
+from backend.physics.environmental import EnvironmentalEffects
+from backend.services.population_service import get_population_exposure
+from backend.services.raster_tile_service import FIELDS, TILE_SIZE, render_tile, tile_value_encoding
+from backend.services.tsunami_service import (
+    estimate_coastal_runup,
+    TravelTimeGraphNotReady,
+    get_isochrones,
+    get_travel_time_map,
+    snap_travel_time_resolution
+)
+
+environment_bp = Blueprint('environment', __name__)
+
+
+def _coordinate_args():
+    """Parses lat/lng query parameters; returns (lat, lng, error response)."""
+    try:
+        lat = float(request.args['lat'])
+        lng = float(request.args['lng'])
+    except KeyError:
+        return None, None, (jsonify({"error": "lat and lng are required parameters."}), 400)
+    except ValueError:
+        return None, None, (jsonify({"error": "lat and lng must be valid numbers."}), 400)
+
+    if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        return None, None, (jsonify({"error": "lat must be between -90 and 90 and lng between -180 and 180."}), 400)
+    return lat, lng, None
+
+
+@environment_bp.route('/environment/fields', methods=['GET'])
+def list_fields():
+    """Lists the raster fields with their units and display ranges."""
+    return jsonify({
+        name: {
+            "description": spec["description"],
+            "units": spec["units"],
+            "scale": spec["scale"],
+            "range": list(spec["range"]),
+            "f16_encoding": tile_value_encoding(name)
+        }
+        for name, spec in FIELDS.items()
+    }), 200
+
+
+@environment_bp.route('/environment/tiles/<string:field>/<int:z>/<int:x>/<int:y>.<string:fmt>', methods=['GET'])
+def get_tile(field: str, z: int, x: int, y: int, fmt: str):
+    """
+    Returns an XYZ tile of an impact's intensity field.
+    Query parameters: energy_j, lat, lng. Format 'png' is colorized;
+    'f16' is raw little-endian float16 values (256 x 256, row-major);
+    for log-scale fields these are log10 of the value (X-Tile-Encoding).
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        energy_j = float(request.args['energy_j'])
+    except (KeyError, ValueError):
+        return jsonify({"error": "energy_j is required and must be a valid number."}), 400
+
+    try:
+        tile = render_tile(field, z, x, y, energy_j, lat, lng, fmt)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+    if fmt == 'png':
+        response = Response(tile, mimetype='image/png')
+    else:
+        response = Response(tile, mimetype='application/octet-stream')
+        response.headers['X-Tile-Shape'] = f"{TILE_SIZE},{TILE_SIZE}"
+        response.headers['X-Tile-Dtype'] = '<f2'
+        response.headers['X-Tile-Encoding'] = tile_value_encoding(field)
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    return response, 200
+
+
+def _resolution_arg():
+    """Parses the optional resolution_deg parameter, snapped to a supported grid (0.25, 0.5, 1 or 2 degrees)."""
+    resolution_deg = float(request.args.get('resolution_deg', 0.5))
+    if not 0.1 <= resolution_deg <= 5.0:
+        raise ValueError("resolution_deg must be between 0.1 and 5.0")
+    return snap_travel_time_resolution(resolution_deg)
+
+
+def _graph_not_ready(e: TravelTimeGraphNotReady):
+    response = jsonify({"error": str(e)})
+    response.headers['Retry-After'] = '30'
+    return response, 503
+
+
+@environment_bp.route('/environment/tsunami/isochrones', methods=['GET'])
+def get_tsunami_isochrones():
+    """
+    Returns tsunami arrival isochrones for an ocean impact as GeoJSON.
+    Query parameters: lat, lng, optional resolution_deg and levels
+    (comma-separated hours).
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        resolution_deg = _resolution_arg()
+        levels = request.args.get('levels')
+        levels_h = [float(level) for level in levels.split(',')] if levels else None
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        geojson = get_isochrones(lat, lng, resolution_deg, levels_h)
+        if geojson is None:
+            return jsonify({"error": "No bathymetry data or no ocean near the impact location."}), 404
+        return jsonify(geojson), 200
+    except TravelTimeGraphNotReady as e:
+        return _graph_not_ready(e)
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@environment_bp.route('/environment/tsunami/travel-time', methods=['GET'])
+def get_tsunami_travel_time():
+    """
+    Returns the tsunami travel-time raster (seconds, NaN on land) as raw
+    little-endian float32, row-major from the southernmost row. Grid
+    geometry is given in the X-Raster-* headers.
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        resolution_deg = _resolution_arg()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        travel_map = get_travel_time_map(lat, lng, resolution_deg)
+        if travel_map is None:
+            return jsonify({"error": "No bathymetry data or no ocean near the impact location."}), 404
+    except TravelTimeGraphNotReady as e:
+        return _graph_not_ready(e)
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+    raster = travel_map["travel_time_s"]
+    response = Response(raster.astype('<f4').tobytes(), mimetype='application/octet-stream')
+    response.headers['X-Raster-Shape'] = ','.join(str(n) for n in raster.shape)
+    response.headers['X-Raster-Dtype'] = '<f4'
+    response.headers['X-Raster-Lats'] = f"{travel_map['lats'][0]},{travel_map['lats'][-1]}"
+    response.headers['X-Raster-Lons'] = f"{travel_map['lons'][0]},{travel_map['lons'][-1]}"
+    response.headers['X-Source-Cell'] = f"{travel_map['source_cell']['lat']},{travel_map['source_cell']['lon']}"
+    response.headers['X-Raster-Resolution'] = str(travel_map['resolution_deg'])
+    return response, 200
+
+
+@environment_bp.route('/environment/tsunami/runup', methods=['GET'])
+def get_tsunami_runup():
+    """
+    Ranks coastal points by estimated tsunami run-up for an ocean impact
+    (land impacts return impact_type 'land' and no points).
+    Query parameters: energy_j, lat, lng, optional top_n and max_distance_km.
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        energy_j = float(request.args['energy_j'])
+        top_n = int(request.args.get('top_n', 50))
+        max_distance_km = request.args.get('max_distance_km')
+        max_distance_km = float(max_distance_km) if max_distance_km else None
+    except KeyError:
+        return jsonify({"error": "energy_j is a required parameter."}), 400
+    except ValueError:
+        return jsonify({"error": "energy_j, top_n and max_distance_km must be valid numbers."}), 400
+    if energy_j <= 0 or not 1 <= top_n <= 1000:
+        return jsonify({"error": "energy_j must be positive and top_n between 1 and 1000."}), 400
+
+    try:
+        result = estimate_coastal_runup(energy_j, lat, lng, top_n, max_distance_km)
+        if result is None:
+            return jsonify({"error": "No coastal point or bathymetry data available."}), 404
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@environment_bp.route('/environment/population', methods=['GET'])
+def get_population():
+    """
+    Population in concentric rings around a point.
+    Query parameters: lat, lng and radii_km (comma-separated ring radii).
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        radii_km = [float(r) for r in request.args.get('radii_km', '').split(',') if r.strip()]
+    except ValueError:
+        return jsonify({"error": "radii_km must be a comma-separated list of numbers."}), 400
+    if not radii_km or len(radii_km) > 50 or min(radii_km) <= 0:
+        return jsonify({"error": "radii_km must contain between 1 and 50 positive radii."}), 400
+
+    try:
+        exposure = get_population_exposure(lat, lng, {f"{r:g}": r for r in radii_km})
+        if exposure is None:
+            return jsonify({"error": "No population data available."}), 404
+        return jsonify({"impact_coordinates": (lat, lng), "rings": list(exposure.values())}), 200
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@environment_bp.route('/environment/cities', methods=['GET'])
+def get_affected_cities():
+    """
+    Effects at the cities around an impact site.
+    Query parameters: energy_j, lat, lng, and either radius_km or k (nearest
+    cities, default 10); optional min_population.
+    """
+    lat, lng, error = _coordinate_args()
+    if error:
+        return error
+    try:
+        energy_j = float(request.args['energy_j'])
+        radius_km = request.args.get('radius_km')
+        radius_km = float(radius_km) if radius_km else None
+        k = int(request.args.get('k', 10))
+        min_population = int(request.args.get('min_population', 0))
+    except KeyError:
+        return jsonify({"error": "energy_j is a required parameter."}), 400
+    except ValueError:
+        return jsonify({"error": "energy_j, radius_km, k and min_population must be valid numbers."}), 400
+    if energy_j <= 0 or not 1 <= k <= 1000 or (radius_km is not None and radius_km <= 0):
+        return jsonify({"error": "energy_j and radius_km must be positive and k between 1 and 1000."}), 400
+
+    try:
+        result = EnvironmentalEffects.affected_cities(energy_j, lat, lng, radius_km, k, min_population)
+        return jsonify(result), 200
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
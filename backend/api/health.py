@@ -1,8 +1,30 @@
 from flask import Blueprint, jsonify
 
+from backend.clients.rate_limiter import rate_limiters_snapshot
+from backend.clients.resilience import circuit_breakers_snapshot
+from backend.clients.response_cache import get_response_cache
+from backend.clients.single_flight import upstream_flights
+from backend.clients.transport import upstream_metrics
+from backend.services.feed_service import get_feed_cache
+
 health_bp = Blueprint('health', __name__)
 
 @health_bp.route('/health')
 def health_check():
     """Health check endpoint."""
     return jsonify({"status": "ok"}), 200
+
+
+@health_bp.route('/health/upstream')
+def upstream_health():
+    """Per-host request counts, retries, failures and latency of upstream API calls."""
+    cache = get_response_cache()
+    return jsonify({
+        "status": "ok",
+        "upstream": upstream_metrics.snapshot(),
+        "cache": cache.stats() if cache else None,
+        "coalescing": upstream_flights.stats(),
+        "circuits": circuit_breakers_snapshot(),
+        "rate_limits": rate_limiters_snapshot(),
+        "feed": get_feed_cache().stats(),
+    }), 200
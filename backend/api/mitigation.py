@@ -0,0 +1,130 @@
+from flask import Blueprint, Response, jsonify, request, url_for
+
+from backend.services.deflection_surface_service import (
+    SURFACE_FIELDS,
+    get_deflection_surface,
+    parse_grid
+)
+from backend.services.job_queue import JobQueueFullError
+from backend.services.mitigation_service import (
+    MITIGATION_TASKS,
+    get_job_queue,
+    submit_mitigation_job
+)
+
+# Mitigation analyses can take seconds to minutes, so the /mitigation/jobs
+# endpoints only submit to or inspect the background job queue. The
+# /mitigation/surfaces endpoints are the exception: they compute a (bounded,
+# LRU-cached) deflection surface on the request thread and may look the
+# asteroid up from the live APIs.
+mitigation_bp = Blueprint('mitigation', __name__)
+
+
+@mitigation_bp.route('/mitigation/tasks', methods=['GET'])
+def list_mitigation_tasks():
+    """Lists the analyses that can be submitted as jobs."""
+    return jsonify({
+        name: {
+            "description": spec["description"],
+            "required_params": spec["required_params"]
+        }
+        for name, spec in MITIGATION_TASKS.items()
+    }), 200
+
+
+@mitigation_bp.route('/mitigation/jobs', methods=['POST'])
+def submit_job():
+    """
+    Submits a mitigation analysis.
+    Body: {"task": "<task name>", "params": {...}}
+    Identical submissions return the existing (possibly already completed) job.
+    """
+    data = request.get_json(silent=True)
+    if not data or 'task' not in data:
+        return jsonify({"error": "Request body must include 'task' and 'params'"}), 400
+
+    params = data.get('params', {})
+    if not isinstance(params, dict):
+        return jsonify({"error": "'params' must be an object"}), 400
+
+    try:
+        job = submit_mitigation_job(data['task'], params)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except JobQueueFullError as e:
+        return jsonify({"error": str(e)}), 429
+
+    status_code = 200 if job.status == "completed" else 202
+    response = jsonify(job.to_dict())
+    response.headers['Location'] = url_for('mitigation.get_job', job_id=job.job_id)
+    return response, status_code
+
+
+@mitigation_bp.route('/mitigation/jobs/<string:job_id>', methods=['GET'])
+def get_job(job_id: str):
+    """Returns status and progress of a job, and its result once completed."""
+    job = get_job_queue().get(job_id)
+    if not job:
+        return jsonify({"error": f"Job {job_id} not found"}), 404
+    return jsonify(job.to_dict()), 200
+
+
+@mitigation_bp.route('/mitigation/jobs/<string:job_id>', methods=['DELETE'])
+def cancel_job(job_id: str):
+    """Cancels a queued or running job."""
+    job = get_job_queue().cancel(job_id)
+    if not job:
+        return jsonify({"error": f"Job {job_id} not found"}), 404
+    return jsonify(job.to_dict(include_result=False)), 200
+
+
+def _surface_for_request(asteroid_id: str):
+    """Returns (surface, error response) for the grid given in the query string."""
+    try:
+        grid = parse_grid(request.args.to_dict())
+    except ValueError as e:
+        return None, (jsonify({"error": str(e)}), 400)
+
+    surface = get_deflection_surface(asteroid_id, grid)
+    if surface is None:
+        return None, (jsonify({"error": f"Orbital data or an upcoming close approach is not available "
+                                        f"for asteroid {asteroid_id}."}), 404)
+    return surface, None
+
+
+@mitigation_bp.route('/mitigation/surfaces/<string:asteroid_id>', methods=['GET'])
+def get_surface_meta(asteroid_id: str):
+    """
+    Returns the axes and settings of an asteroid's deflection surface.
+    Grid settings (e.g. lead_time_max_years, n_delta_v) are query parameters.
+    """
+    try:
+        surface, error = _surface_for_request(asteroid_id)
+        if error:
+            return error
+        return jsonify(surface["meta"]), 200
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
+
+
+@mitigation_bp.route('/mitigation/surfaces/<string:asteroid_id>/<string:field>', methods=['GET'])
+def get_surface_data(asteroid_id: str, field: str):
+    """
+    Returns one surface as raw little-endian float32 bytes (row-major,
+    rows = lead time, columns = delta-v); see the meta endpoint for axes.
+    """
+    if field not in SURFACE_FIELDS:
+        return jsonify({"error": f"Unknown surface field '{field}'. Available: {list(SURFACE_FIELDS)}"}), 400
+
+    try:
+        surface, error = _surface_for_request(asteroid_id)
+        if error:
+            return error
+        data = surface["arrays"][field]
+        response = Response(data.tobytes(), mimetype='application/octet-stream')
+        response.headers['X-Surface-Shape'] = ','.join(str(n) for n in data.shape)
+        response.headers['X-Surface-Dtype'] = '<f4'
+        response.headers['Cache-Control'] = 'public, max-age=3600'
+        return response, 200
+    except Exception as e:
+        return jsonify({"error": "An internal server error occurred."}), 500
@@ -0,0 +1,195 @@
+"""
+Asyncio counterpart of BaseAPIClient, built on aiohttp.
+
+Each client owns a pooled aiohttp session (keep-alive, per-host connection
+limit) bound to the event loop it was opened on, a semaphore bounding the
+number of requests in flight, and a total timeout per request. Retries,
+backoff, the interactive-lane deadline and metrics follow the sync transport, and request/response
+parsing is shared with the sync clients, so both return the same shapes.
+Both flavours read and write the same persistent response cache, share
+one upstream call for identical concurrent requests, and respect the same
+per-host circuit breakers.
+
+Use a client as an async context manager, and run_async() to drive a
+fan-out from synchronous (Flask) code:
+
+    async def fetch(ids):
+        async with AsyncNasaApiClient() as nasa:
+            return await asyncio.gather(*(nasa.get_asteroid_by_id(i) for i in ids))
+
+    results = run_async(fetch(ids))
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+from config import config
+from .base_api_client import BaseAPIClient
+from .rate_limiter import INTERACTIVE, TokenBucketLimiter, current_priority, rate_limited_error
+from .resilience import circuit_open_error, get_circuit_breaker, schedule_refresh
+from .response_cache import ResponseCache, get_response_cache
+from .single_flight import upstream_flights
+from .transport import MIN_ATTEMPT_S, RETRY_STATUS_CODES, backoff_delay, retry_fits, upstream_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def run_async(awaitable: Awaitable[T]) -> T:
+    """Runs a coroutine to completion from synchronous code on a fresh event loop."""
+    return asyncio.run(awaitable)
+
+
+class AsyncBaseAPIClient:
+    """A base client for making concurrent API requests."""
+    def __init__(self, base_url, api_key=None, timeout=10, max_concurrency: int = None,
+                 rate_limiter: TokenBucketLimiter = None):
+        self.base_url = base_url
+        self.api_key = api_key
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.max_concurrency = max_concurrency or config.ASYNC_HTTP_MAX_CONCURRENCY
+        self._session = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def open(self):
+        """Creates the pooled session on the running event loop."""
+        import aiohttp
+
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=config.HTTP_POOL_MAXSIZE)
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method, endpoint, params=None, json_data=None, cache_ttl=None,
+                       refresh=False) -> Tuple[Optional[Any], Optional[str]]:
+        """Makes a request to the API; returns (data, error) like BaseAPIClient._request."""
+        url = f"{self.base_url}{endpoint}"
+        params = dict(params or {})
+        if self.api_key:
+            params['api_key'] = self.api_key
+
+        if method == "GET" or cache_ttl:
+            key = ResponseCache.make_key(method, url, params, json_data)
+            return await upstream_flights.do_async(
+                f"{key}:refresh" if refresh else key,
+                lambda: self._cached_request(method, url, params, json_data, cache_ttl, key, refresh)
+            )
+        return await self._fetch(method, url, params, json_data)
+
+    async def _cached_request(self, method, url, params, json_data, cache_ttl, key, refresh=False):
+        cache = get_response_cache() if cache_ttl else None
+        if not cache:
+            return await self._fetch(method, url, params, json_data)
+
+        entry = await asyncio.to_thread(cache.lookup, key)
+        if refresh:
+            return await self._fetch(method, url, params, json_data, cache_ttl, key, entry, serve_stale=False)
+        if entry and entry.is_fresh():
+            return entry.data, None
+        if entry and entry.is_servable_stale(config.HTTP_CACHE_MAX_STALE_S):
+            # Stale-while-revalidate on the refresh pool, which outlives this event loop
+            if not entry.is_negative():
+                refresher = BaseAPIClient(self.base_url, timeout=self.timeout, rate_limiter=self.rate_limiter)
+                schedule_refresh(key, lambda: refresher._fetch(method, url, params, json_data, cache_ttl, key, entry))
+            return entry.data, None
+        if entry and entry.is_negative():
+            return None, entry.error
+        return await self._fetch(method, url, params, json_data, cache_ttl, key, entry)
+
+    async def _fetch(self, method, url, params, json_data, cache_ttl=None, key=None, entry=None,
+                     serve_stale=True):
+        """Goes upstream (unless the circuit is open or the budget is spent) and records the outcome in the cache."""
+        host = urlsplit(url).netloc
+        breaker = get_circuit_breaker(host)
+        if not breaker.allow_request():
+            return None, circuit_open_error(host)
+        if self.rate_limiter and not await self.rate_limiter.acquire_async():
+            if serve_stale and entry and entry.has_data:
+                return entry.data, None
+            return None, rate_limited_error(self.rate_limiter.name)
+
+        status, data, error, headers = await self._send(method, url, params, json_data,
+                                                        entry.validators() if entry else None)
+        breaker.record(status)
+        if status == 429 and self.rate_limiter:
+            await asyncio.to_thread(self.rate_limiter.drain)
+
+        cache = get_response_cache() if cache_ttl else None
+        if not cache:
+            return data, error
+        return await asyncio.to_thread(cache.record_response, key, url, entry, cache_ttl,
+                                       status, data, error, headers, serve_stale)
+
+    async def _send(self, method, url, params, json_data, headers):
+        """
+        Sends a request with retries; returns (status, data, error, response headers).
+
+        Interactive requests must finish, retries included, within self.timeout;
+        the background lane keeps the full retry budget.
+        """
+        import aiohttp
+
+        await self.open()
+        host = urlsplit(url).netloc
+        attempt = 0
+        async with self._semaphore:
+            start = time.perf_counter()
+            deadline = start + self.timeout if current_priority() == INTERACTIVE else None
+            while True:
+                timeout = self._session.timeout
+                if deadline is not None:
+                    remaining = max(deadline - time.perf_counter(), MIN_ATTEMPT_S)
+                    timeout = aiohttp.ClientTimeout(total=min(self.timeout, remaining))
+                try:
+                    async with self._session.request(method, url, params=params, json=json_data,
+                                                     headers=headers, timeout=timeout) as response:
+                        status = response.status
+                        delay = backoff_delay(attempt, config.HTTP_BACKOFF_BASE_S, config.HTTP_BACKOFF_MAX_S,
+                                              response.headers.get("Retry-After"))
+                        if (status not in RETRY_STATUS_CODES or attempt >= config.HTTP_MAX_RETRIES
+                                or not retry_fits(deadline, delay)):
+                            upstream_metrics.record(host, time.perf_counter() - start, status, attempt, status >= 400)
+                            if status >= 400:
+                                return status, None, f"{status} Error: {response.reason} for url: {response.url}", response.headers
+                            if status == 304:
+                                return status, None, None, response.headers
+                            return status, await response.json(content_type=None), None, response.headers
+                        logger.warning(f"{method} {host} returned {status}; retrying in {delay:.2f}s")
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    delay = backoff_delay(attempt, config.HTTP_BACKOFF_BASE_S, config.HTTP_BACKOFF_MAX_S)
+                    if attempt >= config.HTTP_MAX_RETRIES or not retry_fits(deadline, delay):
+                        upstream_metrics.record(host, time.perf_counter() - start, None, attempt, True)
+                        return None, None, f"{e.__class__.__name__}: {e}" if str(e) else e.__class__.__name__, {}
+                    logger.warning(f"{method} {host} failed ({e.__class__.__name__}); retrying in {delay:.2f}s")
+                except (aiohttp.ClientError, ValueError) as e:
+                    upstream_metrics.record(host, time.perf_counter() - start, None, attempt, True)
+                    return None, None, str(e), {}
+
+                await asyncio.sleep(delay)
+                attempt += 1
+
+    async def get(self, endpoint, params=None, cache_ttl=None, refresh=False):
+        """Performs a GET request."""
+        return await self._request("GET", endpoint, params=params, cache_ttl=cache_ttl, refresh=refresh)
+
+    async def post(self, endpoint, json_data=None, cache_ttl=None):
+        """Performs a POST request."""
+        return await self._request("POST", endpoint, json_data=json_data, cache_ttl=cache_ttl)
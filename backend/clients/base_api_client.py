@@ -1,14 +1,43 @@
+from urllib.parse import urlsplit
+
 import requests
 
+from config import config
+from .rate_limiter import INTERACTIVE, TokenBucketLimiter, current_priority, rate_limited_error
+from .resilience import circuit_open_error, get_circuit_breaker, schedule_refresh
+from .response_cache import ResponseCache, get_response_cache
+from .single_flight import upstream_flights
+from .transport import HttpTransport, get_transport
+
 class BaseAPIClient:
     """A base client for making API requests."""
-    def __init__(self, base_url, api_key=None, timeout=10):
+    def __init__(self, base_url, api_key=None, timeout=10, transport: HttpTransport = None,
+                 rate_limiter: TokenBucketLimiter = None):
         self.base_url = base_url
         self.api_key = api_key
         self.timeout = timeout
+        self._transport = transport
+        self.rate_limiter = rate_limiter
+
+    @property
+    def transport(self) -> HttpTransport:
+        """The pooled transport; the shared one unless a client was given its own."""
+        return self._transport or get_transport()
 
-    def _request(self, method, endpoint, params=None, json_data=None):
-        """Makes a request to the API."""
+    def _request(self, method, endpoint, params=None, json_data=None, cache_ttl=None, refresh=False):
+        """
+        Makes a request to the API.
+
+        With a cache_ttl (seconds) the response is served from, and stored in,
+        the shared response cache; expired entries are served stale while
+        they are revalidated in the background (ETag/Last-Modified), and
+        failures are cached briefly. Concurrent identical GETs and cacheable
+        requests share one upstream call, and requests to an upstream whose
+        circuit is open fail fast. With a rate limiter, requests over budget
+        queue briefly and then fall back to any cached body. refresh=True
+        skips serving from the cache (the response is still revalidated
+        conditionally and stored).
+        """
         url = f"{self.base_url}{endpoint}"
         
         if params is None:
@@ -17,17 +46,80 @@ class BaseAPIClient:
         if self.api_key:
             params['api_key'] = self.api_key
 
+        if method == "GET" or cache_ttl:
+            key = ResponseCache.make_key(method, url, params, json_data)
+            return upstream_flights.do(
+                f"{key}:refresh" if refresh else key,
+                lambda: self._cached_request(method, url, params, json_data, cache_ttl, key, refresh)
+            )
+        return self._fetch(method, url, params, json_data)
+
+    def _cached_request(self, method, url, params, json_data, cache_ttl, key, refresh=False):
+        cache = get_response_cache() if cache_ttl else None
+        if not cache:
+            return self._fetch(method, url, params, json_data)
+
+        entry = cache.lookup(key)
+        if refresh:
+            return self._fetch(method, url, params, json_data, cache_ttl, key, entry, serve_stale=False)
+        if entry and entry.is_fresh():
+            return entry.data, None
+        if entry and entry.is_servable_stale(config.HTTP_CACHE_MAX_STALE_S):
+            # Stale-while-revalidate; while a recent refresh failure is cached, just serve stale
+            if not entry.is_negative():
+                schedule_refresh(key, lambda: self._fetch(method, url, params, json_data, cache_ttl, key, entry))
+            return entry.data, None
+        if entry and entry.is_negative():
+            return None, entry.error
+        return self._fetch(method, url, params, json_data, cache_ttl, key, entry)
+
+    def _fetch(self, method, url, params, json_data, cache_ttl=None, key=None, entry=None,
+               serve_stale=True):
+        """Goes upstream (unless the circuit is open or the budget is spent) and records the outcome in the cache."""
+        host = urlsplit(url).netloc
+        breaker = get_circuit_breaker(host)
+        if not breaker.allow_request():
+            return None, circuit_open_error(host)
+        if self.rate_limiter and not self.rate_limiter.acquire():
+            if serve_stale and entry and entry.has_data:
+                return entry.data, None
+            return None, rate_limited_error(self.rate_limiter.name)
+
+        status, data, error, headers = self._send(method, url, params, json_data,
+                                                  entry.validators() if entry else None)
+        breaker.record(status)
+        if status == 429 and self.rate_limiter:
+            self.rate_limiter.drain()
+
+        cache = get_response_cache() if cache_ttl else None
+        if not cache:
+            return data, error
+        return cache.record_response(key, url, entry, cache_ttl, status, data, error, headers, serve_stale)
+
+    def _send(self, method, url, params, json_data, headers):
+        """
+        Sends a request with retries; returns (status, data, error, response headers).
+
+        Interactive requests must finish, retries included, within self.timeout;
+        the background lane keeps the full retry budget.
+        """
+        deadline_s = self.timeout if current_priority() == INTERACTIVE else None
         try:
-            response = requests.request(method, url, params=params, json=json_data, timeout=self.timeout)
+            response = self.transport.request(method, url, deadline_s=deadline_s, params=params, json=json_data,
+                                              headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                return response.status_code, None, None, response.headers
             response.raise_for_status()
-            return response.json(), None
+            return response.status_code, response.json(), None, response.headers
+        except requests.exceptions.HTTPError as e:
+            return e.response.status_code, None, str(e), e.response.headers
         except requests.exceptions.RequestException as e:
-            return None, str(e)
+            return None, None, str(e), {}
 
-    def get(self, endpoint, params=None):
+    def get(self, endpoint, params=None, cache_ttl=None, refresh=False):
         """Performs a GET request."""
-        return self._request("GET", endpoint, params=params)
+        return self._request("GET", endpoint, params=params, cache_ttl=cache_ttl, refresh=refresh)
 
-    def post(self, endpoint, json_data=None):
+    def post(self, endpoint, json_data=None, cache_ttl=None):
         """Performs a POST request."""
-        return self._request("POST", endpoint, json_data=json_data)
+        return self._request("POST", endpoint, json_data=json_data, cache_ttl=cache_ttl)
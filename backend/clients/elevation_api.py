@@ -1,10 +1,62 @@
 import logging
 from typing import List, Optional, Tuple
 
+from config import config
+
+from .async_base_api_client import AsyncBaseAPIClient
 from .base_api_client import BaseAPIClient
 
 logger = logging.getLogger(__name__)
 
+OPEN_ELEVATION_BASE_URL = "https://api.open-elevation.com/api/v1"
+
+
+def parse_elevation(data, error, lat: float, lng: float) -> Optional[float]:
+    """Parses a single-point /lookup response into meters, or None on failure."""
+    try:
+        if error:
+            logger.error(f"API request failed for ({lat}, {lng}): {error}")
+            return None
+        
+        if not data or 'results' not in data or not data['results']:
+            logger.warning(f"No results found for ({lat}, {lng})")
+            return None
+        
+        elevation = data['results'][0]['elevation']
+        return float(elevation)
+
+    except (ValueError, KeyError, IndexError, TypeError) as e:
+        logger.error(f"Error parsing elevation data for ({lat}, {lng}): {e}")
+        return None
+
+
+def locations_payload(coordinates: List[Tuple[float, float]]) -> dict:
+    """Formats the payload for a batch POST /lookup request."""
+    return {"locations": [{"latitude": lat, "longitude": lng} for lat, lng in coordinates]}
+
+
+def parse_elevations_batch(data, error, n_coordinates: int) -> List[Optional[float]]:
+    """Parses a batch /lookup response; failed lookups are None."""
+    if error:
+        logger.error(f"Batch API request failed: {error}")
+        return [None] * n_coordinates
+    
+    if not data or 'results' not in data:
+        logger.warning("Batch request returned no results.")
+        return [None] * n_coordinates
+    
+    # The API returns results in the same order as the request.
+    # We can directly extract the elevation from each result.
+    results_list = []
+    for result in data['results']:
+        try:
+            results_list.append(float(result['elevation']))
+        except (ValueError, KeyError, TypeError):
+            results_list.append(None)
+    
+    return results_list
+
+
 class OpenElevationClient(BaseAPIClient):
     """
     A client for the Open-Elevation API.
@@ -14,7 +66,7 @@ class OpenElevationClient(BaseAPIClient):
     """
     def __init__(self):
         super().__init__(
-            base_url="https://api.open-elevation.com/api/v1",
+            base_url=OPEN_ELEVATION_BASE_URL,
             timeout=10
         )
 
@@ -33,22 +85,8 @@ class OpenElevationClient(BaseAPIClient):
         params = {"locations": f"{lat},{lng}"}
         
         try:
-            data, error = self.get("/lookup", params=params)
-
-            if error:
-                logger.error(f"API request failed for ({lat}, {lng}): {error}")
-                return None
-            
-            if not data or 'results' not in data or not data['results']:
-                logger.warning(f"No results found for ({lat}, {lng})")
-                return None
-            
-            elevation = data['results'][0]['elevation']
-            return float(elevation)
-
-        except (ValueError, KeyError, IndexError) as e:
-            logger.error(f"Error parsing elevation data for ({lat}, {lng}): {e}")
-            return None
+            data, error = self.get("/lookup", params=params, cache_ttl=config.ELEVATION_CACHE_TTL_S)
+            return parse_elevation(data, error, lat, lng)
         except Exception as e:
             logger.error(f"An unexpected error occurred for ({lat}, {lng}): {e}")
             return None
@@ -68,35 +106,36 @@ class OpenElevationClient(BaseAPIClient):
         if not coordinates:
             return []
             
-        # Format the payload for the POST request
-        locations_payload = {
-            "locations": [{"latitude": lat, "longitude": lng} for lat, lng in coordinates]
-        }
-        
         try:
-            data, error = self.post("/lookup", json_data=locations_payload)
-
-            if error:
-                logger.error(f"Batch API request failed: {error}")
-                return [None] * len(coordinates)
-            
-            if not data or 'results' not in data:
-                logger.warning("Batch request returned no results.")
-                return [None] * len(coordinates)
-            
-            # The API returns results in the same order as the request.
-            # We can directly extract the elevation from each result.
-            results_list = []
-            for result in data['results']:
-                try:
-                    results_list.append(float(result['elevation']))
-                except (ValueError, KeyError):
-                    results_list.append(None)
-            
-            return results_list
-
+            data, error = self.post("/lookup", json_data=locations_payload(coordinates),
+                                     cache_ttl=config.ELEVATION_CACHE_TTL_S)
+            return parse_elevations_batch(data, error, len(coordinates))
         except Exception as e:
             logger.error(f"An unexpected error occurred during batch processing: {e}")
             return [None] * len(coordinates)
 
+
+class AsyncOpenElevationClient(AsyncBaseAPIClient):
+    """Asyncio client for the Open-Elevation API (same results as OpenElevationClient)."""
+    def __init__(self, max_concurrency: int = None):
+        super().__init__(
+            base_url=OPEN_ELEVATION_BASE_URL,
+            timeout=10,
+            max_concurrency=max_concurrency
+        )
+
+    async def get_elevation(self, lat: float, lng: float) -> Optional[float]:
+        """Gets the elevation in meters for a single coordinate, or None on failure."""
+        data, error = await self.get("/lookup", params={"locations": f"{lat},{lng}"},
+                                       cache_ttl=config.ELEVATION_CACHE_TTL_S)
+        return parse_elevation(data, error, lat, lng)
+
+    async def get_elevations_batch(self, coordinates: List[Tuple[float, float]]) -> List[Optional[float]]:
+        """Gets elevations for a batch of (lat, lng) tuples, in input order."""
+        if not coordinates:
+            return []
+        data, error = await self.post("/lookup", json_data=locations_payload(coordinates),
+                                           cache_ttl=config.ELEVATION_CACHE_TTL_S)
+        return parse_elevations_batch(data, error, len(coordinates))
+
 elevation_client = OpenElevationClient()
@@ -1,83 +1,233 @@
 import os
-from functools import lru_cache
+import time
+from datetime import datetime
+from typing import Optional
+from config import config
+from .async_base_api_client import AsyncBaseAPIClient
 from .base_api_client import BaseAPIClient
+from .rate_limiter import TokenBucketLimiter, get_rate_limiter
 
-class NasaApiClient(BaseAPIClient):
-    """A client for the NASA Near-Earth Object API."""
+NASA_NEO_BASE_URL = "https://api.nasa.gov/neo/rest/v1"
+
+# A /feed request's end_date may be at most this many days after its start_date
+NEO_FEED_MAX_SPAN_DAYS = 7
+
+# Julian date of the Unix epoch (NeoWs epoch_date_close_approach is Unix milliseconds)
+UNIX_EPOCH_JD = 2440587.5
+
+# api.nasa.gov hourly quotas
+NASA_DEMO_KEY_REQUESTS_PER_HOUR = 30
+NASA_API_KEY_REQUESTS_PER_HOUR = 1000
+
+
+def nasa_rate_limiter(api_key: str) -> Optional[TokenBucketLimiter]:
+    """The shared request budget for a NASA API key (None if rate limiting is disabled)."""
+    if not config.RATE_LIMIT_ENABLED:
+        return None
+    demo = api_key == "DEMO_KEY"
+    per_hour = config.NASA_RATE_LIMIT_PER_HOUR or (
+        NASA_DEMO_KEY_REQUESTS_PER_HOUR if demo else NASA_API_KEY_REQUESTS_PER_HOUR
+    )
+    return get_rate_limiter("nasa_demo_key" if demo else "nasa", per_hour)
+
+
+def _orbit_epoch(asteroid):
+    """Osculating epoch (JD) of the orbit NeoWs reports, or None."""
+    try:
+        return float(asteroid["orbital_data"]["epoch_osculation"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _approach_jd(approach):
+    """Julian date of a NeoWs close approach, or None."""
+    try:
+        return float(approach["epoch_date_close_approach"]) / 86400000.0 + UNIX_EPOCH_JD
+    except (KeyError, TypeError, ValueError):
+        pass
+    try:
+        # e.g. "2029-Apr-13 21:46"
+        moment = datetime.strptime(approach["close_approach_date_full"], "%Y-%b-%d %H:%M")
+    except (KeyError, TypeError, ValueError):
+        return None
+    return UNIX_EPOCH_JD + (moment - datetime(1970, 1, 1)).total_seconds() / 86400.0
 
-    def __init__(self, api_key=None, timeout=10):
-        super().__init__(
-            base_url="https://api.nasa.gov/neo/rest/v1",
-            api_key=api_key or os.getenv("NASA_API_KEY", "DEMO_KEY"),
-            timeout=timeout
-        )
 
-    def _parse_asteroid_data(self, asteroid):
-        """Extracts essential fields from a single asteroid's data."""
-        if not asteroid:
-            return None
-
-        close_approach_data = asteroid.get("close_approach_data", [])
-        if not close_approach_data:
-            return {
-                "id": asteroid.get("neo_reference_id"),
-                "name": asteroid.get("name"),
-                "is_hazardous": asteroid.get("is_potentially_hazardous_asteroid"),
-                "diameter": asteroid.get("estimated_diameter", {}),
-                "velocity": None,
-                "close_approach_date": None,
-            }
-
-        latest_approach = close_approach_data[0]
-        
+def _next_approach(close_approach_data):
+    """The first close approach after now, as (close_approach_date_full, jd), or (None, None)."""
+    now_jd = time.time() / 86400.0 + UNIX_EPOCH_JD
+    upcoming = []
+    for approach in close_approach_data:
+        jd = _approach_jd(approach)
+        if jd is not None and jd > now_jd:
+            upcoming.append((jd, approach.get("close_approach_date_full")))
+    if not upcoming:
+        return None, None
+    jd, date_full = min(upcoming, key=lambda item: item[0])
+    return date_full, jd
+
+
+def parse_asteroid_data(asteroid):
+    """Extracts essential fields from a single asteroid's data."""
+    if not asteroid:
+        return None
+
+    close_approach_data = asteroid.get("close_approach_data", [])
+    if not close_approach_data:
         return {
             "id": asteroid.get("neo_reference_id"),
             "name": asteroid.get("name"),
             "is_hazardous": asteroid.get("is_potentially_hazardous_asteroid"),
-            "diameter_meters": asteroid.get("estimated_diameter", {}).get("meters", {}),
-            "diameter_kilometers": asteroid.get("estimated_diameter", {}).get("kilometers", {}),
-            "velocity_kms": latest_approach.get("relative_velocity", {}).get("kilometers_per_second"),
-            "close_approach_date": latest_approach.get("close_approach_date_full"),
+            "diameter": asteroid.get("estimated_diameter", {}),
+            "velocity": None,
+            "close_approach_date": None,
+            "next_close_approach_date": None,
+            "next_close_approach_jd": None,
+            "orbit_epoch": _orbit_epoch(asteroid),
         }
 
-    @lru_cache(maxsize=128)
+    latest_approach = close_approach_data[0]
+    next_date, next_jd = _next_approach(close_approach_data)
+
+    return {
+        "id": asteroid.get("neo_reference_id"),
+        "name": asteroid.get("name"),
+        "is_hazardous": asteroid.get("is_potentially_hazardous_asteroid"),
+        "diameter_meters": asteroid.get("estimated_diameter", {}).get("meters", {}),
+        "diameter_kilometers": asteroid.get("estimated_diameter", {}).get("kilometers", {}),
+        "velocity_kms": latest_approach.get("relative_velocity", {}).get("kilometers_per_second"),
+        "close_approach_date": latest_approach.get("close_approach_date_full"),
+        "next_close_approach_date": next_date,
+        "next_close_approach_jd": next_jd,
+        "orbit_epoch": _orbit_epoch(asteroid),
+    }
+
+
+def parse_feed(data):
+    """Flattens a /feed response (asteroids grouped by date) into a list."""
+    asteroids = []
+    for date in data.get("near_earth_objects", {}):
+        for asteroid in data["near_earth_objects"][date]:
+            asteroids.append(parse_asteroid_data(asteroid))
+    return asteroids
+
+
+def parse_feed_days(data):
+    """Parses a /feed response into {date: [asteroids]}; dates without objects are omitted."""
+    return {
+        date: [parse_asteroid_data(asteroid) for asteroid in asteroids]
+        for date, asteroids in data.get("near_earth_objects", {}).items()
+    }
+
+
+def parse_browse(data):
+    """Parses one page of a /neo/browse response."""
+    return [parse_asteroid_data(asteroid) for asteroid in data.get("near_earth_objects", [])]
+
+
+def parse_browse_page(data):
+    """Page metadata of a /neo/browse response (number, size, total_pages, total_elements)."""
+    return data.get("page") or {}
+
+
+def _browse_result(data, error):
+    if error:
+        return {"data": None, "page": None, "error": error}
+    return {"data": parse_browse(data), "page": parse_browse_page(data), "error": None}
+
+
+def _result(data, error, parse):
+    if error:
+        return {"data": None, "error": error}
+    return {"data": parse(data), "error": None}
+
+
+class NasaApiClient(BaseAPIClient):
+    """A client for the NASA Near-Earth Object API."""
+
+    def __init__(self, api_key=None, timeout=10):
+        api_key = api_key or os.getenv("NASA_API_KEY", "DEMO_KEY")
+        super().__init__(
+            base_url=NASA_NEO_BASE_URL,
+            api_key=api_key,
+            timeout=timeout,
+            rate_limiter=nasa_rate_limiter(api_key)
+        )
+
     def get_asteroid_by_id(self, asteroid_id):
         """Fetches a specific asteroid by its ID."""
-        data, error = self.get(f"/neo/{asteroid_id}")
-        if error:
-            return {"data": None, "error": error}
-        return {"data": self._parse_asteroid_data(data), "error": None}
+        data, error = self.get(f"/neo/{asteroid_id}", cache_ttl=config.NEO_LOOKUP_CACHE_TTL_S)
+        return _result(data, error, parse_asteroid_data)
 
-    @lru_cache(maxsize=32)
     def get_asteroids_by_date(self, start_date, end_date):
         """Fetches asteroids within a given date range."""
         params = {"start_date": start_date, "end_date": end_date}
-        data, error = self.get("/feed", params=params)
-        
-        if error:
-            return {"data": None, "error": error}
-        
-        asteroids = []
-        for date in data.get("near_earth_objects", {}):
-            for asteroid in data["near_earth_objects"][date]:
-                asteroids.append(self._parse_asteroid_data( asteroid))
-        
-        return {"data": asteroids, "error": None}
-
-    @lru_cache(maxsize=32)
-    def browse_asteroids(self, page=0):
-        """Browses all asteroids with pagination."""
+        data, error = self.get("/feed", params=params, cache_ttl=config.NEO_FEED_CACHE_TTL_S)
+        return _result(data, error, parse_feed)
+
+    def get_feed_days(self, start_date, end_date):
+        """
+        Fetches a /feed window (at most NEO_FEED_MAX_SPAN_DAYS days) grouped by date.
+
+        Not stored in the response cache; feed_service keeps the results in
+        per-day buckets instead.
+        """
+        data, error = self.get("/feed", params={"start_date": start_date, "end_date": end_date})
+        return _result(data, error, parse_feed_days)
+
+    def browse_asteroids(self, page=0, refresh=False):
+        """
+        Browses all asteroids with pagination.
+
+        Returns:
+            A dictionary with 'data' (the page's asteroids), 'page' (number,
+            size, total_pages, total_elements) and 'error'.
+        """
         params = {"page": page}
-        data, error = self.get("/neo/browse", params=params)
-        
-        if error:
-            return {"data": None, "error": error}
-        
-        asteroids = [
-            self._parse_asteroid_data(asteroid)
-            for asteroid in data.get("near_earth_objects", [])
-        ]
-        return {"data": asteroids, "error": None}
+        data, error = self.get("/neo/browse", params=params, cache_ttl=config.NEO_BROWSE_CACHE_TTL_S,
+                               refresh=refresh)
+        return _browse_result(data, error)
+
+
+class AsyncNasaApiClient(AsyncBaseAPIClient):
+    """Asyncio client for the NASA Near-Earth Object API (same results as NasaApiClient)."""
+
+    def __init__(self, api_key=None, timeout=10, max_concurrency=None):
+        api_key = api_key or os.getenv("NASA_API_KEY", "DEMO_KEY")
+        super().__init__(
+            base_url=NASA_NEO_BASE_URL,
+            api_key=api_key,
+            timeout=timeout,
+            max_concurrency=max_concurrency,
+            rate_limiter=nasa_rate_limiter(api_key)
+        )
+
+    async def get_asteroid_by_id(self, asteroid_id):
+        """Fetches a specific asteroid by its ID."""
+        data, error = await self.get(f"/neo/{asteroid_id}", cache_ttl=config.NEO_LOOKUP_CACHE_TTL_S)
+        return _result(data, error, parse_asteroid_data)
+
+    async def get_asteroids_by_date(self, start_date, end_date):
+        """Fetches asteroids within a given date range."""
+        data, error = await self.get("/feed", params={"start_date": start_date, "end_date": end_date},
+                                       cache_ttl=config.NEO_FEED_CACHE_TTL_S)
+        return _result(data, error, parse_feed)
+
+    async def get_feed_days(self, start_date, end_date):
+        """
+        Fetches a /feed window (at most NEO_FEED_MAX_SPAN_DAYS days) grouped by date.
+
+        Not stored in the response cache; feed_service keeps the results in
+        per-day buckets instead.
+        """
+        data, error = await self.get("/feed", params={"start_date": start_date, "end_date": end_date})
+        return _result(data, error, parse_feed_days)
+
+    async def browse_asteroids(self, page=0, refresh=False):
+        """Browses all asteroids with pagination (same result shape as NasaApiClient)."""
+        data, error = await self.get("/neo/browse", params={"page": page}, cache_ttl=config.NEO_BROWSE_CACHE_TTL_S,
+                                     refresh=refresh)
+        return _browse_result(data, error)
 
 # --- Singleton instance for easy import ---
 nasa_api_client = NasaApiClient()
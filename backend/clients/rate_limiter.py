@@ -0,0 +1,229 @@
+"""
+Token-bucket rate limiting for upstream API quotas, shared across workers.
+
+Bucket state (tokens and last refill time) lives in a local SQLite
+database, and each take runs in an immediate transaction, so every
+gunicorn worker and thread draws from the same budget. A bucket holds up
+to `capacity` tokens and refills continuously at `refill_per_s`.
+
+Requests run in one of two priority lanes, set with request_priority()
+and carried in a contextvar, so they follow asyncio tasks and
+asyncio.to_thread calls. Interactive requests (the default) may use the
+whole bucket. Background work (catalog builds, cache refreshes) must leave
+a reserve of tokens for interactive lookups, and may wait longer for a
+token. Requests that cannot get a token within their lane's wait budget
+are refused, and the clients then fall back to any cached response.
+"""
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+_priority: ContextVar[str] = ContextVar("upstream_request_priority", default=INTERACTIVE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@contextmanager
+def request_priority(lane: str):
+    """Runs the enclosed upstream requests in the given lane (INTERACTIVE or BACKGROUND)."""
+    token = _priority.set(lane)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """The lane of the current context."""
+    return _priority.get()
+
+
+def rate_limited_error(name: str) -> str:
+    """Error returned for requests refused by a rate limiter."""
+    return f"Request budget for {name} exhausted; try again later"
+
+
+class TokenBucketLimiter:
+    """A token bucket stored in SQLite, safe across threads and processes."""
+
+    def __init__(self, name: str, capacity: float, refill_per_s: float, path: str = None):
+        self.name = name
+        self.capacity = float(capacity)
+        self.refill_per_s = float(refill_per_s)
+        self.path = path or default_rate_limit_path()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts = {"granted": 0, "waited": 0, "refused": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    def _reserve(self, lane: str) -> float:
+        return self.capacity * config.RATE_LIMIT_BACKGROUND_RESERVE if lane == BACKGROUND else 0.0
+
+    def try_take(self, cost: float = 1.0, lane: Optional[str] = None) -> float:
+        """
+        Takes tokens if the lane may have them now.
+
+        Args:
+            cost: Tokens to take
+            lane: Priority lane; defaults to the current context's
+
+        Returns:
+            0.0 if the tokens were taken, otherwise the seconds until they could be.
+        """
+        reserve = self._reserve(lane or current_priority())
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT tokens, updated_at FROM buckets WHERE name = ?", (self.name,)).fetchone()
+            now = time.time()
+            tokens = self.capacity if row is None else min(self.capacity, row[0] + (now - row[1]) * self.refill_per_s)
+            wait_s = 0.0
+            if tokens - cost >= reserve:
+                tokens -= cost
+            else:
+                wait_s = (cost + reserve - tokens) / self.refill_per_s
+            conn.execute("INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                         (self.name, tokens, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait_s
+
+    def _max_wait_s(self, lane: str) -> float:
+        if lane == BACKGROUND:
+            return config.RATE_LIMIT_BACKGROUND_MAX_WAIT_S
+        return config.RATE_LIMIT_INTERACTIVE_MAX_WAIT_S
+
+    def _next_wait(self, cost: float, lane: str, waited_s: float) -> Optional[float]:
+        """0 if granted, seconds to sleep before retrying, or None if refused."""
+        try:
+            wait_s = self.try_take(cost, lane)
+        except sqlite3.Error as e:
+            # Never let limiter bookkeeping take the API down
+            logger.warning(f"Rate limiter {self.name} unavailable: {e}")
+            return 0.0
+        if wait_s == 0:
+            self._count("waited" if waited_s else "granted")
+            return 0.0
+        if waited_s + wait_s > self._max_wait_s(lane):
+            self._count("refused")
+            logger.warning(f"Rate limit budget for {self.name} exhausted ({lane} request refused)")
+            return None
+        return wait_s
+
+    def acquire(self, cost: float = 1.0) -> bool:
+        """
+        Takes tokens for the current lane, queueing up to the lane's wait budget.
+
+        Returns:
+            True if the request may proceed.
+        """
+        lane, waited_s = current_priority(), 0.0
+        while True:
+            wait_s = self._next_wait(cost, lane, waited_s)
+            if wait_s is None:
+                return False
+            if wait_s == 0:
+                return True
+            time.sleep(wait_s)
+            waited_s += wait_s
+
+    async def acquire_async(self, cost: float = 1.0) -> bool:
+        """Async counterpart of acquire(); waits without blocking the event loop."""
+        lane, waited_s = current_priority(), 0.0
+        while True:
+            wait_s = await asyncio.to_thread(self._next_wait, cost, lane, waited_s)
+            if wait_s is None:
+                return False
+            if wait_s == 0:
+                return True
+            await asyncio.sleep(wait_s)
+            waited_s += wait_s
+
+    def drain(self):
+        """Empties the bucket, e.g. after the upstream answered 429."""
+        try:
+            self._connection().execute("INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, 0, ?)",
+                                       (self.name, time.time()))
+        except sqlite3.Error as e:
+            logger.warning(f"Rate limiter {self.name} unavailable: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current tokens (shared) and this process's grant counters."""
+        try:
+            row = self._connection().execute("SELECT tokens, updated_at FROM buckets WHERE name = ?",
+                                             (self.name,)).fetchone()
+            tokens = self.capacity if row is None else min(
+                self.capacity, row[0] + (time.time() - row[1]) * self.refill_per_s)
+        except sqlite3.Error:
+            tokens = None
+        with self._lock:
+            counts = dict(self._counts)
+        return {"tokens": round(tokens, 2) if tokens is not None else None, "capacity": self.capacity,
+                "refill_per_hour": round(self.refill_per_s * 3600, 2), **counts}
+
+
+def default_rate_limit_path() -> str:
+    """Configured limiter database (RATE_LIMIT_PATH, or rate_limits.sqlite3 in DATA_DIR)."""
+    return config.RATE_LIMIT_PATH or os.path.join(config.DATA_DIR, "rate_limits.sqlite3")
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(name: str, requests_per_hour: float) -> TokenBucketLimiter:
+    """
+    Returns the shared limiter for a quota, creating it on first use.
+
+    The bucket holds one hour's budget and refills continuously, matching
+    rolling hourly quotas such as api.nasa.gov's.
+    """
+    limiter = _limiters.get(name)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(
+                name, TokenBucketLimiter(name, requests_per_hour, requests_per_hour / 3600.0)
+            )
+    return limiter
+
+
+def rate_limiters_snapshot() -> Dict[str, Dict[str, Any]]:
+    """State of every limiter, for the health endpoint."""
+    with _limiters_lock:
+        limiters = dict(_limiters)
+    return {name: limiter.snapshot() for name, limiter in limiters.items()}
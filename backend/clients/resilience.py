@@ -0,0 +1,156 @@
+"""
+Circuit breakers and background refreshes for the upstream API clients.
+
+Each upstream host gets a circuit breaker. After a run of consecutive
+failures (connection errors, timeouts, 429 or 5xx), the circuit opens and
+requests to that host fail fast instead of waiting out the timeout. After
+a cool-down, the circuit becomes half-open, and a single probe request
+decides whether it closes again or stays open.
+
+The clients pair this with stale-while-revalidate. An expired cached
+response is served immediately, and the refresh runs in a small
+background thread pool (skipped while the circuit is open). Refreshes
+run on threads rather than on the caller's event loop because run_async()
+loops end with the request.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Set
+
+from config import config
+from .rate_limiter import BACKGROUND, request_priority
+from .transport import RETRY_STATUS_CODES
+
+logger = logging.getLogger(__name__)
+
+
+def is_upstream_failure(status: Optional[int]) -> bool:
+    """True for outcomes that count against a circuit: no response, 429 or 5xx."""
+    return status is None or status in RETRY_STATUS_CODES
+
+
+def circuit_open_error(host: str) -> str:
+    """Error returned for requests rejected by an open circuit."""
+    return f"{host} is temporarily unavailable (circuit open)"
+
+
+class CircuitBreaker:
+    """Thread-safe closed / open / half-open circuit for one upstream."""
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = None, reset_timeout_s: float = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or config.HTTP_BREAKER_FAILURE_THRESHOLD
+        self.reset_timeout_s = config.HTTP_BREAKER_RESET_TIMEOUT_S if reset_timeout_s is None else reset_timeout_s
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._counts = {"opened": 0, "rejected": 0}
+
+    def allow_request(self) -> bool:
+        """True if a request may go upstream now; in half-open state only one probe at a time."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and now - self._opened_at >= self.reset_timeout_s:
+                self.state = self.HALF_OPEN
+                self._probe_started_at = now
+                logger.info(f"Circuit for {self.name} half-open; probing")
+                return True
+            # A probe that never reported back does not block the circuit forever
+            if self.state == self.HALF_OPEN and now - self._probe_started_at >= self.reset_timeout_s:
+                self._probe_started_at = now
+                return True
+            self._counts["rejected"] += 1
+            return False
+
+    def record(self, status: Optional[int]):
+        """Records the outcome of an upstream request by its final status (None if it never got one)."""
+        if is_upstream_failure(status):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def record_success(self):
+        with self._lock:
+            if self.state != self.CLOSED:
+                logger.info(f"Circuit for {self.name} closed")
+            self.state = self.CLOSED
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self._failures >= self.failure_threshold):
+                if self.state == self.CLOSED:
+                    self._counts["opened"] += 1
+                    logger.warning(f"Circuit for {self.name} opened after {self._failures} failures")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "consecutive_failures": self._failures, **self._counts}
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Returns the circuit breaker for an upstream host, creating it on first use."""
+    breaker = _breakers.get(host)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.setdefault(host, CircuitBreaker(host))
+    return breaker
+
+
+def circuit_breakers_snapshot() -> Dict[str, Dict[str, Any]]:
+    """State of every upstream's circuit, for the health endpoint."""
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {host: breaker.snapshot() for host, breaker in breakers.items()}
+
+
+_refresh_executor: Optional[ThreadPoolExecutor] = None
+_refreshing: Set[str] = set()
+_refresh_lock = threading.Lock()
+
+
+def schedule_refresh(key: str, fn: Callable[[], Any]) -> bool:
+    """
+    Runs fn() on the background refresh pool unless a refresh of the same key is pending.
+
+    Refreshes run in the BACKGROUND rate-limit lane.
+
+    Returns:
+        True if a refresh was scheduled.
+    """
+    global _refresh_executor
+    with _refresh_lock:
+        if key in _refreshing:
+            return False
+        _refreshing.add(key)
+        if _refresh_executor is None:
+            _refresh_executor = ThreadPoolExecutor(max_workers=config.HTTP_REFRESH_WORKERS,
+                                                   thread_name_prefix="upstream-refresh")
+
+    def run():
+        try:
+            with request_priority(BACKGROUND):
+                fn()
+        except Exception as e:
+            logger.error(f"Background refresh failed: {e}")
+        finally:
+            with _refresh_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(run)
+    return True
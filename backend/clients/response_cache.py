@@ -0,0 +1,320 @@
+"""
+Persistent HTTP response cache shared by all upstream API clients.
+
+Responses are stored in a local SQLite database (WAL mode), so the cache
+survives restarts and is shared safely by every gunicorn worker and thread.
+Each entry keeps the last good JSON body with its ETag/Last-Modified
+validators and expiry time. Once an entry expires, the clients serve it
+stale while a conditional request revalidates it, and a 304 reply only
+extends the expiry. Failures are cached
+separately with a short TTL (negative caching), so an outage or a missing
+object is not re-requested on every call. Entries are stored alongside the
+error rather than overwritten by it, so the last good body stays available.
+When the database grows past its size budget, the least recently used
+entries are evicted.
+
+Cache keys are built from the method, URL, query parameters and JSON body.
+The API key is excluded, so rotating keys does not invalidate the cache.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Tuple
+
+from config import config
+from .resilience import is_upstream_failure
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change the response
+_UNKEYED_PARAMS = frozenset({"api_key"})
+
+# Entries are marked as used at most this often, to keep reads write-free
+_ACCESS_RESOLUTION_S = 60.0
+
+# Eviction runs every this many stores, and trims the cache to 90% of its budget
+_EVICT_EVERY = 100
+_EVICT_TARGET = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    body TEXT,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    error TEXT,
+    error_expires_at REAL NOT NULL DEFAULT 0,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+"""
+
+
+class CacheEntry(NamedTuple):
+    """A cached response: the last good body and/or a recent failure."""
+    data: Any
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    expires_at: float
+    error: Optional[str]
+    error_expires_at: float
+    last_access: float
+
+    @property
+    def has_data(self) -> bool:
+        return self.stored_at > 0
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        """True if the good body can be served without contacting the upstream."""
+        return self.has_data and (now or time.time()) < self.expires_at
+
+    def is_negative(self, now: Optional[float] = None) -> bool:
+        """True if a recent failure should be returned without contacting the upstream."""
+        return self.error is not None and (now or time.time()) < self.error_expires_at
+
+    def is_servable_stale(self, max_stale_s: float, now: Optional[float] = None) -> bool:
+        """True if an expired body is recent enough to serve while it is refreshed."""
+        return self.has_data and (now or time.time()) < self.expires_at + max_stale_s
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating the body."""
+        headers = {}
+        if self.has_data and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.has_data and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed response cache, safe across threads and processes."""
+
+    def __init__(self, path: str, max_bytes: int = None, error_ttl_s: float = None):
+        self.path = path
+        self.max_bytes = config.HTTP_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self.error_ttl_s = config.HTTP_CACHE_ERROR_TTL_S if error_ttl_s is None else error_ttl_s
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._counts = {"hits": 0, "misses": 0, "stale_hits": 0, "revalidated": 0, "negative_hits": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _count(self, name: str):
+        with self._lock:
+            self._counts[name] += 1
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None, json_data: Any = None) -> str:
+        """Stable key for a request, ignoring the API key."""
+        keyed_params = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in _UNKEYED_PARAMS)
+        raw = json.dumps([method.upper(), url, keyed_params, json_data], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Returns the entry for a key, fresh or not, or None on a miss.
+
+        Callers decide what to do with expired entries (revalidate, or
+        serve them stale while an upstream is unavailable).
+        """
+        try:
+            row = self._connection().execute(
+                "SELECT body, etag, last_modified, stored_at, expires_at, error, error_expires_at, last_access "
+                "FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+
+            body, etag, last_modified, stored_at, expires_at, error, error_expires_at, last_access = row
+            now = time.time()
+            if now - last_access > _ACCESS_RESOLUTION_S:
+                self._connection().execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            entry = CacheEntry(json.loads(body) if body is not None else None, etag, last_modified,
+                               stored_at, expires_at, error, error_expires_at, last_access)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Response cache lookup failed: {e}")
+            return None
+
+        if entry.is_negative(now):
+            self._count("negative_hits")
+        elif entry.is_fresh(now):
+            self._count("hits")
+        elif entry.is_servable_stale(config.HTTP_CACHE_MAX_STALE_S, now):
+            self._count("stale_hits")
+        else:
+            self._count("misses")
+        return entry
+
+    def store(self, key: str, url: str, data: Any, ttl_s: float,
+              etag: Optional[str] = None, last_modified: Optional[str] = None):
+        """Stores a good response body and clears any cached failure."""
+        body = json.dumps(data)
+        now = time.time()
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, etag, last_modified, stored_at, expires_at, error, error_expires_at, last_access, size) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, NULL, 0, ?, ?)",
+                (key, url, body, etag, last_modified, now, now + ttl_s, now, len(body) + len(url))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache store failed: {e}")
+            return
+        self._after_store()
+
+    def store_error(self, key: str, url: str, error: str, ttl_s: float = None):
+        """Caches a failure for a short time, keeping any previous good body."""
+        now = time.time()
+        error_expires_at = now + (self.error_ttl_s if ttl_s is None else ttl_s)
+        try:
+            self._connection().execute(
+                "INSERT INTO responses (key, url, stored_at, expires_at, error, error_expires_at, last_access, size) "
+                "VALUES (?, ?, 0, 0, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET error = excluded.error, error_expires_at = excluded.error_expires_at",
+                (key, url, error, error_expires_at, now, len(url) + len(error))
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache store failed: {e}")
+            return
+        self._after_store()
+
+    def revalidated(self, key: str, ttl_s: float):
+        """Extends a body's expiry after the upstream answered 304 Not Modified."""
+        self._count("revalidated")
+        try:
+            self._connection().execute(
+                "UPDATE responses SET expires_at = ?, error = NULL, error_expires_at = 0 WHERE key = ?",
+                (time.time() + ttl_s, key)
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache update failed: {e}")
+
+    def record_response(self, key: str, url: str, entry: Optional[CacheEntry], ttl_s: float,
+                        status: Optional[int], data: Any, error: Optional[str],
+                        headers: Optional[Mapping[str, str]] = None,
+                        serve_stale: bool = True) -> Tuple[Any, Optional[str]]:
+        """
+        Updates the cache with an upstream response and returns what the caller should see.
+
+        Args:
+            key: Request key
+            url: Request URL (for inspection only)
+            entry: The entry found before the request, if any
+            ttl_s: Freshness lifetime of a good response
+            status: Final HTTP status, or None if no response was received
+            data: Parsed JSON body of a good response
+            error: Error message of a failed request
+            headers: Response headers (ETag / Last-Modified)
+            serve_stale: Fall back to the stale body if the upstream failed
+
+        Returns:
+            (data, error): the new body, the revalidated cached body after a 304,
+            or the stale cached body if the upstream failed (stale-if-error).
+        """
+        if status == 304 and entry is not None and entry.has_data:
+            self.revalidated(key, ttl_s)
+            return entry.data, None
+        if error:
+            self.store_error(key, url, error)
+            if (serve_stale and entry is not None and is_upstream_failure(status)
+                    and entry.is_servable_stale(config.HTTP_CACHE_MAX_STALE_S)):
+                logger.warning(f"Serving stale response for {url}: {error}")
+                return entry.data, None
+            return None, error
+
+        headers = headers or {}
+        self.store(key, url, data, ttl_s, headers.get("ETag"), headers.get("Last-Modified"))
+        return data, None
+
+    def _after_store(self):
+        with self._lock:
+            self._stores += 1
+            due = self._stores % _EVICT_EVERY == 0
+        if due:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Deletes least recently used entries while the cache exceeds its budget.
+
+        Returns:
+            The number of deleted entries.
+        """
+        try:
+            conn = self._connection()
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+
+            excess = total - int(self.max_bytes * _EVICT_TARGET)
+            keys, freed = [], 0
+            for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access"):
+                keys.append(key)
+                freed += size
+                if freed >= excess:
+                    break
+            conn.executemany("DELETE FROM responses WHERE key = ?", ((key,) for key in keys))
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache eviction failed: {e}")
+            return 0
+
+        logger.info(f"Evicted {len(keys)} cached responses ({freed / 1e6:.1f} MB)")
+        return len(keys)
+
+    def clear(self):
+        """Deletes every entry."""
+        self._connection().execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Entry count and size of the shared cache, plus this process's hit counters."""
+        with self._lock:
+            counts = dict(self._counts)
+        try:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        except sqlite3.Error:
+            entries, size = None, None
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes, **counts}
+
+
+def default_response_cache_path() -> str:
+    """Configured cache database (HTTP_CACHE_PATH, or http_cache.sqlite3 in DATA_DIR)."""
+    return config.HTTP_CACHE_PATH or os.path.join(config.DATA_DIR, "http_cache.sqlite3")
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Returns the process-wide response cache, or None if caching is disabled."""
+    global _response_cache
+    if not config.HTTP_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(default_response_cache_path())
+    return _response_cache
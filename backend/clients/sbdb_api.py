@@ -1,60 +1,94 @@
 from typing import Dict, Any, Optional
+from config import config
+from .async_base_api_client import AsyncBaseAPIClient
 from .base_api_client import BaseAPIClient
 
+SBDB_BASE_URL = "https://ssd-api.jpl.nasa.gov"
+SBDB_NOT_FOUND_ERROR = "No data found for this asteroid"
+
+
+def parse_sbdb_data(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Parses the response from the SBDB API."""
+    # --- Extract Orbital Elements ---
+    orbit = data.get("orbit", {})
+    orbital_elements = {
+        element['name']: float(element['value'])
+        for element in orbit.get("elements", [])
+        if element['name'] in ['e', 'a', 'i', 'om', 'w', 'ma']
+    }
+    # The osculating epoch (JD) sits on the orbit, not among the elements
+    if orbit.get("epoch") is not None:
+        orbital_elements['epoch'] = float(orbit['epoch'])
+
+    # --- Extract Physical Parameters (FIXED) ---
+    physical_params_raw = data.get("phys_par", {})  # Defaults to dict
+    physical_params = {
+        key: float(physical_params_raw[key]) if physical_params_raw.get(key) else None
+        for key in ['diameter', 'density', 'rot_per']
+        if key in physical_params_raw
+    }
+    
+    # --- Extract Object Name ---
+    object_name = data.get("object", {}).get("fullname")
+
+    return {
+        "object_name": object_name,
+        "orbital_elements": orbital_elements,
+        "physical_parameters": physical_params,
+    }
+
+
+def sbdb_result(data: Optional[Dict[str, Any]], error: Optional[str]) -> Dict[str, Any]:
+    """Wraps an SBDB response in the clients' {'data', 'error'} shape."""
+    if error:
+        return {"data": None, "error": error}
+        
+    if data.get("message") == "no data found":
+        return {"data": None, "error": SBDB_NOT_FOUND_ERROR}
+        
+    return {"data": parse_sbdb_data(data), "error": None}
+
+
 class SbdbApiClient(BaseAPIClient):
     """
     A client for NASA's Small-Body Database (SBDB) API.
     """
     def __init__(self, timeout: int = 10):
         super().__init__(
-            base_url="https://ssd-api.jpl.nasa.gov",
+            base_url=SBDB_BASE_URL,
             timeout=timeout
         )
 
-    def _parse_sbdb_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Parses the response from the SBDB API."""
-        # --- Extract Orbital Elements ---
-        orbital_elements_raw = data.get("orbit", {}).get("elements", [])
-        orbital_elements = {
-            element['name']: float(element['value'])
-            for element in orbital_elements_raw
-            if element['name'] in ['e', 'a', 'i', 'om', 'w', 'ma', 'epoch']
-        }
-
-        # --- Extract Physical Parameters (FIXED) ---
-        physical_params_raw = data.get("phys_par", {})  # Defaults to dict
-        physical_params = {
-            key: float(physical_params_raw[key]) if physical_params_raw.get(key) else None
-            for key in ['diameter', 'density', 'rot_per']
-            if key in physical_params_raw
-        }
-        
-        # --- Extract Object Name ---
-        object_name = data.get("object", {}).get("fullname")
-
-        return {
-            "object_name": object_name,
-            "orbital_elements": orbital_elements,
-            "physical_parameters": physical_params,
-        }
-
-    def get_orbital_parameters(self, asteroid_id: str) -> Dict[str, Any]:
+    def get_orbital_parameters(self, asteroid_id: str, refresh: bool = False) -> Dict[str, Any]:
         """
         Fetches orbital and physical parameters for a given asteroid.
+
+        Args:
+            asteroid_id: SBDB search string (designation or SPK-ID)
+            refresh: Bypass the response cache
         
         Returns:
             A dictionary with 'data' and 'error' keys for consistent interface.
         """
         params = {"sstr": asteroid_id}
-        data, error = self.get("/sbdb.api", params=params)
-
-        if error:
-            return {"data": None, "error": error}
-            
-        if data.get("message") == "no data found":
-            return {"data": None, "error": "No data found for this asteroid"}
-            
-        return {"data": self._parse_sbdb_data(data), "error": None}
+        data, error = self.get("/sbdb.api", params=params, cache_ttl=config.SBDB_CACHE_TTL_S, refresh=refresh)
+        return sbdb_result(data, error)
+
+
+class AsyncSbdbApiClient(AsyncBaseAPIClient):
+    """Asyncio client for the SBDB API (same results as SbdbApiClient)."""
+    def __init__(self, timeout: int = 10, max_concurrency: int = None):
+        super().__init__(
+            base_url=SBDB_BASE_URL,
+            timeout=timeout,
+            max_concurrency=max_concurrency
+        )
+
+    async def get_orbital_parameters(self, asteroid_id: str, refresh: bool = False) -> Dict[str, Any]:
+        """Fetches orbital and physical parameters for a given asteroid (refresh bypasses the cache)."""
+        data, error = await self.get("/sbdb.api", params={"sstr": asteroid_id}, cache_ttl=config.SBDB_CACHE_TTL_S,
+                                     refresh=refresh)
+        return sbdb_result(data, error)
 
 # --- Singleton instance for easy import ---
 sbdb_api_client = SbdbApiClient()
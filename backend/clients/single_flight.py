@@ -0,0 +1,98 @@
+"""
+Request coalescing ("single-flight") for upstream API calls.
+
+When several callers ask for the same upstream resource at once, only the
+first (the leader) performs the call; the others wait for its result. In-
+flight calls are tracked as concurrent.futures.Future objects keyed on the
+request (method, URL, parameters and body). Waiters in other threads block
+on the future, and coroutines await it, from any event loop, so sync
+clients, async clients and separate run_async() loops all share one
+upstream call per key. A coroutine waiter that is cancelled (a timeout, or
+its loop shutting down) only stops waiting; the shared call and everyone
+else waiting on it are unaffected.
+
+Once the call finishes, its key is released, so later requests go through
+the response cache as usual.
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict
+
+
+class SingleFlight:
+    """Thread- and event-loop-safe registry of in-flight calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._counts = {"leaders": 0, "coalesced": 0}
+
+    def _join(self, key: str):
+        """Returns (future, is_leader) for a key, registering a new call if none is in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._counts["coalesced"] += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self._counts["leaders"] += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any = None, error: BaseException = None):
+        with self._lock:
+            del self._calls[key]
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Calls fn(), or waits for the in-flight call with the same key.
+
+        Args:
+            key: Request key
+            fn: Performs the upstream call
+
+        Returns:
+            The result of the (possibly shared) call; exceptions propagate to all waiters.
+        """
+        future, is_leader = self._join(key)
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Async counterpart of do(); fn returns the coroutine to await."""
+        future, is_leader = self._join(key)
+        if not is_leader:
+            # Shielded so cancelling this waiter never cancels the shared future
+            return await asyncio.shield(asyncio.wrap_future(future))
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Calls performed, calls that shared another's result, and calls in flight."""
+        with self._lock:
+            return {**self._counts, "in_flight": len(self._calls)}
+
+
+# Shared by the sync and async clients
+upstream_flights = SingleFlight()
@@ -0,0 +1,214 @@
+"""
+Shared HTTP transport for the upstream API clients.
+
+All clients send their requests through one requests.Session, which keeps
+a pool of keep-alive connections per host, so repeated calls to the same
+API reuse an open TCP/TLS connection instead of handshaking every time.
+Requests that fail with 429, a 5xx status or a connection error are
+retried with exponential backoff and full jitter (honouring Retry-After).
+A request may carry an overall deadline: attempt timeouts are cut to the
+time left and a retry only starts if its backoff still leaves room for an
+attempt, so an interactive call never outlives its timeout.
+Per-host latency, retry and error counts are recorded for the health
+endpoint. fan_out() runs independent calls (e.g. the NeoWs and SBDB halves
+of a lookup) concurrently on a small thread pool, so they still share the
+pooled connections.
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Shortest attempt worth starting before a deadline
+MIN_ATTEMPT_S = 0.5
+
+
+def backoff_delay(attempt: int, base_s: float, max_s: float, retry_after: Optional[str] = None) -> float:
+    """
+    Delay before retry number `attempt` (0-based).
+
+    Uses "full jitter": a uniform draw from [0, min(max_s, base_s * 2^attempt)].
+    A numeric Retry-After header takes precedence, capped at max_s.
+    """
+    if retry_after:
+        try:
+            return min(float(retry_after), max_s)
+        except ValueError:
+            pass
+    return random.uniform(0, min(max_s, base_s * 2 ** attempt))
+
+
+def retry_fits(deadline: Optional[float], delay: float) -> bool:
+    """Whether a retry after `delay` seconds still leaves MIN_ATTEMPT_S before a perf_counter() deadline (None: no deadline)."""
+    return deadline is None or time.perf_counter() + delay + MIN_ATTEMPT_S <= deadline
+
+
+class TransportMetrics:
+    """Thread-safe per-host request counters and recent latencies."""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, host: str, latency_s: float, status: Optional[int], retries: int, failed: bool):
+        with self._lock:
+            stats = self._hosts.setdefault(host, {
+                "requests": 0, "failures": 0, "retries": 0,
+                "status_counts": {}, "latencies_s": deque(maxlen=self.window),
+            })
+            stats["requests"] += 1
+            stats["retries"] += retries
+            stats["failures"] += int(failed)
+            key = str(status) if status is not None else "connection_error"
+            stats["status_counts"][key] = stats["status_counts"].get(key, 0) + 1
+            stats["latencies_s"].append(latency_s)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Counters and latency percentiles (ms) over the recent window, per host."""
+        with self._lock:
+            hosts = {host: dict(stats, latencies_s=sorted(stats["latencies_s"]))
+                     for host, stats in self._hosts.items()}
+
+        result = {}
+        for host, stats in hosts.items():
+            latencies = stats.pop("latencies_s")
+            percentile = lambda q: round(latencies[min(int(q * len(latencies)), len(latencies) - 1)] * 1000, 1)
+            stats["status_counts"] = dict(stats["status_counts"])
+            stats["latency_ms"] = {
+                "p50": percentile(0.5), "p95": percentile(0.95), "max": round(latencies[-1] * 1000, 1)
+            } if latencies else None
+            result[host] = stats
+        return result
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+# Shared by the sync transport and the async clients
+upstream_metrics = TransportMetrics()
+
+
+class HttpTransport:
+    """Pooled keep-alive session with retries, backoff and metrics."""
+
+    def __init__(self, pool_connections: int = None, pool_maxsize: int = None, max_retries: int = None,
+                 backoff_base_s: float = None, backoff_max_s: float = None,
+                 metrics: TransportMetrics = None):
+        self.max_retries = config.HTTP_MAX_RETRIES if max_retries is None else max_retries
+        self.backoff_base_s = config.HTTP_BACKOFF_BASE_S if backoff_base_s is None else backoff_base_s
+        self.backoff_max_s = config.HTTP_BACKOFF_MAX_S if backoff_max_s is None else backoff_max_s
+        self.metrics = metrics or upstream_metrics
+
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections or config.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=pool_maxsize or config.HTTP_POOL_MAXSIZE,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method: str, url: str, deadline_s: float = None, **kwargs) -> requests.Response:
+        """
+        Sends a request, retrying on 429/5xx and connection errors.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            deadline_s: Overall budget in seconds for every attempt and backoff;
+                each attempt's timeout is cut to the time left and retries that
+                cannot fit are skipped. None keeps the full retry budget.
+            **kwargs: Passed to requests.Session.request (params, json, timeout, ...)
+
+        Returns:
+            The final response (which may still carry an error status).
+
+        Raises:
+            requests.exceptions.RequestException: If every attempt failed to connect.
+        """
+        host = urlsplit(url).netloc
+        start = time.perf_counter()
+        deadline = None if deadline_s is None else start + deadline_s
+        timeout = kwargs.pop("timeout", deadline_s)
+        attempt = 0
+        while True:
+            if deadline is not None:
+                timeout = min(deadline_s if timeout is None else timeout,
+                              max(deadline - time.perf_counter(), MIN_ATTEMPT_S))
+            try:
+                response = self.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                delay = backoff_delay(attempt, self.backoff_base_s, self.backoff_max_s)
+                if attempt >= self.max_retries or not retry_fits(deadline, delay):
+                    self.metrics.record(host, time.perf_counter() - start, None, attempt, True)
+                    raise
+                logger.warning(f"{method} {host} failed ({e.__class__.__name__}); retrying in {delay:.2f}s")
+            else:
+                delay = backoff_delay(attempt, self.backoff_base_s, self.backoff_max_s,
+                                      response.headers.get("Retry-After"))
+                if (response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries
+                        or not retry_fits(deadline, delay)):
+                    self.metrics.record(host, time.perf_counter() - start, response.status_code,
+                                        attempt, response.status_code >= 400)
+                    return response
+                logger.warning(f"{method} {host} returned {response.status_code}; retrying in {delay:.2f}s")
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+
+_transport: Optional[HttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """Returns the process-wide transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpTransport()
+    return _transport
+
+
+_fan_out_executor: Optional[ThreadPoolExecutor] = None
+_fan_out_lock = threading.Lock()
+
+
+def fan_out(*calls: Callable[[], T]) -> List[T]:
+    """
+    Runs independent blocking calls concurrently and returns their results in order.
+
+    The first call runs on the calling thread, the rest on a shared pool of
+    HTTP_FANOUT_WORKERS threads. Each runs in a copy of the caller's context,
+    so the request_priority() lane carries over. Exceptions propagate.
+    """
+    global _fan_out_executor
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    if _fan_out_executor is None:
+        with _fan_out_lock:
+            if _fan_out_executor is None:
+                _fan_out_executor = ThreadPoolExecutor(max_workers=config.HTTP_FANOUT_WORKERS,
+                                                       thread_name_prefix="upstream-fan-out")
+    futures = [_fan_out_executor.submit(copy_context().run, call) for call in calls[1:]]
+    first = calls[0]()
+    return [first] + [future.result() for future in futures]
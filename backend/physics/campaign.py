@@ -0,0 +1,251 @@
+"""
+Multi-spacecraft deflection campaign planning.
+Searches combinations and schedules of deflection missions under mass and
+launch constraints for the cheapest plans that reach a target miss distance.
+"""
+
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+
+from backend.physics.mitigation import MitigationStrategies
+
+
+class CampaignPlanner:
+    """Branch-and-bound search over staged deflection campaigns."""
+
+    # Search nodes explored before plan_campaign gives up and returns the best plans so far
+    DEFAULT_MAX_NODES = 200000
+    PROGRESS_EVERY_NODES = 1000
+
+    @staticmethod
+    def evaluate_candidates(
+        asteroid_params: Dict[str, float],
+        orbital_params: Dict[str, float],
+        candidates: List[Dict[str, any]]
+    ) -> List[Dict[str, any]]:
+        """
+        Evaluate each candidate launch once with the single-method models.
+
+        Args:
+            asteroid_params: Dictionary with 'mass_kg' and optionally 'diameter_m', 'velocity_ms'
+            orbital_params: Dictionary with 'period_years'
+            candidates: Launch candidates, each with 'type', 'params',
+                        'time_to_impact_years' and optionally 'id', 'slot',
+                        'launch_mass_kg' and 'cost'
+
+        Returns:
+            List of evaluated candidates with 'delta_v_ms', 'miss_distance_m',
+            'launch_mass_kg' and 'cost'; candidates that cannot contribute are dropped
+        """
+        mass_kg = asteroid_params['mass_kg']
+        period_years = orbital_params.get('period_years', 2.0)
+
+        evaluated = []
+        for index, candidate in enumerate(candidates):
+            mission_type = candidate['type']
+            params = candidate.get('params', {})
+            lead_time_years = candidate['time_to_impact_years']
+
+            if mission_type == 'kinetic_impactor':
+                result = MitigationStrategies.kinetic_impactor_mission(
+                    mass_kg, asteroid_params.get('velocity_ms', 20000), **params
+                )
+                launch_mass_kg = result['impactor_mass_kg']
+                effective_lead_years = lead_time_years
+            elif mission_type == 'gravity_tractor':
+                result = MitigationStrategies.gravity_tractor_mission(mass_kg, **params)
+                launch_mass_kg = params['tractor_mass_kg']
+                # A constant tow acts, on average, half-way through the mission
+                effective_lead_years = lead_time_years - params['mission_duration_years'] / 2
+            elif mission_type in ['nuclear_standoff', 'nuclear_subsurface']:
+                result = MitigationStrategies.nuclear_deflection(
+                    mass_kg, asteroid_params.get('diameter_m', 1000), **params
+                )
+                launch_mass_kg = 0.0
+                effective_lead_years = lead_time_years
+            else:
+                continue
+
+            launch_mass_kg = candidate.get('launch_mass_kg', launch_mass_kg)
+            coefficient = float(MitigationStrategies.deflection_per_unit_delta_v(
+                period_years, effective_lead_years
+            ))
+            miss_distance_m = abs(result['delta_v_ms']) * coefficient
+            if miss_distance_m <= 0:
+                continue
+
+            evaluated.append({
+                'id': candidate.get('id', f"{mission_type}_{index}"),
+                'type': mission_type,
+                'slot': candidate.get('slot', f"_candidate_{index}"),
+                'time_to_impact_years': lead_time_years,
+                'delta_v_ms': result['delta_v_ms'],
+                'miss_distance_m': miss_distance_m,
+                'launch_mass_kg': launch_mass_kg,
+                'cost': candidate.get('cost', launch_mass_kg)
+            })
+
+        return evaluated
+
+    @staticmethod
+    def plan_campaign(
+        asteroid_params: Dict[str, float],
+        orbital_params: Dict[str, float],
+        candidates: List[Dict[str, any]],
+        target_miss_distance_m: float,
+        mass_budget_kg: float = None,
+        max_launches: int = None,
+        max_plans: int = 5,
+        max_nodes: int = None,
+        progress: Optional[Callable[[float], None]] = None
+    ) -> Dict[str, any]:
+        """
+        Find the cheapest campaigns whose combined deflection reaches a target.
+
+        Miss distances of individual launches add under the linear deflection
+        mapping. The search is a depth-first branch-and-bound over launch slots:
+        - a fractional (cost per meter) lower bound prunes expensive branches,
+        - a reachability bound prunes branches that cannot reach the target,
+        - when only the best plan is wanted, partial states (slot, remaining
+          miss, mass left, launches left) are memoized so dominated partial
+          plans are never expanded twice. A dominated partial plan can still
+          complete a runner-up plan, so the memo is off when max_plans > 1.
+
+        Args:
+            asteroid_params: Dictionary with asteroid properties
+            orbital_params: Dictionary with orbital parameters
+            candidates: Launch candidates (see evaluate_candidates)
+            target_miss_distance_m: Required miss distance
+            mass_budget_kg: Total launch mass available (unbounded if None)
+            max_launches: Maximum number of launches (unbounded if None)
+            max_plans: Number of cheapest plans to return
+            max_nodes: Search node budget (default: DEFAULT_MAX_NODES)
+            progress: Called every PROGRESS_EVERY_NODES nodes with the share of the
+                      node budget used; may raise to abort the search
+
+        Returns:
+            Dictionary with the ranked plans and search statistics
+        """
+        if max_nodes is None:
+            max_nodes = CampaignPlanner.DEFAULT_MAX_NODES
+
+        evaluated = CampaignPlanner.evaluate_candidates(asteroid_params, orbital_params, candidates)
+
+        # Group by launch slot (at most one candidate per slot flies),
+        # cheapest-per-meter option first inside each group
+        groups_by_slot: Dict[str, List[Dict[str, any]]] = {}
+        for option in evaluated:
+            groups_by_slot.setdefault(option['slot'], []).append(option)
+        groups = [
+            sorted(options, key=lambda o: o['cost'] / o['miss_distance_m'])
+            for options in groups_by_slot.values()
+        ]
+        # Most efficient slots first so good incumbents are found early
+        groups.sort(key=lambda options: options[0]['cost'] / options[0]['miss_distance_m'])
+        n_groups = len(groups)
+
+        # Suffix bounds over groups[g:]
+        suffix_min_ratio = [math.inf] * (n_groups + 1)
+        suffix_max_miss = [0.0] * (n_groups + 1)
+        for g in range(n_groups - 1, -1, -1):
+            best_ratio = min(o['cost'] / o['miss_distance_m'] for o in groups[g])
+            suffix_min_ratio[g] = min(suffix_min_ratio[g + 1], best_ratio)
+            suffix_max_miss[g] = suffix_max_miss[g + 1] + max(o['miss_distance_m'] for o in groups[g])
+
+        mass_left0 = math.inf if mass_budget_kg is None else mass_budget_kg
+        launches_left0 = n_groups if max_launches is None else max_launches
+        miss_quantum_m = max(target_miss_distance_m, 1.0) / 1000.0
+        mass_quantum_kg = 100.0
+
+        plans: List[Tuple[float, List[Dict[str, any]]]] = []
+        memo: Dict[Tuple[int, int, float, int], Tuple[float, float, float]] = {}
+        stats = {'nodes_explored': 0, 'pruned_by_bound': 0, 'pruned_by_memo': 0, 'search_complete': True}
+
+        def threshold() -> float:
+            return plans[-1][0] if len(plans) >= max_plans else math.inf
+
+        def record(cost: float, chosen: List[Dict[str, any]]):
+            plans.append((cost, list(chosen)))
+            plans.sort(key=lambda plan: plan[0])
+            del plans[max_plans:]
+
+        def search(g: int, remaining_m: float, mass_left: float, launches_left: int,
+                   cost: float, chosen: List[Dict[str, any]]):
+            if stats['nodes_explored'] >= max_nodes:
+                stats['search_complete'] = False
+                return
+            stats['nodes_explored'] += 1
+            if progress is not None and stats['nodes_explored'] % CampaignPlanner.PROGRESS_EVERY_NODES == 0:
+                progress(stats['nodes_explored'] / max_nodes)
+
+            if remaining_m <= 0:
+                record(cost, chosen)
+                return
+            if g == n_groups or launches_left == 0:
+                return
+            if suffix_max_miss[g] < remaining_m:
+                stats['pruned_by_bound'] += 1
+                return
+            if cost + remaining_m * suffix_min_ratio[g] >= threshold():
+                stats['pruned_by_bound'] += 1
+                return
+
+            # Dominance pruning is only exact for the single best plan
+            if max_plans == 1:
+                key = (
+                    g,
+                    int(math.ceil(remaining_m / miss_quantum_m)),
+                    math.inf if mass_left == math.inf else int(mass_left // mass_quantum_kg),
+                    launches_left
+                )
+                previous = memo.get(key)
+                if previous is not None:
+                    prev_cost, prev_remaining, prev_mass = previous
+                    if prev_cost <= cost and prev_remaining <= remaining_m and prev_mass >= mass_left:
+                        stats['pruned_by_memo'] += 1
+                        return
+                if previous is None or cost < previous[0]:
+                    memo[key] = (cost, remaining_m, mass_left)
+
+            for option in groups[g]:
+                if option['launch_mass_kg'] > mass_left:
+                    continue
+                chosen.append(option)
+                search(
+                    g + 1,
+                    remaining_m - option['miss_distance_m'],
+                    mass_left - option['launch_mass_kg'],
+                    launches_left - 1,
+                    cost + option['cost'],
+                    chosen
+                )
+                chosen.pop()
+
+            # Leave this slot unused
+            search(g + 1, remaining_m, mass_left, launches_left, cost, chosen)
+
+        search(0, target_miss_distance_m, mass_left0, launches_left0, 0.0, [])
+
+        ranked_plans = []
+        for cost, chosen in plans:
+            launches = sorted(chosen, key=lambda o: -o['time_to_impact_years'])
+            ranked_plans.append({
+                'total_cost': cost,
+                'total_launch_mass_kg': sum(o['launch_mass_kg'] for o in launches),
+                'achieved_miss_distance_m': sum(o['miss_distance_m'] for o in launches),
+                'achieved_miss_distance_km': sum(o['miss_distance_m'] for o in launches) / 1000,
+                'launch_count': len(launches),
+                'launches': launches
+            })
+
+        return {
+            'target_miss_distance_m': target_miss_distance_m,
+            'target_miss_distance_km': target_miss_distance_m / 1000,
+            'mass_budget_kg': mass_budget_kg,
+            'max_launches': max_launches,
+            'candidate_count': len(evaluated),
+            'slot_count': n_groups,
+            'feasible': bool(ranked_plans),
+            'plans': ranked_plans,
+            'search_statistics': stats
+        }
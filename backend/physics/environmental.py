@@ -4,14 +4,13 @@ Handles tsunami generation, seismic effects, and atmospheric disturbances.
 """
 
 import numpy as np
-import geopandas as gpd
-from shapely.geometry import Point, Polygon
-from scipy.interpolate import interp1d
-from scipy.integrate import quad
 from typing import Dict, List, Tuple, Optional, Union
 import warnings
 
 from backend.utils.conversions import UnitConverter, validate_coordinates
+from backend.utils.city_index import get_city_index
+from backend.utils.geodesy import haversine_km
+from backend.utils.land_mask import get_land_mask
 from config.constants import (
     EARTH_RADIUS_M, EARTH_RADIUS_KM, OCEAN_DEPTH_AVG_M, SEISMIC_WAVE_VELOCITY_MS,
     TSUNAMI_WAVE_VELOCITY_MS, TSUNAMI_EFFICIENCY_OCEAN, TSUNAMI_EFFICIENCY_LAND,
@@ -25,12 +24,21 @@ class EnvironmentalEffects:
     
     # Earth properties
     EARTH_CIRCUMFERENCE_M = 2 * np.pi * EARTH_RADIUS_M
+    
+    # MMI levels and their PGA thresholds (g), ordered by threshold for searchsorted
+    _MMI_LEVELS = np.array(sorted(MMI_THRESHOLDS), dtype=int)
+    _MMI_THRESHOLDS_G = np.array([MMI_THRESHOLDS[level] for level in sorted(MMI_THRESHOLDS)])
+    
+    # Blast overpressure vs scaled distance (km/kt^0.33), as in ImpactPhysics.impact_effects_radius
+    _BLAST_SCALED_DISTANCE_KM = np.array([0.5, 1.0, 2.2])
+    _BLAST_OVERPRESSURE_PSI = np.array([20.0, 5.0, 1.0])
 
     @staticmethod
     def is_ocean_impact(latitude: float, longitude: float) -> bool:
         """
         Determine if impact coordinates are over ocean.
-        This is a simplified version - real implementation would use coastline data.
+        Uses the global land mask when it is available, otherwise a coarse
+        continent bounding-box approximation.
         
         Args:
             latitude: Impact latitude in degrees
@@ -42,8 +50,11 @@ class EnvironmentalEffects:
         if not validate_coordinates(latitude, longitude):
             return False
         
-        # Simplified ocean detection based on major land masses
-        # Real implementation would use detailed coastline/bathymetry data
+        land_mask = get_land_mask()
+        if land_mask is not None:
+            return land_mask.is_ocean(latitude, longitude)
+        
+        # Fallback: simplified ocean detection based on major land masses
         
         # Major continents (very simplified boundaries)
         land_regions = [
@@ -193,11 +204,8 @@ class EnvironmentalEffects:
         
         # Wave arrival times
         # Integrate travel time over variable bathymetry
-        arrival_times_s = np.zeros_like(distances_km)
-        for i in range(1, len(distances_km)):
-            segment_distance_m = (distances_m[i] - distances_m[i-1])
-            avg_speed_ms = (wave_speeds_ms[i] + wave_speeds_ms[i-1]) / 2
-            arrival_times_s[i] = arrival_times_s[i-1] + segment_distance_m / avg_speed_ms
+        segment_times_s = np.diff(distances_m) / ((wave_speeds_ms[1:] + wave_speeds_ms[:-1]) / 2)
+        arrival_times_s = np.concatenate([[0.0], np.cumsum(segment_times_s)])
         
         # Wave periods (approximately constant for long waves)
         periods_s = np.full_like(distances_km, tsunami_params['wave_period_s'])
@@ -214,6 +222,84 @@ class EnvironmentalEffects:
             'energy_remaining': energy_factor
         }
 
+    @staticmethod
+    def coastal_runup(
+        tsunami_params: Dict[str, float],
+        distances_km: np.ndarray,
+        path_depths_m: np.ndarray = None,
+        shore_depth_m: Union[float, np.ndarray] = 10.0,
+        beach_slope: Union[float, np.ndarray] = 0.01
+    ) -> Dict[str, np.ndarray]:
+        """
+        Vectorized tsunami run-up estimate for many coastal points.
+        Deep-water amplitude decays as in tsunami_propagation (cylindrical
+        spreading from the source radius plus dissipation), is shoaled to the
+        shore depth with Green's law, and converted to run-up with Synolakis
+        (1987): R/h = 2.831·sqrt(cot β)·(H/h)^(5/4) for non-breaking waves and
+        R/h = 0.918·(H/h)^0.606 once H/h exceeds 0.818·(tan β)^(10/9).
+        
+        Args:
+            tsunami_params: Output from tsunami_generation
+            distances_km: Great-circle distance from the impact to each point (N,)
+            path_depths_m: Depths sampled along each path (N, K); samples at or
+                           above sea level mark land in the way. Defaults to
+                           the average ocean depth.
+            shore_depth_m: Nearshore depth where Green's law stops
+            beach_slope: Beach slope tan β
+            
+        Returns:
+            Dictionary of per-point arrays and 'ranking' (indices by descending run-up)
+        """
+        distances_km = np.asarray(distances_km, dtype=float)
+        if path_depths_m is None:
+            path_depths_m = np.full((len(distances_km), 1), OCEAN_DEPTH_AVG_M)
+        path_depths_m = np.asarray(path_depths_m, dtype=float)
+        
+        # Path statistics: land fraction, mean depth and harmonic-mean speed of the wet samples
+        wet = path_depths_m > 0
+        wet_fraction = wet.mean(axis=1)
+        n_wet = np.maximum(wet.sum(axis=1), 1)
+        mean_depth_m = np.where(wet, path_depths_m, 0.0).sum(axis=1) / n_wet
+        mean_depth_m = np.where(wet_fraction > 0, mean_depth_m, OCEAN_DEPTH_AVG_M)
+        mean_slowness = np.where(wet, 1.0 / np.sqrt(9.81 * np.maximum(path_depths_m, 1.0)), 0.0).sum(axis=1) / n_wet
+        mean_slowness = np.where(wet_fraction > 0, mean_slowness, 1.0 / np.sqrt(9.81 * OCEAN_DEPTH_AVG_M))
+        arrival_times_s = distances_km * 1000 * mean_slowness
+        blocked = wet_fraction < 0.9
+        
+        # Deep-water amplitude off the coast
+        source_radius_km = max(tsunami_params['crater_diameter_m'] / 2000.0, 0.1)
+        geometric_factor = np.sqrt(source_radius_km / np.maximum(distances_km, source_radius_km))
+        energy_factor = np.exp(-distances_km / TSUNAMI_DISSIPATION_LENGTH_KM)
+        offshore_amplitude_m = tsunami_params['initial_amplitude_m'] * geometric_factor * np.sqrt(energy_factor)
+        offshore_amplitude_m = np.where(blocked, 0.0, offshore_amplitude_m)
+        
+        # Green's law shoaling from the path depth to the shore depth
+        shore_depth_m = np.broadcast_to(np.asarray(shore_depth_m, dtype=float), distances_km.shape)
+        shore_amplitude_m = offshore_amplitude_m * (mean_depth_m / shore_depth_m) ** 0.25
+        
+        # Synolakis run-up law, with the breaking branch
+        beach_slope = np.broadcast_to(np.asarray(beach_slope, dtype=float), distances_km.shape)
+        relative_height = shore_amplitude_m / shore_depth_m
+        breaking = relative_height > 0.818 * beach_slope ** (10 / 9)
+        runup_m = shore_depth_m * np.where(
+            breaking,
+            0.918 * relative_height ** 0.606,
+            2.831 * np.sqrt(1.0 / beach_slope) * relative_height ** 1.25
+        )
+        
+        return {
+            'distances_km': distances_km,
+            'mean_path_depth_m': mean_depth_m,
+            'arrival_times_s': arrival_times_s,
+            'arrival_times_h': arrival_times_s / 3600,
+            'offshore_amplitudes_m': offshore_amplitude_m,
+            'shore_amplitudes_m': shore_amplitude_m,
+            'runup_m': runup_m,
+            'breaking': breaking,
+            'path_blocked': blocked,
+            'ranking': np.argsort(-runup_m, kind='stable')
+        }
+
     @staticmethod
     def seismic_effects(
         impact_energy_j: float,
@@ -233,60 +319,153 @@ class EnvironmentalEffects:
         Returns:
             Dictionary with seismic effects
         """
-        # Estimate earthquake magnitude from energy
+        arrays = EnvironmentalEffects.seismic_effects_array(
+            impact_energy_j, impact_lat, impact_lon,
+            np.asarray(observation_points, dtype=float).reshape(-1, 2)
+        )
+        
+        return {
+            'magnitude': arrays['magnitude'],
+            'impact_coordinates': (impact_lat, impact_lon),
+            'observation_points': observation_points,
+            'distances_km': arrays['distances_km'].tolist(),
+            'travel_times_s': arrays['travel_times_s'].tolist(),
+            'peak_accelerations_g': arrays['peak_accelerations_g'].tolist(),
+            'intensities_mmi': arrays['intensities_mmi'].tolist()  # Modified Mercalli Intensity
+        }
+
+    @staticmethod
+    def seismic_effects_array(
+        impact_energy_j: float,
+        impact_lat: float,
+        impact_lon: float,
+        observation_coords: np.ndarray
+    ) -> Dict[str, Union[float, np.ndarray]]:
+        """
+        Vectorized seismic effects for large sets of observation points.
+        Same model as seismic_effects, evaluated in one pass.
+        
+        Args:
+            impact_energy_j: Impact energy in Joules
+            impact_lat: Impact latitude
+            impact_lon: Impact longitude
+            observation_coords: (N, 2) array of (lat, lon) in degrees
+            
+        Returns:
+            Dictionary with the magnitude and per-point arrays of distance,
+            travel time, peak ground acceleration and MMI
+        """
+        observation_coords = np.asarray(observation_coords, dtype=float)
+        
         # Gutenberg-Richter relation: log10(E) = 1.5*M + 4.8 (energy in Joules)
         if impact_energy_j > 0:
             magnitude = (np.log10(impact_energy_j) - 4.8) / 1.5
         else:
             magnitude = 0
         
-        # Calculate distances to observation points
-        impact_point = Point(impact_lon, impact_lat)
+        distances_km = haversine_km(
+            impact_lat, impact_lon, observation_coords[:, 0], observation_coords[:, 1]
+        )
+        
+        # P-wave travel time (simplified)
+        travel_times_s = (distances_km * 1000) / SEISMIC_WAVE_VELOCITY_MS
         
-        results = {
+        pga_g, intensities_mmi = EnvironmentalEffects.seismic_intensity_at_distance(
+            magnitude, distances_km
+        )
+        
+        return {
             'magnitude': magnitude,
             'impact_coordinates': (impact_lat, impact_lon),
-            'observation_points': observation_points,
-            'distances_km': [],
-            'travel_times_s': [],
-            'peak_accelerations_g': [],
-            'intensities_mmi': []  # Modified Mercalli Intensity
+            'distances_km': distances_km,
+            'travel_times_s': travel_times_s,
+            'peak_accelerations_g': np.maximum(pga_g, 0.001),  # Minimum detectable
+            'intensities_mmi': intensities_mmi
         }
+
+    @staticmethod
+    def seismic_intensity_at_distance(
+        magnitude: float,
+        distances_km: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Peak ground acceleration and MMI at given epicentral distances.
         
-        for obs_lat, obs_lon in observation_points:
-            obs_point = Point(obs_lon, obs_lat)
-            
-            # Great circle distance (Haversine formula)
-            distance_km = EnvironmentalEffects._haversine_distance(
-                impact_lat, impact_lon, obs_lat, obs_lon
-            )
-            results['distances_km'].append(distance_km)
-            
-            # P-wave travel time (simplified)
-            travel_time_s = (distance_km * 1000) / SEISMIC_WAVE_VELOCITY_MS
-            results['travel_times_s'].append(travel_time_s)
-            
-            # Peak ground acceleration (simplified attenuation)
-            # Based on Boore-Atkinson Ground Motion Prediction Equation (simplified)
-            if distance_km > 0:
-                # Log acceleration decreases with distance and magnitude
-                log_pga = magnitude - 3.5 * np.log10(distance_km) - 2.0
-                pga_g = 10 ** log_pga  # in units of g
-            else:
-                pga_g = 10.0  # Very high acceleration at ground zero
+        Args:
+            magnitude: Equivalent earthquake magnitude
+            distances_km: Distances from the impact (any shape)
             
-            results['peak_accelerations_g'].append(max(pga_g, 0.001))  # Minimum detectable
+        Returns:
+            Tuple of (PGA in g, MMI level) arrays
+        """
+        distances_km = np.asarray(distances_km, dtype=float)
+        
+        # Peak ground acceleration (simplified Boore-Atkinson attenuation),
+        # very high acceleration at ground zero
+        with np.errstate(divide='ignore'):
+            log_pga = magnitude - 3.5 * np.log10(distances_km) - 2.0
+        pga_g = np.where(distances_km > 0, 10.0 ** log_pga, 10.0)
+        
+        # Modified Mercalli Intensity: highest level whose PGA threshold is reached
+        levels = np.searchsorted(EnvironmentalEffects._MMI_THRESHOLDS_G, pga_g, side='right') - 1
+        return pga_g, EnvironmentalEffects._MMI_LEVELS[np.maximum(levels, 0)]
+
+    @staticmethod
+    def overpressure_at_distance(
+        impact_energy_j: float,
+        distances_km: np.ndarray
+    ) -> np.ndarray:
+        """
+        Peak blast overpressure at given ground distances.
+        Interpolates log-log through the scaled-distance points used by
+        ImpactPhysics.impact_effects_radius (20, 5 and 1 psi at 0.5, 1.0 and
+        2.2 km/kt^0.33), extrapolating with the end slopes.
+        
+        Args:
+            impact_energy_j: Impact energy in Joules
+            distances_km: Distances from the impact (any shape)
             
-            # Modified Mercalli Intensity (empirical relation to PGA)
-            mmi = 1  # Default: Not felt
-            for intensity, threshold in sorted(MMI_THRESHOLDS.items(), reverse=True):
-                if pga_g >= threshold:
-                    mmi = intensity
-                    break
+        Returns:
+            Overpressure in psi
+        """
+        tnt_kt = UnitConverter.tnt_equivalent(impact_energy_j, 'TNT_kt')
+        if tnt_kt <= 0:
+            return np.zeros(np.shape(distances_km))
+        
+        scaled_distance = np.maximum(np.asarray(distances_km, dtype=float), 1e-6) / tnt_kt ** 0.33
+        log_r = np.log10(EnvironmentalEffects._BLAST_SCALED_DISTANCE_KM)
+        log_p = np.log10(EnvironmentalEffects._BLAST_OVERPRESSURE_PSI)
+        log_x = np.log10(scaled_distance)
+        
+        # Piecewise-linear in log-log space, extended beyond the end points
+        segment = np.clip(np.searchsorted(log_r, log_x) - 1, 0, len(log_r) - 2)
+        slope = (log_p[segment + 1] - log_p[segment]) / (log_r[segment + 1] - log_r[segment])
+        return 10.0 ** (log_p[segment] + slope * (log_x - log_r[segment]))
+
+    @staticmethod
+    def thermal_fluence_at_distance(
+        impact_energy_j: float,
+        distances_km: np.ndarray,
+        thermal_energy_fraction: float = 0.35
+    ) -> np.ndarray:
+        """
+        Thermal radiation fluence at given ground distances, treating the
+        fireball as an isotropic point source (no atmospheric absorption).
+        Inside the fireball radius the fluence is held at its surface value.
+        
+        Args:
+            impact_energy_j: Impact energy in Joules
+            distances_km: Distances from the impact (any shape)
+            thermal_energy_fraction: Fraction of energy radiated (as atmospheric_effects)
             
-            results['intensities_mmi'].append(mmi)
+        Returns:
+            Fluence in J/m^2
+        """
+        tnt_kt = UnitConverter.tnt_equivalent(impact_energy_j, 'TNT_kt')
+        fireball_radius_m = 50 * (max(tnt_kt, 0) ** 0.4)
         
-        return results
+        range_m = np.maximum(np.asarray(distances_km, dtype=float) * 1000, max(fireball_radius_m, 1.0))
+        return thermal_energy_fraction * impact_energy_j / (4 * np.pi * range_m**2)
 
     @staticmethod
     def atmospheric_effects(
@@ -340,27 +519,65 @@ class EnvironmentalEffects:
         }
 
     @staticmethod
-    def _haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    def affected_cities(
+        impact_energy_j: float,
+        impact_lat: float,
+        impact_lon: float,
+        radius_km: float = None,
+        k: int = 10,
+        min_population: int = 0
+    ) -> Dict[str, any]:
         """
-        Calculate great circle distance between two points using Haversine formula.
+        Seismic, blast, thermal and tsunami effects at the cities around an impact.
         
         Args:
-            lat1, lon1: First point coordinates (degrees)
-            lat2, lon2: Second point coordinates (degrees)
+            impact_energy_j: Impact energy in Joules
+            impact_lat: Impact latitude
+            impact_lon: Impact longitude
+            radius_km: Return all cities within this radius (overrides k)
+            k: Number of nearest cities when no radius is given
+            min_population: Skip smaller settlements
             
         Returns:
-            Distance in kilometers
+            Dictionary with the impact type and a list of cities (nearest
+            first) with their distance and effect values
         """
-        # Convert to radians
-        lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+        index = get_city_index()
+        if radius_km is not None:
+            matches = index.within_radius(impact_lat, impact_lon, radius_km, min_population)
+        else:
+            matches = index.nearest(impact_lat, impact_lon, k, min_population)
+        distances_km = matches['distances_km']
+        
+        magnitude = (np.log10(impact_energy_j) - 4.8) / 1.5 if impact_energy_j > 0 else 0
+        pga_g, mmi = EnvironmentalEffects.seismic_intensity_at_distance(magnitude, distances_km)
+        overpressure_psi = EnvironmentalEffects.overpressure_at_distance(impact_energy_j, distances_km)
+        thermal_fluence = EnvironmentalEffects.thermal_fluence_at_distance(impact_energy_j, distances_km)
+        
+        is_ocean = EnvironmentalEffects.is_ocean_impact(impact_lat, impact_lon)
+        tsunami = None
+        if is_ocean and len(distances_km):
+            tsunami = EnvironmentalEffects.coastal_runup(
+                EnvironmentalEffects.tsunami_generation(impact_energy_j), distances_km
+            )
         
-        # Haversine formula
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = np.sin(dlat/2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon/2)**2
-        c = 2 * np.arcsin(np.sqrt(a))
+        cities = index.records(matches['indices'], distances_km)
+        for n, city in enumerate(cities):
+            city.update({
+                'seismic_travel_time_s': float(distances_km[n] * 1000 / SEISMIC_WAVE_VELOCITY_MS),
+                'peak_acceleration_g': float(max(pga_g[n], 0.001)),
+                'intensity_mmi': int(mmi[n]),
+                'overpressure_psi': float(overpressure_psi[n]),
+                'thermal_fluence_j_m2': float(thermal_fluence[n]),
+                'tsunami_amplitude_m': float(tsunami['offshore_amplitudes_m'][n]) if tsunami else None,
+                'tsunami_arrival_time_h': float(tsunami['arrival_times_h'][n]) if tsunami else None,
+            })
         
-        return EARTH_RADIUS_KM * c
+        return {
+            'impact_type': 'ocean' if is_ocean else 'land',
+            'impact_coordinates': (impact_lat, impact_lon),
+            'cities': cities
+        }
 
     @staticmethod
     def complete_environmental_analysis(
@@ -376,23 +593,21 @@ class EnvironmentalEffects:
             impact_energy_j: Impact energy in Joules
             impact_lat: Impact latitude
             impact_lon: Impact longitude
-            observation_points: Points for detailed analysis
+            observation_points: Points for detailed analysis; defaults to the
+                                nearest major cities from the city index
             
         Returns:
             Complete environmental analysis
         """
-        if observation_points is None:
-            # Default observation points (major cities)
-            observation_points = [
-                (40.7128, -74.0060),  # New York
-                (51.5074, -0.1278),   # London
-                (35.6762, 139.6503),  # Tokyo
-                (-33.8688, 151.2093), # Sydney
-                (19.4326, -99.1332),  # Mexico City
-            ]
-        
         results = {}
         
+        if observation_points is None:
+            affected = EnvironmentalEffects.affected_cities(
+                impact_energy_j, impact_lat, impact_lon, k=5, min_population=100_000
+            )
+            results['affected_cities'] = affected['cities']
+            observation_points = [(city['lat'], city['lon']) for city in affected['cities']]
+        
         # Determine impact type
         is_ocean = EnvironmentalEffects.is_ocean_impact(impact_lat, impact_lon)
         results['impact_type'] = 'ocean' if is_ocean else 'land'
@@ -425,9 +640,3 @@ class EnvironmentalEffects:
         
         return results
 
-
-# TODO: Add API integration endpoints for environmental effects analysis
-
-
-if __name__ == "__main__":
-    run_environmental_test()
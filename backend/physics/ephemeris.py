@@ -0,0 +1,195 @@
+"""
+Analytic heliocentric ephemerides for Earth and small bodies.
+Vectorized Keplerian propagation so trajectory searches can evaluate thousands
+of epochs in a single array call. All states are heliocentric ecliptic J2000.
+"""
+
+import numpy as np
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from config.constants import GM_SUN, AU_M
+
+J2000_JD = 2451545.0
+SECONDS_PER_DAY = 86400.0
+DAYS_PER_CENTURY = 36525.0
+
+# Earth-Moon barycenter mean elements and rates per Julian century
+# Standish (1992), "Keplerian Elements for Approximate Positions of the Major Planets"
+# Valid 1800-2050 AD with ~20 arcsec accuracy, ample for launch window surveys
+EARTH_MEAN_ELEMENTS = {
+    'a_au': (1.00000261, 0.00000562),
+    'e': (0.01671123, -0.00004392),
+    'i_deg': (-0.00001531, -0.01294668),
+    'mean_longitude_deg': (100.46457166, 35999.37244981),
+    'long_perihelion_deg': (102.93768193, 0.32327364),
+    'long_node_deg': (0.0, 0.0),
+}
+
+
+def solve_kepler(mean_anomaly_rad: np.ndarray, e: np.ndarray, iterations: int = 12) -> np.ndarray:
+    """
+    Solve Kepler's equation M = E - e*sin(E) for elliptic orbits.
+
+    Args:
+        mean_anomaly_rad: Mean anomaly (radians), any shape
+        e: Eccentricity (< 1), broadcastable against mean_anomaly_rad
+        iterations: Fixed number of Newton iterations
+
+    Returns:
+        Eccentric anomaly (radians)
+    """
+    M = np.remainder(mean_anomaly_rad, 2 * np.pi)
+    e = np.asarray(e, dtype=float)
+    # Starting guess E0 = M + e*sin(M) converges for all e < 1 within a few steps
+    E = np.where(e < 0.8, M + e * np.sin(M), np.pi)
+    for _ in range(iterations):
+        E = E - (E - e * np.sin(E) - M) / (1 - e * np.cos(E))
+    return E
+
+
+def elements_to_state_vectors(
+    a_m: np.ndarray, e: np.ndarray, i_deg: np.ndarray, raan_deg: np.ndarray,
+    arg_per_deg: np.ndarray, mean_anomaly_deg: np.ndarray,
+    gm: float = GM_SUN
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Convert elliptic Keplerian elements to Cartesian state vectors.
+    Broadcasting counterpart of OrbitalMechanics.keplerian_to_cartesian that
+    takes mean rather than true anomaly.
+
+    Args:
+        a_m: Semi-major axis (m)
+        e: Eccentricity
+        i_deg: Inclination (degrees)
+        raan_deg: Longitude of ascending node (degrees)
+        arg_per_deg: Argument of periapsis (degrees)
+        mean_anomaly_deg: Mean anomaly (degrees)
+        gm: Gravitational parameter (default: Sun)
+
+    Returns:
+        Tuple of (positions, velocities) with a trailing axis of length 3,
+        in meters and m/s
+    """
+    a_m, e, i, raan, argp, M = np.broadcast_arrays(
+        np.asarray(a_m, dtype=float), np.asarray(e, dtype=float),
+        np.radians(i_deg), np.radians(raan_deg),
+        np.radians(arg_per_deg), np.radians(mean_anomaly_deg)
+    )
+
+    E = solve_kepler(M, e)
+    cos_E, sin_E = np.cos(E), np.sin(E)
+    sqrt_1me2 = np.sqrt(1 - e**2)
+
+    # Perifocal position and velocity
+    r = a_m * (1 - e * cos_E)
+    x_orb = a_m * (cos_E - e)
+    y_orb = a_m * sqrt_1me2 * sin_E
+    v_scale = np.sqrt(gm * a_m) / r
+    vx_orb = -v_scale * sin_E
+    vy_orb = v_scale * sqrt_1me2 * cos_E
+
+    # Perifocal -> ecliptic rotation (R3(-raan) R1(-i) R3(-argp)), first two columns
+    cos_O, sin_O = np.cos(raan), np.sin(raan)
+    cos_w, sin_w = np.cos(argp), np.sin(argp)
+    cos_i, sin_i = np.cos(i), np.sin(i)
+
+    p = np.stack([
+        cos_O * cos_w - sin_O * sin_w * cos_i,
+        sin_O * cos_w + cos_O * sin_w * cos_i,
+        sin_w * sin_i
+    ], axis=-1)
+    q = np.stack([
+        -cos_O * sin_w - sin_O * cos_w * cos_i,
+        -sin_O * sin_w + cos_O * cos_w * cos_i,
+        cos_w * sin_i
+    ], axis=-1)
+
+    positions = x_orb[..., None] * p + y_orb[..., None] * q
+    velocities = vx_orb[..., None] * p + vy_orb[..., None] * q
+    return positions, velocities
+
+
+def propagate_elements(elements: Dict[str, float], jd: np.ndarray, gm: float = GM_SUN) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Two-body propagation of osculating elements to arbitrary epochs.
+
+    Args:
+        elements: SBDB-style elements with keys 'a' (AU), 'e', 'i', 'om', 'w',
+                  'ma' (degrees) and 'epoch' (Julian date)
+        jd: Julian dates to evaluate, any shape
+        gm: Gravitational parameter (default: Sun)
+
+    Returns:
+        Tuple of (positions, velocities) of shape jd.shape + (3,)
+
+    Raises:
+        ValueError: If the elements carry no epoch (the mean anomaly would be
+            meaningless).
+    """
+    if elements.get('epoch') is None:
+        raise ValueError("Orbital elements have no 'epoch'; cannot propagate the mean anomaly")
+    jd = np.asarray(jd, dtype=float)
+    a_m = elements['a'] * AU_M
+    mean_motion_deg_s = np.degrees(np.sqrt(gm / a_m**3))
+    dt_s = (jd - elements['epoch']) * SECONDS_PER_DAY
+    mean_anomaly_deg = elements['ma'] + mean_motion_deg_s * dt_s
+
+    return elements_to_state_vectors(
+        a_m, elements['e'], elements['i'], elements['om'], elements['w'],
+        mean_anomaly_deg, gm
+    )
+
+
+def earth_state_vectors(jd: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Heliocentric Earth-Moon barycenter state from the Standish mean elements.
+
+    Args:
+        jd: Julian dates, any shape
+
+    Returns:
+        Tuple of (positions, velocities) of shape jd.shape + (3,)
+    """
+    T = (np.asarray(jd, dtype=float) - J2000_JD) / DAYS_PER_CENTURY
+    el = {key: value[0] + value[1] * T for key, value in EARTH_MEAN_ELEMENTS.items()}
+
+    arg_per_deg = el['long_perihelion_deg'] - el['long_node_deg']
+    mean_anomaly_deg = el['mean_longitude_deg'] - el['long_perihelion_deg']
+
+    return elements_to_state_vectors(
+        el['a_au'] * AU_M, el['e'], el['i_deg'], el['long_node_deg'],
+        arg_per_deg, mean_anomaly_deg
+    )
+
+
+@lru_cache(maxsize=32)
+def _earth_ephemeris_table(start_jd: float, n_days: int, step_days: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Build (and memoize) an evenly spaced Earth ephemeris table."""
+    jd = start_jd + step_days * np.arange(n_days)
+    positions, velocities = earth_state_vectors(jd)
+    for array in (jd, positions, velocities):
+        array.setflags(write=False)
+    return jd, positions, velocities
+
+
+def cached_earth_ephemeris(start_jd: float, stop_jd: float, step_days: float = 1.0) -> Dict[str, np.ndarray]:
+    """
+    Evenly spaced Earth ephemeris, memoized per (start, span, step).
+    Repeated porkchop surveys over the same departure window reuse the table.
+
+    Args:
+        start_jd: First Julian date
+        stop_jd: Last Julian date (inclusive if on the step grid)
+        step_days: Grid spacing in days
+
+    Returns:
+        Dictionary with read-only 'jd', 'positions_m' and 'velocities_ms' arrays
+    """
+    n_days = int(np.floor((stop_jd - start_jd) / step_days + 1e-9)) + 1
+    jd, positions, velocities = _earth_ephemeris_table(float(start_jd), max(n_days, 1), float(step_days))
+    return {
+        'jd': jd,
+        'positions_m': positions,
+        'velocities_ms': velocities
+    }
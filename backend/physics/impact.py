@@ -4,7 +4,6 @@ Handles kinetic energy, crater formation, and immediate impact effects.
 """
 
 import numpy as np
-import scipy.optimize as opt
 from typing import Dict, Tuple, Optional
 
 from backend.utils.conversions import (
@@ -0,0 +1,245 @@
+"""
+Lambert's problem and launch window (porkchop) analysis for interceptor missions.
+Solves many boundary-value problems at once so departure x arrival grids can be
+surveyed in a single vectorized pass.
+"""
+
+import numpy as np
+from typing import Dict, Optional
+
+from config.constants import GM_SUN, DEFAULT_MAX_LAUNCH_C3_KM2_S2
+from backend.physics.ephemeris import (
+    SECONDS_PER_DAY, cached_earth_ephemeris, propagate_elements
+)
+
+
+class LambertSolver:
+    """Vectorized zero-revolution Lambert solver and porkchop grid generator."""
+
+    @staticmethod
+    def _stumpff(z: np.ndarray):
+        """Stumpff functions C(z) and S(z), evaluated elementwise."""
+        C = np.full_like(z, 0.5)
+        S = np.full_like(z, 1.0 / 6.0)
+
+        pos = z > 1e-8
+        sz = np.sqrt(z[pos])
+        C[pos] = (1 - np.cos(sz)) / z[pos]
+        S[pos] = (sz - np.sin(sz)) / sz**3
+
+        neg = z < -1e-8
+        sz = np.sqrt(-z[neg])
+        C[neg] = (np.cosh(sz) - 1) / -z[neg]
+        S[neg] = (np.sinh(sz) - sz) / sz**3
+        return C, S
+
+    @staticmethod
+    def solve(
+        r1: np.ndarray,
+        r2: np.ndarray,
+        tof_s: np.ndarray,
+        gm: float = GM_SUN,
+        prograde: bool = True,
+        iterations: int = 60,
+        rtol: float = 1e-6
+    ) -> Dict[str, np.ndarray]:
+        """
+        Solve Lambert's problem for many transfers using universal variables.
+
+        Time of flight is monotonic in the universal variable z for
+        zero-revolution transfers, so every cell is solved by the same fixed
+        number of safeguarded bisection steps - no per-cell branching, which
+        keeps the whole batch in NumPy.
+
+        Args:
+            r1: Departure positions (m), shape (..., 3)
+            r2: Arrival positions (m), shape (..., 3)
+            tof_s: Times of flight (s), shape (...)
+            gm: Gravitational parameter (default: Sun)
+            prograde: Solve for prograde (True) or retrograde transfers
+            iterations: Number of bisection steps on z
+            rtol: Relative time-of-flight tolerance for the converged flag
+
+        Returns:
+            Dictionary with departure and arrival velocities (m/s, shape (..., 3))
+            and a boolean 'converged' mask; unconverged cells are NaN
+        """
+        r1 = np.asarray(r1, dtype=float)
+        r2 = np.asarray(r2, dtype=float)
+        tof_s = np.asarray(tof_s, dtype=float)
+        shape = np.broadcast_shapes(r1.shape[:-1], r2.shape[:-1], tof_s.shape)
+
+        r1 = np.broadcast_to(r1, shape + (3,)).reshape(-1, 3)
+        r2 = np.broadcast_to(r2, shape + (3,)).reshape(-1, 3)
+        tof = np.broadcast_to(tof_s, shape).ravel()
+
+        r1n = np.linalg.norm(r1, axis=1)
+        r2n = np.linalg.norm(r2, axis=1)
+        cos_dnu = np.clip(np.einsum('ij,ij->i', r1, r2) / (r1n * r2n), -1.0, 1.0)
+        cross_z = r1[:, 0] * r2[:, 1] - r1[:, 1] * r2[:, 0]
+
+        dnu = np.arccos(cos_dnu)
+        long_way = (cross_z < 0) if prograde else (cross_z >= 0)
+        dnu = np.where(long_way, 2 * np.pi - dnu, dnu)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            A = np.sin(dnu) * np.sqrt(r1n * r2n / (1 - cos_dnu))
+
+        sqrt_gm = np.sqrt(gm)
+
+        def time_of_flight(z):
+            C, S = LambertSolver._stumpff(z)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                y = r1n + r2n + A * (z * S - 1) / np.sqrt(C)
+                x = np.sqrt(np.maximum(y, 0.0) / C)
+                t = (x**3 * S + A * np.sqrt(np.maximum(y, 0.0))) / sqrt_gm
+            # y < 0 lies below the admissible z range: treat as "too short"
+            t = np.where(y < 0, -np.inf, t)
+            return t, y, C, S
+
+        z_low = np.full(tof.shape, -4 * np.pi**2)
+        z_high = np.full(tof.shape, 4 * np.pi**2 - 1e-9)
+
+        for _ in range(iterations):
+            z_mid = 0.5 * (z_low + z_high)
+            t_mid, _, _, _ = time_of_flight(z_mid)
+            too_short = t_mid < tof
+            z_low = np.where(too_short, z_mid, z_low)
+            z_high = np.where(too_short, z_high, z_mid)
+
+        z = 0.5 * (z_low + z_high)
+        t, y, C, S = time_of_flight(z)
+
+        converged = (
+            np.isfinite(A) & (np.abs(A) > 0) & (y > 0) &
+            (np.abs(t - tof) <= rtol * tof)
+        )
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = 1 - y / r1n
+            g = A * np.sqrt(y / gm)
+            g_dot = 1 - y / r2n
+            v1 = (r2 - f[:, None] * r1) / g[:, None]
+            v2 = (g_dot[:, None] * r2 - r1) / g[:, None]
+
+        v1[~converged] = np.nan
+        v2[~converged] = np.nan
+
+        return {
+            'v1_ms': v1.reshape(shape + (3,)),
+            'v2_ms': v2.reshape(shape + (3,)),
+            'converged': converged.reshape(shape)
+        }
+
+    @staticmethod
+    def porkchop(
+        orbital_elements: Dict[str, float],
+        departure_start_jd: float,
+        departure_stop_jd: float,
+        arrival_start_jd: float,
+        arrival_stop_jd: float,
+        departure_step_days: float = 1.0,
+        arrival_step_days: float = 1.0,
+        min_tof_days: float = 30.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Evaluate an Earth-to-asteroid transfer over a departure x arrival date grid.
+
+        Earth states come from the cached analytic ephemeris; asteroid states
+        are two-body propagations of the SBDB osculating elements.
+
+        Args:
+            orbital_elements: SBDB elements ('a' AU, 'e', 'i', 'om', 'w', 'ma', 'epoch')
+            departure_start_jd: First departure date (Julian date)
+            departure_stop_jd: Last departure date (Julian date)
+            arrival_start_jd: First arrival date (Julian date)
+            arrival_stop_jd: Last arrival date (Julian date)
+            departure_step_days: Departure grid spacing
+            arrival_step_days: Arrival grid spacing
+            min_tof_days: Cells with shorter flight times are left as NaN
+
+        Returns:
+            Dictionary with the date axes and (n_departure, n_arrival) grids of
+            time of flight, launch C3 (km²/s²) and arrival relative velocity (m/s)
+        """
+        earth = cached_earth_ephemeris(departure_start_jd, departure_stop_jd, departure_step_days)
+        departure_jd = earth['jd']
+
+        n_arrival = int(np.floor((arrival_stop_jd - arrival_start_jd) / arrival_step_days + 1e-9)) + 1
+        arrival_jd = arrival_start_jd + arrival_step_days * np.arange(max(n_arrival, 1))
+        asteroid_r, asteroid_v = propagate_elements(orbital_elements, arrival_jd)
+
+        tof_days = arrival_jd[None, :] - departure_jd[:, None]
+        valid = tof_days >= min_tof_days
+
+        c3_km2_s2 = np.full(tof_days.shape, np.nan)
+        v_rel_ms = np.full(tof_days.shape, np.nan)
+        v_inf_dep_ms = np.full(tof_days.shape, np.nan)
+
+        dep_idx, arr_idx = np.nonzero(valid)
+        if dep_idx.size:
+            solution = LambertSolver.solve(
+                earth['positions_m'][dep_idx],
+                asteroid_r[arr_idx],
+                tof_days[dep_idx, arr_idx] * SECONDS_PER_DAY
+            )
+            v_inf_dep = np.linalg.norm(solution['v1_ms'] - earth['velocities_ms'][dep_idx], axis=1)
+            v_rel = np.linalg.norm(solution['v2_ms'] - asteroid_v[arr_idx], axis=1)
+
+            v_inf_dep_ms[dep_idx, arr_idx] = v_inf_dep
+            c3_km2_s2[dep_idx, arr_idx] = (v_inf_dep / 1000) ** 2
+            v_rel_ms[dep_idx, arr_idx] = v_rel
+
+        return {
+            'departure_jd': departure_jd,
+            'arrival_jd': arrival_jd,
+            'tof_days': np.where(valid, tof_days, np.nan),
+            'departure_v_inf_ms': v_inf_dep_ms,
+            'c3_km2_s2': c3_km2_s2,
+            'arrival_relative_velocity_ms': v_rel_ms,
+            'arrival_relative_velocity_kms': v_rel_ms / 1000
+        }
+
+    @staticmethod
+    def best_launch_window(
+        porkchop: Dict[str, np.ndarray],
+        max_c3_km2_s2: float = DEFAULT_MAX_LAUNCH_C3_KM2_S2,
+        objective: str = 'max_relative_velocity'
+    ) -> Optional[Dict[str, float]]:
+        """
+        Pick the best launch opportunity from a porkchop grid.
+
+        Args:
+            porkchop: Output from porkchop
+            max_c3_km2_s2: Launch vehicle C3 capability
+            objective: 'max_relative_velocity' (most momentum per kg of impactor),
+                       'min_c3' (most launch margin) or 'earliest_arrival'
+
+        Returns:
+            Dictionary describing the selected cell, or None if no cell is feasible
+        """
+        c3 = porkchop['c3_km2_s2']
+        feasible = np.isfinite(c3) & (c3 <= max_c3_km2_s2)
+        if not feasible.any():
+            return None
+
+        if objective == 'max_relative_velocity':
+            score = np.where(feasible, -porkchop['arrival_relative_velocity_ms'], np.inf)
+        elif objective == 'min_c3':
+            score = np.where(feasible, c3, np.inf)
+        elif objective == 'earliest_arrival':
+            arrival = np.broadcast_to(porkchop['arrival_jd'][None, :], c3.shape)
+            score = np.where(feasible, arrival + 1e-6 * c3, np.inf)
+        else:
+            raise ValueError(f"Unknown launch window objective: {objective}")
+
+        i, j = np.unravel_index(np.argmin(score), score.shape)
+        return {
+            'departure_jd': float(porkchop['departure_jd'][i]),
+            'arrival_jd': float(porkchop['arrival_jd'][j]),
+            'tof_days': float(porkchop['tof_days'][i, j]),
+            'c3_km2_s2': float(c3[i, j]),
+            'arrival_relative_velocity_ms': float(porkchop['arrival_relative_velocity_ms'][i, j]),
+            'feasible_cells': int(feasible.sum()),
+            'max_c3_km2_s2': max_c3_km2_s2
+        }
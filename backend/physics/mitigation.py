@@ -4,16 +4,14 @@ Handles kinetic impactors, gravity tractors, and other deflection methods.
 """
 
 import numpy as np
-from astropy import units as u
-from astropy import constants as const
-from scipy.optimize import minimize_scalar
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Callable, Dict, List, Tuple, Optional, Union
 import warnings
 
 from backend.utils.conversions import UnitConverter
 from config.constants import (
     EARTH_RADIUS_M, AU_M, TYPICAL_IMPACTOR_MASS_KG, TYPICAL_IMPACTOR_VELOCITY_KMS,
-    THRUST_EFFICIENCY_DEFAULT, MOMENTUM_TRANSFER_EFFICIENCY
+    THRUST_EFFICIENCY_DEFAULT, MOMENTUM_TRANSFER_EFFICIENCY, DEFAULT_MAX_LAUNCH_C3_KM2_S2,
+    ASTEROID_DENSITY_RANGES, GM_SUN, GRAVITATIONAL_CONSTANT
 )
 
 
@@ -79,6 +77,112 @@ class MitigationStrategies:
             'relative_sma_change': relative_sma_change
         }
 
+    @staticmethod
+    def deflection_per_unit_delta_v(
+        orbital_period_years: Union[float, np.ndarray],
+        time_to_impact_years: Union[float, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Linear deflection mapping: miss distance gained per m/s of along-track Δv.
+        Same model as deflection_timing_analysis, which is linear in Δv, so
+        the coefficient can be computed once and broadcast over many launches.
+
+        Args:
+            orbital_period_years: Asteroid orbital period (scalar or array)
+            time_to_impact_years: Lead time between deflection and impact (scalar or array)
+
+        Returns:
+            Deflection in meters per 1 m/s of Δv; zero where lead time <= 0
+        """
+        period_s = np.asarray(orbital_period_years, dtype=float) * 365.25 * 24 * 3600
+        time_to_impact_s = np.maximum(np.asarray(time_to_impact_years, dtype=float), 0.0) * 365.25 * 24 * 3600
+
+        orbital_velocity_ms = 2 * np.pi * AU_M / period_s
+        mean_motion_rad_s = 2 * np.pi / period_s
+
+        # Both estimates of deflection_timing_analysis evaluated at Δv = 1 m/s
+        sma_coefficient = (3/2) * (2 / orbital_velocity_ms) * 1.5e11 * mean_motion_rad_s * time_to_impact_s
+        linear_coefficient = time_to_impact_s
+
+        return np.minimum(np.abs(sma_coefficient), linear_coefficient)
+
+    @staticmethod
+    def deflection_surface(
+        orbital_elements: Dict[str, float],
+        lead_times_years: np.ndarray,
+        delta_v_ms: np.ndarray,
+        impact_jd: Optional[float] = None,
+        required_deflection_m: float = EARTH_RADIUS_M,
+        delta_v_log_sigma: float = 0.0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Miss distance and success probability over a lead-time x Δv grid.
+
+        Orbit-aware version of deflection_per_unit_delta_v: the asteroid is
+        propagated back from the encounter to each deflection epoch, and the
+        conservative Δv·t drift is weighted by the heliocentric speed there
+        relative to circular speed (δa scales with v·δv), so deflections near
+        perihelion count for more than those near aphelion.
+
+        Args:
+            orbital_elements: SBDB orbital elements ('a' in AU, angles in degrees)
+            lead_times_years: Lead times between deflection and encounter
+            delta_v_ms: Along-track velocity changes (m/s)
+            impact_jd: Encounter date (Julian date); defaults to the element epoch
+            required_deflection_m: Miss distance counted as a success
+            delta_v_log_sigma: Log-normal spread of the achieved Δv (0 = deterministic)
+
+        Returns:
+            Dictionary with the axes and (n_lead_times, n_delta_v) arrays of
+            miss distance and success probability
+        """
+        from scipy.special import ndtr
+        from backend.physics.ephemeris import propagate_elements
+
+        lead_times_years = np.asarray(lead_times_years, dtype=float)
+        delta_v_ms = np.asarray(delta_v_ms, dtype=float)
+        if impact_jd is None:
+            impact_jd = orbital_elements.get('epoch')
+
+        a_m = orbital_elements['a'] * AU_M
+        period_s = 2 * np.pi * np.sqrt(a_m**3 / GM_SUN)
+        lead_time_s = np.maximum(lead_times_years, 0.0) * 365.25 * 24 * 3600
+
+        # Heliocentric speed at each deflection epoch
+        positions, _ = propagate_elements(orbital_elements, impact_jd - lead_time_s / (24 * 3600))
+        r_m = np.linalg.norm(positions, axis=-1)
+        speed_ms = np.sqrt(GM_SUN * (2 / r_m - 1 / a_m))
+        phase_efficiency = speed_ms / np.sqrt(GM_SUN / a_m)
+
+        # Miss distance per 1 m/s of Δv for each lead time. With the speed
+        # weighting the sma estimate is 3·eff·t, so the linear branch eff·t
+        # is always the smaller one, as in deflection_timing_analysis.
+        coefficient = phase_efficiency * lead_time_s
+
+        miss_distance_m = coefficient[:, None] * delta_v_ms[None, :]
+
+        # Probability that the achieved Δv (log-normal about nominal) still
+        # reaches the required deflection
+        with np.errstate(divide='ignore'):
+            log_margin = np.log(miss_distance_m) - np.log(required_deflection_m)
+        if delta_v_log_sigma > 0:
+            success_probability = ndtr(log_margin / delta_v_log_sigma)
+        else:
+            success_probability = (log_margin >= 0).astype(float)
+
+        return {
+            'lead_times_years': lead_times_years,
+            'delta_v_ms': delta_v_ms,
+            'miss_distance_m': miss_distance_m,
+            'success_probability': success_probability,
+            'deflection_per_unit_delta_v_m': coefficient,
+            'phase_efficiency': phase_efficiency,
+            'orbital_period_years': period_s / (365.25 * 24 * 3600),
+            'impact_jd': impact_jd,
+            'required_deflection_m': required_deflection_m,
+            'delta_v_log_sigma': delta_v_log_sigma
+        }
+
     @staticmethod
     def kinetic_impactor_mission(
         asteroid_mass_kg: float,
@@ -145,6 +249,177 @@ class MitigationStrategies:
             'energy_efficiency': energy_efficiency
         }
 
+    @staticmethod
+    def kinetic_impactor_monte_carlo(
+        asteroid_diameter_m: Union[float, Tuple[float, float]],
+        orbital_period_years: float,
+        time_to_impact_years: float,
+        required_deflection_m: float = EARTH_RADIUS_M,
+        impactor_mass_kg: float = None,
+        impactor_velocity_ms: float = None,
+        beta_range: Tuple[float, float] = (1.0, 5.0),
+        beta_mode: float = 3.6,
+        density_range_kg_m3: Tuple[float, float] = ASTEROID_DENSITY_RANGES['stony'],
+        impact_angle_sigma_degrees: float = 15.0,
+        n_samples: int = 1000000,
+        seed: Optional[int] = None,
+        percentiles: Tuple[float, ...] = (5, 25, 50, 75, 95)
+    ) -> Dict[str, any]:
+        """
+        Monte Carlo version of kinetic_impactor_mission with uncertain inputs.
+
+        Samples the momentum enhancement β (triangular over beta_range with mode
+        beta_mode; DART measured ~3.6), bulk density (uniform over the range),
+        diameter (uniform between estimated min/max when a range is given) and
+        the off-nominal impact angle (half-normal), then maps each sample's Δv
+        to miss distance with deflection_per_unit_delta_v. Fully vectorized.
+
+        Args:
+            asteroid_diameter_m: Diameter, or (min, max) estimated diameter range
+            orbital_period_years: Asteroid orbital period
+            time_to_impact_years: Lead time between impact and Earth encounter
+            required_deflection_m: Miss distance counted as a success
+            impactor_mass_kg: Impactor spacecraft mass
+            impactor_velocity_ms: Impactor velocity relative to asteroid
+            beta_range: (min, max) momentum enhancement factor
+            beta_mode: Most likely momentum enhancement factor
+            density_range_kg_m3: (min, max) bulk density
+            impact_angle_sigma_degrees: Spread of the impact angle (0 = head-on)
+            n_samples: Number of Monte Carlo samples
+            seed: Random seed for reproducible runs
+            percentiles: Percentiles to report for Δv and miss distance
+
+        Returns:
+            Dictionary with distribution summaries and the success probability
+        """
+        if impactor_mass_kg is None:
+            impactor_mass_kg = TYPICAL_IMPACTOR_MASS_KG
+        if impactor_velocity_ms is None:
+            impactor_velocity_ms = TYPICAL_IMPACTOR_VELOCITY_KMS * 1000
+
+        rng = np.random.default_rng(seed)
+
+        beta = rng.triangular(beta_range[0], beta_mode, beta_range[1], n_samples)
+        density = rng.uniform(density_range_kg_m3[0], density_range_kg_m3[1], n_samples)
+        if isinstance(asteroid_diameter_m, (tuple, list)):
+            diameter = rng.uniform(asteroid_diameter_m[0], asteroid_diameter_m[1], n_samples)
+        else:
+            diameter = np.full(n_samples, float(asteroid_diameter_m))
+        angle_rad = np.abs(rng.normal(0.0, np.radians(impact_angle_sigma_degrees), n_samples))
+
+        # Momentum transfer, as in kinetic_impactor_mission
+        asteroid_mass = (np.pi / 6.0) * density * diameter**3
+        delta_v = beta * impactor_mass_kg * impactor_velocity_ms * np.cos(angle_rad) / asteroid_mass
+
+        coefficient = MitigationStrategies.deflection_per_unit_delta_v(
+            orbital_period_years, time_to_impact_years
+        )
+        miss_distance = delta_v * coefficient
+
+        success = miss_distance >= required_deflection_m
+        delta_v_pct = np.percentile(delta_v, percentiles)
+        miss_pct = np.percentile(miss_distance, percentiles)
+
+        return {
+            'n_samples': n_samples,
+            'required_deflection_m': required_deflection_m,
+            'required_deflection_km': required_deflection_m / 1000,
+            'success_probability': float(success.mean()),
+            'required_delta_v_ms': required_deflection_m / float(coefficient) if coefficient > 0 else None,
+            'delta_v_ms': {
+                'mean': float(delta_v.mean()),
+                'std': float(delta_v.std()),
+                'percentiles': {str(p): float(v) for p, v in zip(percentiles, delta_v_pct)}
+            },
+            'miss_distance_km': {
+                'mean': float(miss_distance.mean() / 1000),
+                'std': float(miss_distance.std() / 1000),
+                'percentiles': {str(p): float(v / 1000) for p, v in zip(percentiles, miss_pct)}
+            },
+            'asteroid_mass_kg': {
+                'mean': float(asteroid_mass.mean()),
+                'std': float(asteroid_mass.std())
+            },
+            'inputs': {
+                'impactor_mass_kg': impactor_mass_kg,
+                'impactor_velocity_ms': impactor_velocity_ms,
+                'beta_range': list(beta_range),
+                'beta_mode': beta_mode,
+                'density_range_kg_m3': list(density_range_kg_m3),
+                'impact_angle_sigma_degrees': impact_angle_sigma_degrees,
+                'orbital_period_years': orbital_period_years,
+                'time_to_impact_years': time_to_impact_years
+            }
+        }
+
+    @staticmethod
+    def kinetic_impactor_launch_window(
+        asteroid_mass_kg: float,
+        asteroid_velocity_ms: float,
+        orbital_elements: Dict[str, float],
+        departure_start_jd: float,
+        departure_stop_jd: float,
+        arrival_start_jd: float,
+        arrival_stop_jd: float,
+        max_c3_km2_s2: float = DEFAULT_MAX_LAUNCH_C3_KM2_S2,
+        step_days: float = 2.0,
+        objective: str = 'max_relative_velocity',
+        porkchop: Optional[Dict[str, np.ndarray]] = None,
+        **mission_kwargs
+    ) -> Dict[str, any]:
+        """
+        Size a kinetic impactor mission from a reachable launch window.
+        Instead of assuming impactor_velocity_ms, the arrival relative velocity
+        of the selected porkchop cell is used.
+
+        Args:
+            asteroid_mass_kg: Target asteroid mass
+            asteroid_velocity_ms: Asteroid orbital velocity
+            orbital_elements: SBDB orbital elements of the target
+            departure_start_jd: First departure date (Julian date)
+            departure_stop_jd: Last departure date (Julian date)
+            arrival_start_jd: First arrival date (Julian date)
+            arrival_stop_jd: Last arrival date (Julian date)
+            max_c3_km2_s2: Launch vehicle C3 capability
+            step_days: Grid spacing for both date axes
+            objective: Launch window selection objective (see LambertSolver.best_launch_window)
+            porkchop: Precomputed porkchop grid for these dates and step (e.g. built in
+                      chunks by a background job); computed here if None
+            **mission_kwargs: Passed through to kinetic_impactor_mission
+
+        Returns:
+            Dictionary with mission results and the selected launch window;
+            'feasible' is False when no cell meets the C3 limit
+        """
+        from backend.physics.lambert import LambertSolver
+
+        if porkchop is None:
+            porkchop = LambertSolver.porkchop(
+                orbital_elements,
+                departure_start_jd, departure_stop_jd,
+                arrival_start_jd, arrival_stop_jd,
+                departure_step_days=step_days,
+                arrival_step_days=step_days
+            )
+        window = LambertSolver.best_launch_window(porkchop, max_c3_km2_s2, objective)
+
+        if window is None:
+            return {
+                'feasible': False,
+                'launch_window': None,
+                'max_c3_km2_s2': max_c3_km2_s2,
+                'min_c3_km2_s2': float(np.nanmin(porkchop['c3_km2_s2']))
+                if np.isfinite(porkchop['c3_km2_s2']).any() else None
+            }
+
+        mission_kwargs['impactor_velocity_ms'] = window['arrival_relative_velocity_ms']
+        mission_result = MitigationStrategies.kinetic_impactor_mission(
+            asteroid_mass_kg, asteroid_velocity_ms, **mission_kwargs
+        )
+        mission_result['feasible'] = True
+        mission_result['launch_window'] = window
+        return mission_result
+
     @staticmethod
     def gravity_tractor_mission(
         asteroid_mass_kg: float,
@@ -167,8 +442,7 @@ class MitigationStrategies:
             Dictionary with gravity tractor results
         """
         # Gravitational force between spacecraft and asteroid
-        G = const.G.to(u.m**3 / (u.kg * u.s**2)).value
-        gravitational_force_n = G * tractor_mass_kg * asteroid_mass_kg / orbital_distance_m**2
+        gravitational_force_n = GRAVITATIONAL_CONSTANT * tractor_mass_kg * asteroid_mass_kg / orbital_distance_m**2
         
         # Acceleration of asteroid
         acceleration_ms2 = gravitational_force_n / asteroid_mass_kg
@@ -314,7 +588,8 @@ class MitigationStrategies:
     def mission_comparison(
         asteroid_params: Dict[str, float],
         orbital_params: Dict[str, float],
-        mission_scenarios: List[Dict[str, any]] = None
+        mission_scenarios: List[Dict[str, any]] = None,
+        progress: Optional[Callable[[float], None]] = None
     ) -> Dict[str, any]:
         """
         Compare different mitigation strategies for a given asteroid threat.
@@ -323,6 +598,7 @@ class MitigationStrategies:
             asteroid_params: Dictionary with asteroid properties
             orbital_params: Dictionary with orbital parameters
             mission_scenarios: List of mission scenario dictionaries
+            progress: Called with the completed fraction before each scenario
             
         Returns:
             Comparison results
@@ -363,7 +639,9 @@ class MitigationStrategies:
         }
         
         # Calculate each mission scenario
-        for scenario in mission_scenarios:
+        for index, scenario in enumerate(mission_scenarios):
+            if progress is not None:
+                progress(index / len(mission_scenarios))
             mission_type = scenario['type']
             params = scenario['params']
             
@@ -413,5 +691,3 @@ class MitigationStrategies:
         
         return results
 
-
-# TODO: Add API integration endpoints for mitigation strategy analysis
@@ -4,18 +4,6 @@ Handles Keplerian orbital elements, trajectory propagation, and deflection scena
 """
 
 import numpy as np
-from astropy import units as u
-from astropy import constants as const
-from astropy.time import Time
-from astropy.coordinates import (
-    solar_system_ephemeris, 
-    get_body_barycentric_posvel,
-    CartesianRepresentation,
-    CartesianDifferential,
-    ICRS
-)
-from astropy.coordinates.builtin_frames import GCRS
-from scipy.integrate import solve_ivp
 from typing import Dict, List, Tuple, Optional, Union
 import warnings
 
@@ -216,6 +204,8 @@ class OrbitalMechanics:
         Returns:
             Dictionary with time, position, and velocity arrays
         """
+        from scipy.integrate import solve_ivp
+
         if gm is None:
             from config.constants import GM_SUN
             gm = GM_SUN
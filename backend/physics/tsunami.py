@@ -0,0 +1,510 @@
+"""
+Linear shallow-water tsunami propagation on gridded bathymetry.
+
+Solves the linearized shallow-water equations on a longitude/latitude
+Arakawa C-grid (surface elevation at cell centers, velocities on cell faces)
+with a forward-backward time step. Outer boundaries are closed with an
+absorbing sponge layer; coasts are reflective. Global grids wrap in
+longitude.
+
+The same kernels run either in-process or split into row strips across
+worker processes that share the state through shared memory and step in
+lockstep with barriers.
+"""
+
+import logging
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config.constants import EARTH_RADIUS_M
+from backend.utils.geodesy import haversine_km
+
+logger = logging.getLogger(__name__)
+
+GRAVITY_MS2 = 9.81
+MIN_WET_DEPTH_M = 1.0
+_MIN_COS_LATITUDE = np.cos(np.radians(89.0))
+
+
+# --- Kernels shared by the serial and tiled runs ---
+# Each works on rows [j0, j1) of the state dictionary in place.
+
+def _update_eta(s: Dict[str, np.ndarray], j0: int, j1: int, dt: float):
+    """Continuity equation: η_t = -div(h·u) for the given rows."""
+    flux_u = s['hu'][j0:j1] * s['u'][j0:j1]
+    flux_v = s['hv_cos'][j0:j1 + 1] * s['v'][j0:j1 + 1]
+    divergence = ((flux_u[:, 1:] - flux_u[:, :-1]) * s['inv_dx'][j0:j1, None]
+                  + (flux_v[1:] - flux_v[:-1]) * s['inv_cos_dy'][j0:j1, None])
+    eta = s['eta'][j0:j1]
+    eta -= dt * divergence
+    eta *= s['eta_mult'][j0:j1]
+
+
+def _update_velocity(s: Dict[str, np.ndarray], j0: int, j1: int, dt: float, periodic: bool):
+    """Momentum equations: u_t = -g·grad(η) for the faces owned by the given rows."""
+    eta = s['eta']
+    u = s['u'][j0:j1]
+    gradient_scale = dt * GRAVITY_MS2 * s['inv_dx'][j0:j1, None]
+    u[:, 1:-1] -= gradient_scale * (eta[j0:j1, 1:] - eta[j0:j1, :-1])
+    if periodic:
+        u[:, 0] -= gradient_scale[:, 0] * (eta[j0:j1, 0] - eta[j0:j1, -1])
+        u[:, -1] = u[:, 0]
+    u *= s['u_mult'][j0:j1]
+
+    # v face j lies between rows j-1 and j; face 0 and face ny are closed
+    k0 = max(j0, 1)
+    if k0 < j1:
+        v = s['v'][k0:j1]
+        v -= dt * GRAVITY_MS2 * s['inv_dy'] * (eta[k0:j1] - eta[k0 - 1:j1 - 1])
+        v *= s['v_mult'][k0:j1]
+
+
+def _record(s: Dict[str, np.ndarray], j0: int, j1: int, t: float, threshold_m: float):
+    """Tracks the maximum amplitude and first arrival time for the given rows."""
+    abs_eta = np.abs(s['eta'][j0:j1])
+    np.maximum(s['max_amplitude'][j0:j1], abs_eta, out=s['max_amplitude'][j0:j1])
+    arrival = s['arrival'][j0:j1]
+    arrived = np.isnan(arrival) & (abs_eta >= threshold_m)
+    arrival[arrived] = t
+
+
+def _run_rows(s: Dict[str, np.ndarray], j0: int, j1: int, dt: float, n_steps: int, start_time_s: float,
+              periodic: bool, threshold_m: float, snapshot_steps: Dict[int, int], barrier=None):
+    """Time loop for one strip of rows (the whole grid when barrier is None)."""
+    sync = barrier.wait if barrier is not None else (lambda: None)
+    for step in range(1, n_steps + 1):
+        _update_eta(s, j0, j1, dt)
+        _record(s, j0, j1, start_time_s + step * dt, threshold_m)
+        if step in snapshot_steps:
+            s['snapshots'][snapshot_steps[step], j0:j1] = s['eta'][j0:j1]
+        sync()
+        _update_velocity(s, j0, j1, dt, periodic)
+        sync()
+
+
+def _attach_shared(specs: Dict[str, Tuple[str, Tuple[int, ...], str]]):
+    """Maps shared-memory blocks back to arrays in a worker process."""
+    blocks, arrays = [], {}
+    for key, (name, shape, dtype) in specs.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    return blocks, arrays
+
+
+def _tile_worker(specs, scalars, j0, j1, dt, n_steps, start_time_s, periodic,
+                 threshold_m, snapshot_steps, barrier):
+    """Worker process entry point: steps one strip of rows."""
+    blocks, arrays = _attach_shared(specs)
+    arrays.update(scalars)
+    try:
+        _run_rows(arrays, j0, j1, dt, n_steps, start_time_s, periodic,
+                  threshold_m, snapshot_steps, barrier)
+    finally:
+        del arrays
+        for block in blocks:
+            block.close()
+
+
+class ShallowWaterModel:
+    """Linear shallow-water tsunami propagation on a lat/lon bathymetry grid."""
+
+    @staticmethod
+    def initial_surface(
+        lats: np.ndarray,
+        lons: np.ndarray,
+        source_lat: float,
+        source_lon: float,
+        amplitude_m: float,
+        radius_m: float
+    ) -> np.ndarray:
+        """
+        Gaussian initial surface displacement around the source.
+        Sources smaller than the grid spacing are widened to about two cells
+        with the amplitude reduced so the displaced volume is preserved.
+
+        Args:
+            lats: Cell-center latitudes (degrees, ascending)
+            lons: Cell-center longitudes (degrees, ascending)
+            source_lat: Source latitude (degrees)
+            source_lon: Source longitude (degrees)
+            amplitude_m: Peak displacement
+            radius_m: Gaussian radius of the displacement
+
+        Returns:
+            Surface elevation array of shape (len(lats), len(lons))
+        """
+        cell_m = EARTH_RADIUS_M * np.radians(abs(lats[1] - lats[0]))
+        effective_radius_m = max(radius_m, 2.0 * cell_m)
+        effective_amplitude_m = amplitude_m * (radius_m / effective_radius_m) ** 2
+
+        distance_m = haversine_km(source_lat, source_lon, lats[:, None], lons[None, :]) * 1000
+        return effective_amplitude_m * np.exp(-(distance_m / effective_radius_m) ** 2)
+
+    @staticmethod
+    def _prepare_state(depth_m: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                       sponge_cells: int, periodic: bool) -> Dict[str, np.ndarray]:
+        """Builds the static coefficient arrays and zeroed state (float32)."""
+        ny, nx = depth_m.shape
+        dlat = np.radians(abs(lats[1] - lats[0]))
+        dlon = np.radians(abs(lons[1] - lons[0]))
+        wet = depth_m >= MIN_WET_DEPTH_M
+        depth = np.where(wet, depth_m, 0.0)
+
+        cos_center = np.maximum(np.cos(np.radians(lats)), _MIN_COS_LATITUDE)
+        face_lats = np.concatenate([[lats[0] - np.degrees(dlat) / 2], lats + np.degrees(dlat) / 2])
+        cos_face = np.maximum(np.cos(np.radians(face_lats)), _MIN_COS_LATITUDE)
+
+        # Face depths: shallower neighbour; zero (closed) next to land
+        hu = np.zeros((ny, nx + 1))
+        hu[:, 1:-1] = np.minimum(depth[:, 1:], depth[:, :-1])
+        if periodic:
+            hu[:, 0] = hu[:, -1] = np.minimum(depth[:, 0], depth[:, -1])
+        hv = np.zeros((ny + 1, nx))
+        hv[1:-1] = np.minimum(depth[1:], depth[:-1])
+
+        # Sponge: damping rises quadratically over the outer cells
+        damp = np.ones((ny, nx))
+        if sponge_cells > 0:
+            ramp = np.clip((sponge_cells - np.arange(sponge_cells)) / sponge_cells, 0, 1) ** 2
+            profile = np.ones(max(ny, nx))
+            profile[:sponge_cells] = 1 - 0.1 * ramp
+            row_profile = np.minimum(profile[:ny], profile[:ny][::-1])
+            damp *= row_profile[:, None]
+            if not periodic:
+                col_profile = np.minimum(profile[:nx], profile[:nx][::-1])
+                damp *= col_profile[None, :]
+
+        damp_u = np.ones((ny, nx + 1))
+        damp_u[:, 1:-1] = np.minimum(damp[:, 1:], damp[:, :-1])
+        damp_v = np.ones((ny + 1, nx))
+        damp_v[1:-1] = np.minimum(damp[1:], damp[:-1])
+
+        state = {
+            'eta': np.zeros((ny, nx)),
+            'u': np.zeros((ny, nx + 1)),
+            'v': np.zeros((ny + 1, nx)),
+            'max_amplitude': np.zeros((ny, nx)),
+            'arrival': np.full((ny, nx), np.nan),
+            'hu': hu,
+            'hv_cos': hv * cos_face[:, None],
+            'inv_dx': 1.0 / (EARTH_RADIUS_M * cos_center * dlon),
+            'inv_cos_dy': 1.0 / (EARTH_RADIUS_M * cos_center * dlat),
+            'eta_mult': damp * wet,
+            'u_mult': damp_u * (hu > 0),
+            'v_mult': damp_v * (hv > 0),
+        }
+        state = {key: array.astype(np.float32) for key, array in state.items()}
+        state['inv_dy'] = 1.0 / (EARTH_RADIUS_M * dlat)
+        return state
+
+    @staticmethod
+    def stable_time_step(depth_m: np.ndarray, lats: np.ndarray, lons: np.ndarray, cfl: float = 0.5) -> float:
+        """Largest stable step (s) for the grid, scaled by the CFL number."""
+        dlat = np.radians(abs(lats[1] - lats[0]))
+        dlon = np.radians(abs(lons[1] - lons[0]))
+        wet = depth_m >= MIN_WET_DEPTH_M
+        if not wet.any():
+            raise ValueError("Bathymetry grid has no wet cells")
+        cos_center = np.maximum(np.cos(np.radians(lats)), _MIN_COS_LATITUDE)
+        dx = EARTH_RADIUS_M * cos_center[:, None] * dlon
+        dy = EARTH_RADIUS_M * dlat
+        speed = np.sqrt(GRAVITY_MS2 * np.where(wet, depth_m, 0.0))
+        with np.errstate(divide='ignore'):
+            limit = np.where(wet, 1.0 / (speed * np.sqrt(1.0 / dx**2 + 1.0 / dy**2)), np.inf)
+        return float(cfl * limit.min())
+
+    @staticmethod
+    def simulate(
+        depth_m: np.ndarray,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        source_lat: float,
+        source_lon: float,
+        initial_amplitude_m: float,
+        source_radius_m: float,
+        duration_s: float = 4 * 3600,
+        cfl: float = 0.5,
+        sponge_cells: int = 10,
+        snapshot_interval_s: Optional[float] = None,
+        arrival_threshold_m: Optional[float] = None,
+        n_workers: int = 1,
+        checkpoint_path: Optional[str] = None,
+        resume_from: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Run the shallow-water model from an impact source.
+
+        Args:
+            depth_m: Water depth grid (ny, nx), positive below sea level, 0 on land
+            lats: Cell-center latitudes (degrees, ascending, uniform)
+            lons: Cell-center longitudes (degrees, ascending, uniform)
+            source_lat: Source latitude (degrees)
+            source_lon: Source longitude (degrees)
+            initial_amplitude_m: Peak initial surface displacement
+            source_radius_m: Radius of the initial displacement
+            duration_s: Simulated time
+            cfl: Courant number (< 1)
+            sponge_cells: Width of the absorbing layer at open boundaries
+            snapshot_interval_s: Interval between stored surface snapshots (None = none)
+            arrival_threshold_m: Amplitude that counts as wave arrival
+                                 (default: 0.1% of the initial peak)
+            n_workers: Worker processes; >1 splits the grid into row strips
+            checkpoint_path: Save the final model state here (.npz) for resuming
+            resume_from: Continue from a saved state instead of the initial source
+
+        Returns:
+            Dictionary with maximum amplitude and arrival time fields, surface
+            snapshots, the final surface and run statistics
+        """
+        depth_m = np.asarray(depth_m, dtype=float)
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        ny, nx = depth_m.shape
+        if ny < 3 or nx < 3 or len(lats) != ny or len(lons) != nx:
+            raise ValueError("depth_m must be (len(lats), len(lons)) with at least 3 cells per axis")
+        if lats[1] < lats[0]:
+            raise ValueError("lats must be ascending")
+
+        dlon = abs(lons[1] - lons[0])
+        periodic = abs(nx * dlon - 360.0) < dlon / 2
+        dt = ShallowWaterModel.stable_time_step(depth_m, lats, lons, cfl)
+        n_steps = int(np.ceil(duration_s / dt))
+
+        state = ShallowWaterModel._prepare_state(depth_m, lats, lons, sponge_cells, periodic)
+        start_time_s = 0.0
+        if resume_from:
+            saved = np.load(resume_from)
+            if saved['eta'].shape != (ny, nx):
+                raise ValueError(f"Checkpoint {resume_from} does not match the grid shape")
+            for key in ('eta', 'u', 'v', 'max_amplitude', 'arrival'):
+                state[key][...] = saved[key]
+            start_time_s = float(saved['time_s'])
+        else:
+            state['eta'][...] = ShallowWaterModel.initial_surface(
+                lats, lons, source_lat, source_lon, initial_amplitude_m, source_radius_m
+            ) * state['eta_mult']
+        if arrival_threshold_m is None:
+            arrival_threshold_m = max(1e-3 * float(state['max_amplitude'].max() if resume_from
+                                                   else np.abs(state['eta']).max()), 1e-6)
+        if not resume_from:
+            _record(state, 0, ny, 0.0, arrival_threshold_m)
+
+        snapshot_steps = {}
+        if snapshot_interval_s:
+            for step in np.unique(np.round(np.arange(snapshot_interval_s, duration_s + dt / 2,
+                                                     snapshot_interval_s) / dt).astype(int)):
+                if 1 <= step <= n_steps:
+                    snapshot_steps[int(step)] = len(snapshot_steps)
+
+        n_workers = max(1, min(int(n_workers), ny // 8))
+        started = time.perf_counter()
+        if n_workers == 1:
+            state['snapshots'] = np.zeros((len(snapshot_steps), ny, nx), dtype=np.float32)
+            _run_rows(state, 0, ny, dt, n_steps, start_time_s, periodic,
+                      arrival_threshold_m, snapshot_steps)
+        else:
+            state = ShallowWaterModel._run_tiled(
+                state, (ny, nx), len(snapshot_steps), n_workers, dt, n_steps,
+                start_time_s, periodic, arrival_threshold_m, snapshot_steps
+            )
+        elapsed_s = time.perf_counter() - started
+        end_time_s = start_time_s + n_steps * dt
+        logger.info(f"Shallow-water run: {ny}x{nx} cells, {n_steps} steps of {dt:.1f}s "
+                    f"on {n_workers} worker(s) in {elapsed_s:.2f}s")
+
+        if checkpoint_path:
+            np.savez(checkpoint_path, eta=state['eta'], u=state['u'], v=state['v'],
+                     max_amplitude=state['max_amplitude'], arrival=state['arrival'],
+                     time_s=end_time_s)
+
+        snapshot_times = sorted(snapshot_steps, key=snapshot_steps.get)
+        return {
+            'lats': lats,
+            'lons': lons,
+            'max_amplitude_m': state['max_amplitude'].astype(np.float32),
+            'arrival_time_s': state['arrival'].astype(np.float32),
+            'final_eta_m': state['eta'].astype(np.float32),
+            'snapshot_times_s': np.array([start_time_s + step * dt for step in snapshot_times]),
+            'snapshots_m': state['snapshots'],
+            'time_s': end_time_s,
+            'dt_s': dt,
+            'n_steps': n_steps,
+            'n_workers': n_workers,
+            'periodic_longitude': periodic,
+            'arrival_threshold_m': arrival_threshold_m,
+            'elapsed_s': elapsed_s
+        }
+
+    @staticmethod
+    def _run_tiled(state, shape, n_snapshots, n_workers, dt, n_steps, start_time_s,
+                   periodic, threshold_m, snapshot_steps):
+        """Runs the time loop in worker processes over shared-memory state."""
+        ny, nx = shape
+        scalars = {'inv_dy': state.pop('inv_dy')}
+        state['snapshots'] = np.zeros((n_snapshots, ny, nx), dtype=np.float32)
+
+        blocks: List[shared_memory.SharedMemory] = []
+        shared, specs = {}, {}
+        try:
+            for key, array in state.items():
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                blocks.append(block)
+                shared[key] = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                shared[key][...] = array
+                specs[key] = (block.name, array.shape, array.dtype.str)
+
+            context = multiprocessing.get_context("spawn")
+            barrier = context.Barrier(n_workers)
+            bounds = np.linspace(0, ny, n_workers + 1).astype(int)
+            workers = [
+                context.Process(target=_tile_worker, args=(
+                    specs, scalars, int(bounds[k]), int(bounds[k + 1]), dt, n_steps,
+                    start_time_s, periodic, threshold_m, snapshot_steps, barrier
+                ))
+                for k in range(n_workers)
+            ]
+            for worker in workers:
+                worker.start()
+
+            # A failed worker would leave the others blocked on the barrier
+            while any(worker.is_alive() for worker in workers):
+                for worker in workers:
+                    worker.join(timeout=0.1)
+                    if worker.exitcode not in (None, 0):
+                        barrier.abort()
+                        for other in workers:
+                            other.terminate()
+                        raise RuntimeError(f"Shallow-water worker failed with exit code {worker.exitcode}")
+
+            result = {key: array.copy() for key, array in shared.items()}
+            result.update(scalars)
+            return result
+        finally:
+            shared.clear()
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+
+class TravelTimeModel:
+    """
+    Tsunami travel times from the eikonal equation |grad T| = 1 / sqrt(g·h),
+    solved as shortest paths on the wet cells of a bathymetry grid.
+    """
+
+    # 16-neighbour stencil: axis, diagonal and knight moves keep the
+    # path-length error of the grid metric within a few percent
+    NEIGHBOUR_OFFSETS = (
+        (0, 1), (1, 0), (1, 1), (1, -1),
+        (1, 2), (2, 1), (1, -2), (2, -1),
+    )
+
+    @staticmethod
+    def build_graph(depth_m: np.ndarray, lats: np.ndarray, lons: np.ndarray):
+        """
+        Builds the sparse travel-time graph between neighbouring wet cells.
+
+        Args:
+            depth_m: Water depth grid (ny, nx), positive below sea level
+            lats: Cell-center latitudes (degrees, ascending)
+            lons: Cell-center longitudes (degrees, ascending)
+
+        Returns:
+            Symmetric scipy.sparse CSR matrix of edge travel times (s),
+            indexed by flattened cell index
+        """
+        from scipy.sparse import coo_matrix
+
+        ny, nx = depth_m.shape
+        lats, lons = np.asarray(lats, dtype=float), np.asarray(lons, dtype=float)
+        dlon = abs(lons[1] - lons[0])
+        periodic = abs(nx * dlon - 360.0) < dlon / 2
+        wet = depth_m >= MIN_WET_DEPTH_M
+        slowness = np.where(wet, 1.0 / np.sqrt(GRAVITY_MS2 * np.maximum(depth_m, MIN_WET_DEPTH_M)), 0.0)
+
+        rows, cols, weights = [], [], []
+        j, i = np.meshgrid(np.arange(ny), np.arange(nx), indexing='ij')
+        for dj, di in TravelTimeModel.NEIGHBOUR_OFFSETS:
+            j2, i2 = j + dj, i + di
+            if periodic:
+                i2 = i2 % nx
+            valid = (j2 >= 0) & (j2 < ny) & (i2 >= 0) & (i2 < nx)
+            a_j, a_i = j[valid], i[valid]
+            b_j, b_i = j2[valid], i2[valid]
+            both_wet = wet[a_j, a_i] & wet[b_j, b_i]
+            a_j, a_i, b_j, b_i = a_j[both_wet], a_i[both_wet], b_j[both_wet], b_i[both_wet]
+
+            # Great-circle edge length, crossed at the mean slowness of its ends
+            length_m = haversine_km(lats[a_j], lons[a_i], lats[b_j], lons[b_i]) * 1000
+            seconds = length_m * 0.5 * (slowness[a_j, a_i] + slowness[b_j, b_i])
+
+            rows.append(a_j * nx + a_i)
+            cols.append(b_j * nx + b_i)
+            weights.append(seconds)
+
+        rows, cols, weights = np.concatenate(rows), np.concatenate(cols), np.concatenate(weights)
+        graph = coo_matrix(
+            (np.concatenate([weights, weights]), (np.concatenate([rows, cols]), np.concatenate([cols, rows]))),
+            shape=(ny * nx, ny * nx)
+        )
+        return graph.tocsr()
+
+    @staticmethod
+    def travel_times(graph, shape: Tuple[int, int], source_index: int) -> np.ndarray:
+        """
+        Travel time from one source cell to every cell.
+
+        Args:
+            graph: Output of build_graph
+            shape: Grid shape (ny, nx)
+            source_index: Flattened index of the (wet) source cell
+
+        Returns:
+            Travel times (s) of the given shape; NaN on land and unreachable cells
+        """
+        from scipy.sparse.csgraph import dijkstra
+
+        seconds = dijkstra(graph, directed=False, indices=int(source_index))
+        seconds[~np.isfinite(seconds)] = np.nan
+        return seconds.reshape(shape)
+
+    @staticmethod
+    def isochrones_geojson(travel_time_s: np.ndarray, lats: np.ndarray, lons: np.ndarray,
+                           levels_h: List[float]) -> Dict:
+        """
+        Contours a travel-time raster into GeoJSON isochrones.
+
+        Args:
+            travel_time_s: Travel times (s), NaN where not reached
+            lats: Row latitudes (degrees)
+            lons: Column longitudes (degrees)
+            levels_h: Isochrone levels in hours
+
+        Returns:
+            GeoJSON FeatureCollection with one MultiLineString per level
+        """
+        import contourpy
+
+        generator = contourpy.contour_generator(
+            x=lons, y=lats, z=np.ma.masked_invalid(travel_time_s / 3600.0),
+            line_type=contourpy.LineType.Separate
+        )
+        features = []
+        for level in levels_h:
+            lines = generator.lines(level)
+            if not lines:
+                continue
+            features.append({
+                "type": "Feature",
+                "properties": {"travel_time_h": float(level)},
+                "geometry": {
+                    "type": "MultiLineString",
+                    "coordinates": [np.round(line, 4).tolist() for line in lines]
+                }
+            })
+        return {"type": "FeatureCollection", "features": features}
@@ -0,0 +1,68 @@
+"""
+This script converts a global elevation/bathymetry raster (e.g. ETOPO 2022 or
+GEBCO GeoTIFF) into the compact .npz grid read by
+backend/services/bathymetry_service.py, resampled to the requested
+resolution while reading.
+
+Usage:
+    python -m backend.scripts.build_bathymetry_grid path/to/ETOPO_2022_60s.tif --resolution-deg 0.1
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.services.bathymetry_service import default_bathymetry_path
+
+
+def build_bathymetry_grid(source_path: str, output_path: str, resolution_deg: float = 0.1) -> str:
+    """
+    Resamples a lon/lat elevation raster to a regular grid and saves it.
+
+    Args:
+        source_path: Raster readable by rasterio (band 1 = elevation in meters)
+        output_path: Destination .npz file
+        resolution_deg: Output cell size in degrees
+
+    Returns:
+        The output path.
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+
+    with rasterio.open(source_path) as src:
+        if src.crs is not None and not src.crs.is_geographic:
+            raise ValueError(f"{source_path} must use geographic (lon/lat) coordinates")
+
+        west, south, east, north = src.bounds
+        n_rows = max(3, int(round((north - south) / resolution_deg)))
+        n_cols = max(3, int(round((east - west) / resolution_deg)))
+        print(f"Resampling {src.height}x{src.width} raster to {n_rows}x{n_cols}...")
+
+        elevation = src.read(1, out_shape=(n_rows, n_cols), resampling=Resampling.average,
+                             masked=True).astype(np.float32).filled(np.nan)
+
+    # Rows come north-to-south; store south-to-north
+    lat_step = (north - south) / n_rows
+    lon_step = (east - west) / n_cols
+    lats = north - (np.arange(n_rows) + 0.5) * lat_step
+    lons = west + (np.arange(n_cols) + 0.5) * lon_step
+    elevation = np.nan_to_num(elevation[::-1], nan=0.0)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    np.savez_compressed(output_path, elevation_m=elevation, lats=lats[::-1], lons=lons)
+    print(f"✓ Wrote {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB)")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the bathymetry grid used by the tsunami models.")
+    parser.add_argument("source", help="Elevation/bathymetry raster (GeoTIFF, NetCDF, ...)")
+    parser.add_argument("--output", default=default_bathymetry_path(), help="Output .npz path")
+    parser.add_argument("--resolution-deg", type=float, default=0.1)
+    args = parser.parse_args()
+
+    build_bathymetry_grid(args.source, args.output, args.resolution_deg)
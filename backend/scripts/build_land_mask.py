@@ -0,0 +1,123 @@
+"""
+This script builds the packed-bit global land/ocean mask used by
+backend/utils/land_mask.py from a local land polygon or coastline file
+(GeoJSON, shapefile, or anything else geopandas can read), e.g. the
+Natural Earth 'land' layer.
+
+The grid is rasterized in bands of rows so memory stays bounded even at
+fine resolutions; each band is packed to bits and written straight into a
+memory-mapped .npy file. At 1 arc-minute the output is about 28 MB.
+
+Usage:
+    python -m backend.scripts.build_land_mask path/to/ne_10m_land.shp --resolution-arcmin 1
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import config
+from backend.utils.land_mask import default_land_mask_path
+
+
+def load_land_geometries(source_path: str):
+    """
+    Reads land polygons in lon/lat. Line geometries (coastlines) are
+    polygonized first, so closed coastline rings can be used directly.
+    """
+    import geopandas as gpd
+    from shapely.ops import polygonize
+
+    gdf = gpd.read_file(source_path)
+    if gdf.crs is not None and not gdf.crs.is_geographic:
+        gdf = gdf.to_crs(epsg=4326)
+
+    geometries = gdf.geometry[~gdf.geometry.is_empty & gdf.geometry.notna()]
+    lines = geometries[geometries.geom_type.isin(["LineString", "MultiLineString", "LinearRing"])]
+    polygons = geometries[geometries.geom_type.isin(["Polygon", "MultiPolygon"])]
+
+    if len(lines):
+        polygons = gpd.GeoSeries(list(polygons) + list(polygonize(list(lines))), crs=gdf.crs)
+    return gpd.GeoDataFrame(geometry=polygons.reset_index(drop=True), crs=gdf.crs)
+
+
+def build_land_mask(source_path: str, output_path: str, resolution_arcmin: float = 1.0,
+                    rows_per_chunk: int = 512) -> str:
+    """
+    Rasterizes land polygons into a packed-bit mask.
+
+    Args:
+        source_path: Land polygon / coastline file readable by geopandas
+        output_path: Destination .npy file
+        resolution_arcmin: Cell size in arc-minutes (must divide 180° evenly)
+        rows_per_chunk: Rows rasterized per band
+
+    Returns:
+        The output path.
+    """
+    from rasterio import features
+    from rasterio.transform import from_origin
+
+    cell_deg = resolution_arcmin / 60.0
+    n_rows = int(round(180.0 / cell_deg))
+    if abs(n_rows * cell_deg - 180.0) > 1e-9:
+        raise ValueError(f"Resolution {resolution_arcmin} arc-minutes does not divide 180 degrees")
+    n_cols = 2 * n_rows
+    n_bytes = (n_cols + 7) // 8
+
+    land = load_land_geometries(source_path)
+    sindex = land.sindex
+    print(f"Rasterizing {len(land)} land polygons onto a {n_rows} x {n_cols} grid...")
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    mask = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.uint8, shape=(n_rows, n_bytes))
+
+    start = time.time()
+    for row_start in range(0, n_rows, rows_per_chunk):
+        chunk_rows = min(rows_per_chunk, n_rows - row_start)
+        lat_top = 90.0 - row_start * cell_deg
+        lat_bottom = lat_top - chunk_rows * cell_deg
+
+        # Only polygons intersecting this band take part
+        candidates = land.geometry.iloc[sindex.query(
+            _band_box(lat_bottom, lat_top), predicate="intersects"
+        )]
+        if len(candidates):
+            band = features.rasterize(
+                ((geometry, 1) for geometry in candidates),
+                out_shape=(chunk_rows, n_cols),
+                transform=from_origin(-180.0, lat_top, cell_deg, cell_deg),
+                fill=0,
+                dtype=np.uint8,
+            )
+            mask[row_start:row_start + chunk_rows] = np.packbits(band, axis=1, bitorder="little")
+        else:
+            mask[row_start:row_start + chunk_rows] = 0
+
+        print(f"  rows {row_start + chunk_rows}/{n_rows}", end="\r")
+
+    mask.flush()
+    del mask
+    print(f"\n✓ Wrote {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB) "
+          f"in {time.time() - start:.1f}s")
+    return output_path
+
+
+def _band_box(lat_bottom: float, lat_top: float):
+    from shapely.geometry import box
+    return box(-180.0, lat_bottom, 180.0, lat_top)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the packed-bit land/ocean mask.")
+    parser.add_argument("source", help="Land polygon or coastline file (GeoJSON, shapefile, ...)")
+    parser.add_argument("--output", default=default_land_mask_path(), help="Output .npy path")
+    parser.add_argument("--resolution-arcmin", type=float, default=config.LAND_MASK_RESOLUTION_ARCMIN)
+    parser.add_argument("--rows-per-chunk", type=int, default=512)
+    args = parser.parse_args()
+
+    build_land_mask(args.source, args.output, args.resolution_arcmin, args.rows_per_chunk)
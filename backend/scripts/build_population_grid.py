@@ -0,0 +1,108 @@
+"""
+This script builds the row-wise summed-area population table used by
+backend/services/population_service.py from a global population raster
+(e.g. GPW v4 "population count" or GHS-POP GeoTIFF).
+
+The source is warped onto a global equirectangular grid in bands of rows;
+each band's per-cell counts are accumulated along longitude and written
+straight into a memory-mapped float64 .npy file, so memory stays bounded at
+any resolution. Density rasters (people per km²) are converted to counts
+with the latitude-dependent cell area. At 2.5 arc-minutes the output is
+about 300 MB.
+
+Usage:
+    python -m backend.scripts.build_population_grid path/to/gpw_v4_population_count_2020_2pt5_min.tif
+    python -m backend.scripts.build_population_grid path/to/density.tif --density --resolution-arcmin 5
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config.constants import EARTH_RADIUS_KM
+from backend.services.population_service import default_population_grid_path
+
+
+def cell_areas_km2(lats_deg: np.ndarray, cell_deg: float) -> np.ndarray:
+    """Area of lat/lon cells of size cell_deg centered on the given latitudes."""
+    half = np.radians(cell_deg) / 2
+    lats = np.radians(lats_deg)
+    return EARTH_RADIUS_KM ** 2 * np.radians(cell_deg) * (np.sin(lats + half) - np.sin(lats - half))
+
+
+def build_population_grid(source_path: str, output_path: str, resolution_arcmin: float = 2.5,
+                          density: bool = False, rows_per_chunk: int = 256) -> str:
+    """
+    Resamples a population raster and writes its row prefix sums.
+
+    Args:
+        source_path: Raster readable by rasterio (band 1 = people per cell, or per km² with density)
+        output_path: Destination .npy file
+        resolution_arcmin: Cell size in arc-minutes (must divide 180° evenly)
+        density: Source values are densities in people per km²
+        rows_per_chunk: Rows warped per band
+
+    Returns:
+        The output path.
+    """
+    import rasterio
+    from rasterio.enums import Resampling
+    from rasterio.transform import from_origin
+    from rasterio.vrt import WarpedVRT
+    from rasterio.windows import Window
+
+    cell_deg = resolution_arcmin / 60.0
+    n_rows = int(round(180.0 / cell_deg))
+    if abs(n_rows * cell_deg - 180.0) > 1e-9:
+        raise ValueError(f"Resolution {resolution_arcmin} arc-minutes does not divide 180 degrees")
+    n_cols = 2 * n_rows
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    prefix = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=(n_rows, n_cols + 1))
+
+    start = time.time()
+    total = 0.0
+    with rasterio.open(source_path) as src:
+        print(f"Resampling {src.height}x{src.width} raster to a {n_rows} x {n_cols} grid...")
+        vrt_options = {
+            "crs": "EPSG:4326",
+            "transform": from_origin(-180.0, 90.0, cell_deg, cell_deg),
+            "width": n_cols,
+            "height": n_rows,
+            "resampling": Resampling.average if density else Resampling.sum,
+        }
+        with WarpedVRT(src, **vrt_options) as vrt:
+            for row_start in range(0, n_rows, rows_per_chunk):
+                chunk_rows = min(rows_per_chunk, n_rows - row_start)
+                band = vrt.read(1, window=Window(0, row_start, n_cols, chunk_rows), masked=True)
+                counts = np.clip(band.astype(np.float64).filled(0.0), 0.0, None)
+                if density:
+                    lats = 90.0 - (row_start + np.arange(chunk_rows) + 0.5) * cell_deg
+                    counts *= cell_areas_km2(lats, cell_deg)[:, None]
+
+                prefix[row_start:row_start + chunk_rows, 0] = 0.0
+                np.cumsum(counts, axis=1, out=prefix[row_start:row_start + chunk_rows, 1:])
+                total += counts.sum()
+                print(f"  rows {row_start + chunk_rows}/{n_rows}", end="\r")
+
+    prefix.flush()
+    del prefix
+    print(f"\n✓ Wrote {output_path} ({os.path.getsize(output_path) / 1e6:.1f} MB, "
+          f"total population {total / 1e9:.2f} billion) in {time.time() - start:.1f}s")
+    return output_path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the population summed-area table.")
+    parser.add_argument("source", help="Population count (or density) raster")
+    parser.add_argument("--output", default=default_population_grid_path(), help="Output .npy path")
+    parser.add_argument("--resolution-arcmin", type=float, default=2.5)
+    parser.add_argument("--density", action="store_true", help="Source values are people per km²")
+    parser.add_argument("--rows-per-chunk", type=int, default=256)
+    args = parser.parse_args()
+
+    build_population_grid(args.source, args.output, args.resolution_arcmin, args.density, args.rows_per_chunk)
@@ -1,14 +1,33 @@
-from datetime import datetime, timedelta
+"""
+This script builds the local asteroid catalog in bulk.
+
+It fetches asteroids by ID and/or walks a range of NeoWs browse pages with
+bounded parallelism, writing each record to the catalog database as it
+arrives. Progress is checkpointed per object and per page, so re-running an
+interrupted command resumes it instead of starting from zero.
+
+Usage:
+    # The ten famous asteroids used by the demo (also exported to data/asteroids_cache.json)
+    python -m backend.scripts.cache_asteroids
+
+    # Arbitrary IDs, from the command line or a file (one per line)
+    python -m backend.scripts.cache_asteroids --ids 2000433 2099942 --ids-file more_ids.txt
+
+    # NeoWs browse pages 0-499 (20 objects each) with 16 concurrent fetches
+    python -m backend.scripts.cache_asteroids --pages 0-499 --workers 16
+"""
+import argparse
 import json
 import os
 import sys
 from dotenv import load_dotenv
 
 
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT_DIR)
 
 
-dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
+dotenv_path = os.path.join(ROOT_DIR, '.env')
 if os.path.exists(dotenv_path):
     load_dotenv(dotenv_path=dotenv_path)
     print("Loaded .env file successfully.")
@@ -16,51 +35,81 @@ else:
     print("Warning: .env file not found.")
 
 
-from backend.services.asteroid_service import get_complete_asteroid_data
-from backend.clients.nasa_api import nasa_api_client
+from config import config
+from backend.services.catalog_service import build_catalog, get_catalog
+
+# Famous near-Earth asteroids, served by /api/asteroids for the demo
+FAMOUS_ASTEROID_IDS = [
+    '2000433', '2099942', '2101955', '3542519', '2000001',
+    '2000004', '2000010', '2000016', '2000021', '2000031'
+]
+
+
+def parse_page_range(value: str) -> range:
+    """Parses 'N' or 'START-END' (inclusive) into a range of page numbers."""
+    start, _, end = value.partition("-")
+    start, end = int(start), int(end or start)
+    if start < 0 or end < start:
+        raise argparse.ArgumentTypeError(f"Invalid page range: {value}")
+    return range(start, end + 1)
+
+
+def read_ids_file(path: str):
+    """Reads asteroid IDs from a file, one per line ('#' starts a comment)."""
+    with open(path) as f:
+        return [line.split("#")[0].strip() for line in f if line.split("#")[0].strip()]
+
+
+def print_stats(stats):
+    print(f"\nJob {stats['job']}:")
+    print(f"  fetched {stats['fetched']}, skipped {stats['skipped']} (already done), failed {stats['failed']}")
+    if stats["pages_fetched"] or stats["pages_skipped"] or stats["pages_failed"]:
+        print(f"  pages fetched {stats['pages_fetched']}, skipped {stats['pages_skipped']}, "
+              f"failed {stats['pages_failed']}")
+    print(f"  {stats['elapsed_s']} s, {stats['objects_per_s']} objects/s; catalog holds {stats['catalog_size']} asteroids")
+    if stats["failed"] or stats["pages_failed"]:
+        print("  ⚠ Re-run the same command to retry the failed items.")
 
-#ok guys, this is cache asteroid data script in case we decide go cache first for the demo and the fallback real api call!
 
 def cache_asteroids():
     """
-    Fetches and caches asteroid data for a fixed list of 10 famous asteroids.
-    
+    Fetches the famous asteroids into the catalog and exports them for /api/asteroids.
+
     Returns:
         List of cached asteroid dictionaries.
     """
-    # Famous near-Earth asteroids
-    famous_asteroid_ids = [
-        '2000433', '2099942', '2101955', '3542519', '2000001',
-        '2000004', '2000010', '2000016', '2000021', '2000031'
-    ]
-    
-    # Fetch complete data for all asteroids
-    cached_asteroids = []
-    
-    for asteroid_id in famous_asteroid_ids:
-        print(f"Fetching asteroid {asteroid_id}...")
-        
-        complete_data = get_complete_asteroid_data(asteroid_id)
-        
-        if complete_data:
-            print(f"  ✓ Cached: {complete_data.get('name', 'Unknown')}")
-            cached_asteroids.append(complete_data)
-        else:
+    stats = build_catalog(FAMOUS_ASTEROID_IDS, job="famous", resume=False)
+    print_stats(stats)
+
+    catalog = get_catalog()
+    cached_asteroids = [record for record in map(catalog.get, FAMOUS_ASTEROID_IDS) if record]
+    for asteroid_id in FAMOUS_ASTEROID_IDS:
+        if catalog.get(asteroid_id) is None:
             print(f"  ⚠ Warning: Failed to fetch data for asteroid {asteroid_id}")
-    
-    # Ensure data directory exists
-    data_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
-    os.makedirs(data_dir, exist_ok=True)
-    
-    # Save to cache file
-    cache_file = os.path.join(data_dir, "asteroids_cache.json")
+
+    os.makedirs(config.DATA_DIR, exist_ok=True)
+    cache_file = os.path.join(config.DATA_DIR, "asteroids_cache.json")
     with open(cache_file, 'w') as f:
         json.dump(cached_asteroids, f, indent=2)
-    
+
     print(f"\n✓ Successfully cached {len(cached_asteroids)} asteroids to {cache_file}")
-    
+
     return cached_asteroids
 
+
 if __name__ == "__main__":
-    cache_asteroids()
+    parser = argparse.ArgumentParser(description="Build the local asteroid catalog.")
+    parser.add_argument("--ids", nargs="+", default=[], help="Asteroid IDs to fetch")
+    parser.add_argument("--ids-file", help="File with one asteroid ID per line")
+    parser.add_argument("--pages", type=parse_page_range, help="NeoWs browse pages, e.g. 0-499")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent fetches")
+    parser.add_argument("--job", help="Checkpoint name (defaults to one derived from the arguments)")
+    parser.add_argument("--restart", action="store_true", help="Ignore checkpoints and fetch everything again")
+    args = parser.parse_args()
 
+    ids = args.ids + (read_ids_file(args.ids_file) if args.ids_file else [])
+    if not ids and not args.pages:
+        cache_asteroids()
+    else:
+        print_stats(build_catalog(ids, pages=args.pages, job=args.job, workers=args.workers,
+                                  resume=not args.restart))
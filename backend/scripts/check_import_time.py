@@ -0,0 +1,116 @@
+"""
+This script guards the API's cold-start cost. It boots the app in a fresh
+interpreter under `python -X importtime`, and fails if:
+
+- the total import time of `create_app()` exceeds the budget, or
+- a heavy scientific package (astropy, geopandas, ...) is imported at
+  startup or while serving the game and cached-asteroid endpoints.
+
+Those packages are imported inside the functions that need them, so they
+only load on first use.
+
+Usage:
+    python -m backend.scripts.check_import_time --budget-ms 1500
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Packages that must never load during startup or on the lightweight endpoints
+HEAVY_MODULES = ("astropy", "geopandas", "shapely", "rasterio", "pandas", "matplotlib", "numba", "scipy", "aiohttp")
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+# Runs in the child interpreter; prints the heavy modules loaded after each phase
+_BOOT_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+sys.path.insert(0, {backend!r})
+heavy = {heavy!r}
+
+def loaded():
+    return sorted({{name.split('.')[0] for name in sys.modules}} & set(heavy))
+
+from app import create_app
+app = create_app()
+print('startup', ','.join(loaded()))
+
+client = app.test_client()
+session_id = client.post('/api/game/start').get_json()['session_id']
+for path in ('/api/health', '/api/asteroids', '/api/game/asteroids-info',
+             f'/api/game/{{session_id}}/stats', f'/api/game/{{session_id}}/unlocks'):
+    client.get(path)
+print('endpoints', ','.join(loaded()))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Parses -X importtime output into (module, self_us, cumulative_us) for top-level imports."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        # Nested imports are indented by two extra spaces per level
+        if match and len(match.group(3)) == 1:
+            entries.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return entries
+
+
+def run_check(budget_ms: float, show: int = 15) -> bool:
+    """
+    Boots the app in a subprocess and checks the import budget and heavy modules.
+
+    Args:
+        budget_ms: Maximum total import time of all top-level imports
+        show: Number of slowest top-level imports to print
+
+    Returns:
+        True if the check passed.
+    """
+    script = _BOOT_SCRIPT.format(root=ROOT_DIR, backend=os.path.join(ROOT_DIR, "backend"),
+                                 heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        print("✗ App failed to boot")
+        return False
+
+    top_level = parse_importtime(result.stderr)
+    total_ms = sum(cumulative_us for _, _, cumulative_us in top_level) / 1000
+    phases: Dict[str, List[str]] = {}
+    for line in result.stdout.splitlines():
+        phase, _, modules = line.partition(" ")
+        if phase in ("startup", "endpoints"):
+            phases[phase] = [m for m in modules.split(",") if m]
+
+    print("Slowest top-level imports:")
+    for name, _, cumulative_us in sorted(top_level, key=lambda e: -e[2])[:show]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"Total import time: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+
+    passed = total_ms <= budget_ms
+    if not passed:
+        print("✗ Import time budget exceeded")
+    for phase, modules in phases.items():
+        if modules:
+            print(f"✗ Heavy modules loaded during {phase}: {', '.join(modules)}")
+            passed = False
+    if passed:
+        print("✓ Import time check passed")
+    return passed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the app's cold-start import cost.")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Maximum total import time")
+    parser.add_argument("--show", type=int, default=15, help="Slowest imports to list")
+    args = parser.parse_args()
+
+    sys.exit(0 if run_check(args.budget_ms, args.show) else 1)
@@ -0,0 +1,66 @@
+"""
+This script mirrors the full NeoWs catalog into the local asteroid catalog.
+
+Each run walks every NeoWs browse page and compares the objects with the
+catalog by ID and orbit epoch. Only new and re-fitted objects are fetched
+from SBDB and rewritten, so after the first run a sync touches just the
+objects whose orbits were updated. Statistics of every run are kept in the
+catalog database.
+
+Usage:
+    # Full sync
+    python -m backend.scripts.sync_catalog
+
+    # Trial run over the first 10 pages
+    python -m backend.scripts.sync_catalog --max-pages 10
+
+    # Statistics of recent syncs
+    python -m backend.scripts.sync_catalog --history
+"""
+import argparse
+import os
+import sys
+import time
+from dotenv import load_dotenv
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT_DIR)
+
+
+dotenv_path = os.path.join(ROOT_DIR, '.env')
+if os.path.exists(dotenv_path):
+    load_dotenv(dotenv_path=dotenv_path)
+    print("Loaded .env file successfully.")
+else:
+    print("Warning: .env file not found.")
+
+
+from backend.services.catalog_service import get_catalog, sync_catalog
+
+
+def print_stats(stats):
+    pages = f"{stats['pages_fetched']}/{stats['pages_total']}" if stats["pages_total"] else "0"
+    print(f"  pages {pages} (failed {stats['pages_failed']}), objects seen {stats['seen']}")
+    print(f"  new {stats['new']}, updated {stats['updated']}, unchanged {stats['unchanged']}, "
+          f"failed {stats['failed']}, no longer listed {stats['not_seen'] if stats['not_seen'] is not None else '?'}")
+    print(f"  {stats['elapsed_s']} s; catalog holds {stats['catalog_size']} asteroids")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally sync the local catalog with NeoWs.")
+    parser.add_argument("--max-pages", type=int, default=None, help="Walk only this many browse pages")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent fetches")
+    parser.add_argument("--history", action="store_true", help="Show recent sync statistics and exit")
+    args = parser.parse_args()
+
+    if args.history:
+        for run in get_catalog().sync_history():
+            print(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started_at"])))
+            print_stats(run)
+    else:
+        stats = sync_catalog(max_pages=args.max_pages, workers=args.workers)
+        print("\nSync finished:")
+        print_stats(stats)
+        if stats["failed"] or stats["pages_failed"]:
+            print("  ⚠ Failed objects and pages are retried by the next sync.")
@@ -1,33 +1,19 @@
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+import asyncio
 import json
+import logging
 import os
-from backend.clients.nasa_api import nasa_api_client
-from backend.clients.sbdb_api import sbdb_api_client
+from config import config
+from backend.clients.async_base_api_client import run_async
+from backend.clients.nasa_api import AsyncNasaApiClient, nasa_api_client
+from backend.clients.sbdb_api import AsyncSbdbApiClient, sbdb_api_client
+from backend.clients.transport import fan_out
 
-def get_complete_asteroid_data(asteroid_id: str) -> Optional[Dict[str, Any]]:
-    """
-    Fetches and merges asteroid data from both NASA NEO API and SBDB API.
-    
-    Args:
-        asteroid_id: The ID of the asteroid to look up.
-        
-    Returns:
-        A merged dictionary containing data from both APIs, or None if NEO API fails.
-        If SBDB API fails, orbital data will be None but NEO data is still returned.
-    """
-    # Fetch data from NASA NEO API
-    neo_result = nasa_api_client.get_asteroid_by_id(asteroid_id)
-    
-    # If NEO API fails, return None
-    if neo_result["error"] or not neo_result["data"]:
-        return None
-    
-    neo_data = neo_result["data"]
-    
-    # Fetch data from SBDB API
-    sbdb_result = sbdb_api_client.get_orbital_parameters(asteroid_id)
-    
-    # Merge the data
+logger = logging.getLogger(__name__)
+
+
+def merge_asteroid_data(neo_data: Dict[str, Any], sbdb_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Merges a parsed NEO record with an SBDB result (which may carry an error)."""
     merged_data = {
         "id": neo_data.get("id"),
         "name": neo_data.get("name"),
@@ -36,6 +22,8 @@ def get_complete_asteroid_data(asteroid_id: str) -> Optional[Dict[str, Any]]:
         "diameter_kilometers": neo_data.get("diameter_kilometers"),
         "velocity_kms": neo_data.get("velocity_kms"),
         "close_approach_date": neo_data.get("close_approach_date"),
+        "next_close_approach_date": neo_data.get("next_close_approach_date"),
+        "next_close_approach_jd": neo_data.get("next_close_approach_jd"),
         "orbital_elements": None,
         "physical_parameters": None,
     }
@@ -49,6 +37,85 @@ def get_complete_asteroid_data(asteroid_id: str) -> Optional[Dict[str, Any]]:
     return merged_data
 
 
+async def fetch_complete_asteroid_data(nasa: AsyncNasaApiClient, sbdb: AsyncSbdbApiClient,
+                                        asteroid_id: str) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """Fetches NEO and SBDB data concurrently; returns (asteroid_id, merged_data, error)."""
+    neo_result, sbdb_result = await asyncio.gather(
+        nasa.get_asteroid_by_id(asteroid_id),
+        sbdb.get_orbital_parameters(asteroid_id),
+    )
+    if neo_result["error"] or not neo_result["data"]:
+        return asteroid_id, None, neo_result["error"] or "No data found for this asteroid"
+    return asteroid_id, merge_asteroid_data(neo_result["data"], sbdb_result), None
+
+
+def get_complete_asteroid_data(asteroid_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetches and merges asteroid data from both NASA NEO API and SBDB API.
+
+    Both APIs are queried concurrently through the pooled sync clients, so
+    a lookup costs the slower of the two round trips rather than their sum
+    and reuses keep-alive connections across requests.
+    
+    Args:
+        asteroid_id: The ID of the asteroid to look up.
+        
+    Returns:
+        A merged dictionary containing data from both APIs, or None if NEO API fails.
+        If SBDB API fails, orbital data will be None but NEO data is still returned.
+    """
+    neo_result, sbdb_result = fan_out(
+        lambda: nasa_api_client.get_asteroid_by_id(asteroid_id),
+        lambda: sbdb_api_client.get_orbital_parameters(asteroid_id),
+    )
+    if neo_result["error"] or not neo_result["data"]:
+        return None
+    return merge_asteroid_data(neo_result["data"], sbdb_result)
+
+
+def get_complete_asteroid_data_bulk(asteroid_ids: Iterable[str],
+                                    max_concurrency: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Fetches and merges NEO and SBDB data for many asteroids concurrently.
+
+    Args:
+        asteroid_ids: IDs to look up (duplicates are fetched once).
+        max_concurrency: In-flight requests per upstream API; defaults to
+            ASYNC_HTTP_MAX_CONCURRENCY.
+
+    Returns:
+        A dictionary with 'data' (ID -> merged asteroid dictionary) and
+        'errors' (ID -> error message) for the IDs whose NEO lookup failed.
+    """
+    asteroid_ids = list(dict.fromkeys(str(asteroid_id) for asteroid_id in asteroid_ids))
+    data: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    if not asteroid_ids:
+        return {"data": data, "errors": errors}
+
+    async def fetch():
+        async with AsyncNasaApiClient(max_concurrency=max_concurrency) as nasa, \
+                AsyncSbdbApiClient(max_concurrency=max_concurrency) as sbdb:
+            tasks = [fetch_complete_asteroid_data(nasa, sbdb, asteroid_id) for asteroid_id in asteroid_ids]
+            for next_result in asyncio.as_completed(tasks):
+                try:
+                    asteroid_id, merged_data, error = await next_result
+                except Exception as e:
+                    logger.error(f"Bulk asteroid lookup failed: {e}")
+                    continue
+                if error:
+                    errors[asteroid_id] = error
+                else:
+                    data[asteroid_id] = merged_data
+
+    run_async(fetch())
+    for asteroid_id in asteroid_ids:
+        if asteroid_id not in data and asteroid_id not in errors:
+            errors[asteroid_id] = "An internal error occurred."
+    logger.info(f"Fetched {len(data)} of {len(asteroid_ids)} asteroids ({len(errors)} errors)")
+    return {"data": data, "errors": errors}
+
+
 def get_cached_asteroids() -> List[Dict[str, Any]]:
     """
     Loads and returns cached asteroid data from the JSON file.
@@ -57,7 +124,7 @@ def get_cached_asteroids() -> List[Dict[str, Any]]:
         A list of cached asteroid dictionaries, or an empty list if file doesn't exist
         or if there's a JSON decode error.
     """
-    cache_path = os.path.join("data", "asteroids_cache.json")
+    cache_path = os.path.join(config.DATA_DIR, "asteroids_cache.json")
     
     if not os.path.exists(cache_path):
         return []
@@ -0,0 +1,127 @@
+"""
+This service loads the local gridded bathymetry used by the tsunami models.
+
+The grid is an .npz file with 'elevation_m' (n_lat, n_lon; negative below
+sea level), 'lats' and 'lons' (cell centers, uniform spacing), built from a
+GEBCO/ETOPO raster with backend/scripts/build_bathymetry_grid.py.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class BathymetryGrid:
+    """Regular lat/lon elevation grid with ascending latitudes."""
+
+    def __init__(self, elevation_m: np.ndarray, lats: np.ndarray, lons: np.ndarray):
+        elevation_m = np.asarray(elevation_m, dtype=np.float32)
+        lats = np.asarray(lats, dtype=float)
+        lons = np.asarray(lons, dtype=float)
+        if lats[0] > lats[-1]:
+            lats, elevation_m = lats[::-1], elevation_m[::-1]
+        if elevation_m.shape != (len(lats), len(lons)):
+            raise ValueError("elevation_m must have shape (len(lats), len(lons))")
+
+        self.elevation_m = elevation_m
+        self.lats = lats
+        self.lons = lons
+        self.cell_size_deg = abs(lats[1] - lats[0])
+
+    @property
+    def depth_m(self) -> np.ndarray:
+        """Water depth, positive below sea level and 0 on land."""
+        return np.maximum(-self.elevation_m, 0.0)
+
+    @property
+    def is_global(self) -> bool:
+        return abs(len(self.lons) * abs(self.lons[1] - self.lons[0]) - 360.0) < self.cell_size_deg / 2
+
+    def region(self, lat_min: float, lat_max: float, lon_min: float, lon_max: float,
+               resolution_deg: Optional[float] = None) -> "BathymetryGrid":
+        """
+        Cuts out a window, optionally coarsened by block-averaging.
+
+        Longitudes may run past ±180 (e.g. 120 to 280 for the Pacific) on a
+        global grid; the returned longitudes then increase monotonically.
+
+        Args:
+            lat_min, lat_max: Latitude bounds (degrees)
+            lon_min, lon_max: Longitude bounds (degrees)
+            resolution_deg: Target cell size; rounded to a whole multiple of the source cell
+
+        Returns:
+            A new BathymetryGrid
+        """
+        rows = np.flatnonzero((self.lats >= lat_min) & (self.lats <= lat_max))
+
+        span = lon_max - lon_min
+        if self.is_global and span < 360:
+            offsets = (self.lons - lon_min) % 360.0
+            cols = np.flatnonzero(offsets <= span)
+            cols = cols[np.argsort(offsets[cols])]
+            lons = lon_min + offsets[cols]
+        else:
+            cols = np.flatnonzero((self.lons >= lon_min) & (self.lons <= lon_max))
+            lons = self.lons[cols]
+
+        if len(rows) < 3 or len(cols) < 3:
+            raise ValueError("Requested bathymetry region is smaller than three cells")
+        elevation = self.elevation_m[np.ix_(rows, cols)]
+        lats = self.lats[rows]
+
+        factor = max(1, int(round((resolution_deg or 0) / self.cell_size_deg)))
+        if factor > 1:
+            ny, nx = len(lats) // factor, len(lons) // factor
+            elevation = elevation[:ny * factor, :nx * factor].reshape(ny, factor, nx, factor).mean(axis=(1, 3))
+            lats = lats[:ny * factor].reshape(ny, factor).mean(axis=1)
+            lons = lons[:nx * factor].reshape(nx, factor).mean(axis=1)
+        return BathymetryGrid(elevation, lats, lons)
+
+    def depth_at(self, latitude, longitude) -> np.ndarray:
+        """Nearest-cell water depth at the given coordinates (vectorized)."""
+        latitude = np.asarray(latitude, dtype=float)
+        longitude = np.asarray(longitude, dtype=float)
+        rows = np.clip(np.round((latitude - self.lats[0]) / self.cell_size_deg).astype(int), 0, len(self.lats) - 1)
+        lon_step = self.lons[1] - self.lons[0]
+        if self.is_global:
+            cols = np.round(((longitude - self.lons[0]) % 360.0) / lon_step).astype(int) % len(self.lons)
+        else:
+            cols = np.clip(np.round((longitude - self.lons[0]) / lon_step).astype(int), 0, len(self.lons) - 1)
+        return np.maximum(-self.elevation_m[rows, cols], 0.0)
+
+
+def default_bathymetry_path() -> str:
+    """Configured grid location (BATHYMETRY_PATH, or bathymetry.npz in DATA_DIR)."""
+    return config.BATHYMETRY_PATH or os.path.join(config.DATA_DIR, "bathymetry.npz")
+
+
+@lru_cache(maxsize=2)
+def _load_bathymetry(path: str) -> Optional[BathymetryGrid]:
+    if not os.path.exists(path):
+        logger.warning(f"Bathymetry grid not found at {path}")
+        return None
+    try:
+        with np.load(path) as data:
+            grid = BathymetryGrid(data['elevation_m'], data['lats'], data['lons'])
+    except (OSError, KeyError, ValueError) as e:
+        logger.error(f"Could not load bathymetry grid {path}: {e}")
+        return None
+    logger.info(f"Loaded bathymetry grid {path} ({grid.elevation_m.shape[0]}x{grid.elevation_m.shape[1]})")
+    return grid
+
+
+def load_bathymetry(path: Optional[str] = None) -> Optional[BathymetryGrid]:
+    """
+    Returns the shared bathymetry grid, or None if no grid file is available.
+
+    Args:
+        path: Grid file; defaults to default_bathymetry_path()
+    """
+    return _load_bathymetry(path or default_bathymetry_path())
@@ -0,0 +1,481 @@
+"""
+This service keeps a local catalog of near-Earth asteroids and builds it in bulk.
+
+The catalog is a SQLite database holding one merged NeoWs + SBDB record per
+asteroid, in the same shape as get_complete_asteroid_data(). It is filled by
+build_catalog(). The builder takes a list of IDs and/or a range of NeoWs
+browse pages and fetches them concurrently through the async clients. Each
+record is written as soon as it arrives, and in the same transaction its
+work item is checkpointed. An interrupted or partly failed build therefore
+resumes where it stopped when run again with the same job name.
+
+Objects found through browse pages already carry their NeoWs data, so only
+SBDB is queried for them. Unlike interactive lookups, an SBDB failure fails
+the object (to be retried on resume) rather than storing it without an
+orbit. Builds run in the BACKGROUND rate-limit lane, leaving part of the
+NASA quota for interactive lookups.
+
+sync_catalog() keeps a full mirror fresh. It walks every NeoWs browse page,
+diffs the objects against the store by ID and NeoWs orbit epoch, and
+queries SBDB only for new objects and objects whose orbit was re-fitted.
+A steady-state sync therefore costs the browse pages plus one SBDB call
+per updated object. Each sync's statistics are kept in the sync_runs table.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from config import config
+from backend.clients.async_base_api_client import run_async
+from backend.clients.nasa_api import AsyncNasaApiClient
+from backend.clients.rate_limiter import BACKGROUND, request_priority
+from backend.clients.sbdb_api import SBDB_NOT_FOUND_ERROR, AsyncSbdbApiClient
+from backend.services.asteroid_service import merge_asteroid_data
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS asteroids (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    orbit_epoch REAL,
+    neo_orbit_epoch REAL,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS build_progress (
+    job TEXT NOT NULL,
+    item TEXT NOT NULL,
+    status TEXT NOT NULL,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (job, item)
+);
+CREATE TABLE IF NOT EXISTS sync_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at REAL NOT NULL,
+    stats TEXT NOT NULL
+);
+"""
+
+
+def page_item(page: int) -> str:
+    return f"page:{page}"
+
+
+def id_item(asteroid_id: str) -> str:
+    return f"id:{asteroid_id}"
+
+
+class AsteroidCatalog:
+    """SQLite store of merged asteroid records and build checkpoints."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection):
+        # Catalogs built before incremental sync lack the NeoWs epoch column
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(asteroids)")}
+        if "neo_orbit_epoch" not in columns:
+            try:
+                conn.execute("ALTER TABLE asteroids ADD COLUMN neo_orbit_epoch REAL")
+            except sqlite3.OperationalError:
+                pass  # Added concurrently by another connection
+
+    def upsert(self, record: Dict[str, Any], job: Optional[str] = None, item: Optional[str] = None,
+               neo_orbit_epoch: Optional[float] = None):
+        """
+        Writes a merged asteroid record, checkpointing its work item in the same transaction.
+
+        Args:
+            record: Merged asteroid dictionary
+            job: Build job to checkpoint
+            item: Work item to mark done
+            neo_orbit_epoch: Orbit epoch NeoWs reported, compared by sync_catalog()
+        """
+        epoch = (record.get("orbital_elements") or {}).get("epoch")
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute(
+                "INSERT OR REPLACE INTO asteroids (id, name, orbit_epoch, neo_orbit_epoch, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (str(record["id"]), record.get("name"), epoch, neo_orbit_epoch, json.dumps(record), now)
+            )
+            if job and item:
+                self._mark(conn, job, item, "done", None, now)
+
+    def mark(self, job: str, item: str, status: str, error: Optional[str] = None):
+        """Checkpoints a work item as 'done' or 'failed'."""
+        self._mark(self._connection(), job, item, status, error, time.time())
+
+    @staticmethod
+    def _mark(conn: sqlite3.Connection, job: str, item: str, status: str, error: Optional[str], now: float):
+        conn.execute(
+            "INSERT OR REPLACE INTO build_progress (job, item, status, error, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (job, item, status, error, now)
+        )
+
+    def completed_items(self, job: str) -> Set[str]:
+        """Work items of a job that finished successfully."""
+        rows = self._connection().execute(
+            "SELECT item FROM build_progress WHERE job = ? AND status = 'done'", (job,)
+        )
+        return {item for (item,) in rows}
+
+    def failed_items(self, job: str) -> Dict[str, str]:
+        """Work items of a job that failed, with their errors."""
+        rows = self._connection().execute(
+            "SELECT item, error FROM build_progress WHERE job = ? AND status = 'failed'", (job,)
+        )
+        return dict(rows.fetchall())
+
+    def reset_job(self, job: str):
+        """Forgets a job's checkpoints, so the next build starts from zero."""
+        self._connection().execute("DELETE FROM build_progress WHERE job = ?", (job,))
+
+    def get(self, asteroid_id: str) -> Optional[Dict[str, Any]]:
+        row = self._connection().execute("SELECT data FROM asteroids WHERE id = ?", (str(asteroid_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM asteroids").fetchone()[0]
+
+    def known_epochs(self) -> Dict[str, Optional[float]]:
+        """NeoWs orbit epoch of every stored asteroid, keyed by ID."""
+        return dict(self._connection().execute("SELECT id, neo_orbit_epoch FROM asteroids").fetchall())
+
+    def record_sync(self, started_at: float, stats: Dict[str, Any]):
+        """Appends a sync run's statistics to the history."""
+        self._connection().execute("INSERT INTO sync_runs (started_at, stats) VALUES (?, ?)",
+                                   (started_at, json.dumps(stats)))
+
+    def sync_history(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Statistics of the most recent sync runs, newest first."""
+        rows = self._connection().execute(
+            "SELECT started_at, stats FROM sync_runs ORDER BY id DESC LIMIT ?", (limit,)
+        )
+        return [{"started_at": started_at, **json.loads(stats)} for started_at, stats in rows]
+
+
+def default_catalog_path() -> str:
+    """Configured catalog database (CATALOG_PATH, or asteroid_catalog.sqlite3 in DATA_DIR)."""
+    return config.CATALOG_PATH or os.path.join(config.DATA_DIR, "asteroid_catalog.sqlite3")
+
+
+@lru_cache(maxsize=2)
+def _load_catalog(path: str) -> AsteroidCatalog:
+    return AsteroidCatalog(path)
+
+
+def get_catalog(path: Optional[str] = None) -> AsteroidCatalog:
+    """
+    Returns the shared catalog store.
+
+    Args:
+        path: Catalog database; defaults to default_catalog_path()
+    """
+    return _load_catalog(path or default_catalog_path())
+
+
+def find_asteroid_in_catalog(asteroid_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Looks up an asteroid in the local catalog.
+
+    Returns:
+        The merged asteroid dictionary, or None if it (or the catalog) is missing.
+    """
+    path = default_catalog_path()
+    if not os.path.exists(path):
+        return None
+    try:
+        return get_catalog(path).get(asteroid_id)
+    except sqlite3.Error as e:
+        logger.error(f"Catalog lookup failed for {asteroid_id}: {e}")
+        return None
+
+
+def default_job_name(asteroid_ids: List[str], pages: Optional[range]) -> str:
+    """Stable job name for a build, so re-running the same command resumes it."""
+    parts = []
+    if pages:
+        parts.append(f"pages:{pages.start}-{pages.stop - 1}")
+    if asteroid_ids:
+        digest = hashlib.sha256(",".join(sorted(asteroid_ids)).encode()).hexdigest()[:12]
+        parts.append(f"ids:{len(asteroid_ids)}:{digest}")
+    return "+".join(parts)
+
+
+def build_catalog(asteroid_ids: Optional[Iterable[str]] = None, pages: Optional[range] = None,
+                  job: Optional[str] = None, workers: Optional[int] = None, resume: bool = True,
+                  catalog: Optional[AsteroidCatalog] = None, progress_every: int = 100) -> Dict[str, Any]:
+    """
+    Fetches asteroids into the local catalog with bounded parallelism.
+
+    Args:
+        asteroid_ids: Asteroid IDs to fetch (NeoWs and SBDB)
+        pages: NeoWs browse pages to walk (SBDB is fetched for every object)
+        job: Checkpoint name; defaults to one derived from the IDs and pages
+        workers: Concurrent fetches; defaults to ASYNC_HTTP_MAX_CONCURRENCY
+        resume: Skip work items a previous run of the job completed
+        catalog: Target store; defaults to get_catalog()
+        progress_every: Log throughput after this many objects
+
+    Returns:
+        Build statistics: counts of fetched, skipped (already done) and failed
+        objects and pages, elapsed time and throughput (objects per second).
+    """
+    asteroid_ids = list(dict.fromkeys(str(asteroid_id) for asteroid_id in (asteroid_ids or [])))
+    if not asteroid_ids and not pages:
+        raise ValueError("Nothing to build: pass asteroid_ids and/or pages")
+
+    catalog = catalog or get_catalog()
+    job = job or default_job_name(asteroid_ids, pages)
+    workers = workers or config.ASYNC_HTTP_MAX_CONCURRENCY
+    if not resume:
+        catalog.reset_job(job)
+
+    stats = {"job": job, "fetched": 0, "skipped": 0, "failed": 0, "pages_fetched": 0, "pages_skipped": 0, "pages_failed": 0}
+    items = [page_item(page) for page in (pages or [])] + [id_item(asteroid_id) for asteroid_id in asteroid_ids]
+    start = time.perf_counter()
+
+    with request_priority(BACKGROUND):
+        run_async(_run_build(catalog, job, items, workers, stats, start, progress_every))
+
+    elapsed_s = time.perf_counter() - start
+    stats["elapsed_s"] = round(elapsed_s, 2)
+    stats["objects_per_s"] = round(stats["fetched"] / elapsed_s, 2) if elapsed_s > 0 else None
+    stats["catalog_size"] = catalog.count()
+    logger.info(f"Catalog build {job}: {stats}")
+    return stats
+
+
+async def _run_build(catalog: AsteroidCatalog, job: str, items: List[str], workers: int,
+                     stats: Dict[str, Any], start: float, progress_every: int):
+    done = await asyncio.to_thread(catalog.completed_items, job)
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        if item in done:
+            stats["pages_skipped" if item.startswith("page:") else "skipped"] += 1
+        else:
+            queue.put_nowait((item, None, None))
+
+    # A page is checkpointed once all of its objects are stored
+    page_pending: Dict[str, int] = {}
+    page_failed: Set[str] = set()
+
+    async def finish_page(page: str, ok: bool):
+        if not ok:
+            page_failed.add(page)
+        page_pending[page] -= 1
+        if page_pending[page] == 0:
+            failed = page in page_failed
+            stats["pages_failed" if failed else "pages_fetched"] += 1
+            await asyncio.to_thread(catalog.mark, job, page, "failed" if failed else "done",
+                                    "Some objects failed" if failed else None)
+
+    async def record(item: str, merged: Optional[Dict[str, Any]], error: Optional[str],
+                     neo_orbit_epoch: Optional[float]):
+        if merged:
+            await asyncio.to_thread(catalog.upsert, merged, job, item, neo_orbit_epoch)
+            stats["fetched"] += 1
+            if stats["fetched"] % progress_every == 0:
+                rate = stats["fetched"] / (time.perf_counter() - start)
+                logger.info(f"Catalog build {job}: {stats['fetched']} objects ({rate:.1f}/s)")
+        else:
+            await asyncio.to_thread(catalog.mark, job, item, "failed", error)
+            stats["failed"] += 1
+
+    async with AsyncNasaApiClient(max_concurrency=workers) as nasa, \
+            AsyncSbdbApiClient(max_concurrency=workers) as sbdb:
+
+        async def handle(item: str, neo_data: Optional[Dict[str, Any]], page: Optional[str]):
+            kind, value = item.split(":", 1)
+            if kind == "page":
+                result = await nasa.browse_asteroids(int(value))
+                if result["error"]:
+                    stats["pages_failed"] += 1
+                    await asyncio.to_thread(catalog.mark, job, item, "failed", result["error"])
+                    return
+                page_pending[item] = 1
+                for neo in result["data"]:
+                    if id_item(neo["id"]) in done:
+                        stats["skipped"] += 1
+                        continue
+                    page_pending[item] += 1
+                    queue.put_nowait((id_item(neo["id"]), neo, item))
+                await finish_page(item, True)
+                return
+
+            ok = False
+            try:
+                if neo_data is None:
+                    neo_result, sbdb_result = await asyncio.gather(
+                        nasa.get_asteroid_by_id(value), sbdb.get_orbital_parameters(value)
+                    )
+                    neo_data, error = neo_result["data"], neo_result["error"]
+                else:
+                    sbdb_result, error = await sbdb.get_orbital_parameters(value), None
+                if not error and sbdb_result["error"] not in (None, SBDB_NOT_FOUND_ERROR):
+                    error = sbdb_result["error"]
+                if not error and not neo_data:
+                    error = "No data found for this asteroid"
+                merged = None if error else merge_asteroid_data(neo_data, sbdb_result)
+                await record(item, merged, error, neo_data.get("orbit_epoch") if neo_data else None)
+                ok = merged is not None
+            finally:
+                if page:
+                    await finish_page(page, ok)
+
+        async def worker():
+            while True:
+                item, neo_data, page = await queue.get()
+                try:
+                    await handle(item, neo_data, page)
+                except Exception as e:
+                    logger.error(f"Catalog build {job}: {item} failed: {e}")
+                    stats["failed"] += 1
+                    await asyncio.to_thread(catalog.mark, job, item, "failed", str(e))
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def sync_catalog(max_pages: Optional[int] = None, workers: Optional[int] = None,
+                 catalog: Optional[AsteroidCatalog] = None) -> Dict[str, Any]:
+    """
+    Brings the local catalog up to date with the full NeoWs catalog.
+
+    Every browse page is fetched (revalidating any cached copy). Objects
+    missing from the store or whose NeoWs orbit epoch changed are refetched
+    from SBDB and rewritten; unchanged objects are not touched.
+
+    Args:
+        max_pages: Walk only this many pages (for trial runs)
+        workers: Concurrent fetches; defaults to ASYNC_HTTP_MAX_CONCURRENCY
+        catalog: Target store; defaults to get_catalog()
+
+    Returns:
+        Sync statistics: pages walked and failed, and counts of seen, new,
+        updated, unchanged and failed objects. not_seen counts stored objects
+        no longer listed by NeoWs (None unless every page was walked).
+    """
+    catalog = catalog or get_catalog()
+    workers = workers or config.ASYNC_HTTP_MAX_CONCURRENCY
+    stats = {"pages_total": None, "pages_fetched": 0, "pages_failed": 0, "seen": 0,
+             "new": 0, "updated": 0, "unchanged": 0, "failed": 0, "not_seen": None}
+    started_at, start = time.time(), time.perf_counter()
+
+    with request_priority(BACKGROUND):
+        run_async(_run_sync(catalog, max_pages, workers, stats))
+
+    stats["elapsed_s"] = round(time.perf_counter() - start, 2)
+    stats["catalog_size"] = catalog.count()
+    catalog.record_sync(started_at, stats)
+    logger.info(f"Catalog sync: {stats}")
+    return stats
+
+
+async def _run_sync(catalog: AsteroidCatalog, max_pages: Optional[int], workers: int, stats: Dict[str, Any]):
+    known = await asyncio.to_thread(catalog.known_epochs)
+    seen: Set[str] = set()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def diff_page(neos: List[Dict[str, Any]]):
+        stats["pages_fetched"] += 1
+        for neo in neos:
+            asteroid_id = str(neo["id"])
+            if asteroid_id in seen:
+                continue
+            seen.add(asteroid_id)
+            stats["seen"] += 1
+            if asteroid_id not in known:
+                queue.put_nowait(("object", neo, "new"))
+            elif known[asteroid_id] != neo.get("orbit_epoch"):
+                queue.put_nowait(("object", neo, "updated"))
+            else:
+                stats["unchanged"] += 1
+
+    async with AsyncNasaApiClient(max_concurrency=workers) as nasa, \
+            AsyncSbdbApiClient(max_concurrency=workers) as sbdb:
+        first = await nasa.browse_asteroids(0, refresh=True)
+        if first["error"]:
+            stats["pages_failed"] += 1
+            logger.error(f"Catalog sync: browse page 0 failed: {first['error']}")
+            return
+        total_pages = first["page"].get("total_pages") or 1
+        stats["pages_total"] = min(total_pages, max_pages) if max_pages else total_pages
+        diff_page(first["data"])
+        for page in range(1, stats["pages_total"]):
+            queue.put_nowait(("page", page, None))
+
+        async def handle(kind: str, value: Any, change: Optional[str]):
+            if kind == "page":
+                result = await nasa.browse_asteroids(value, refresh=True)
+                if result["error"]:
+                    stats["pages_failed"] += 1
+                    logger.warning(f"Catalog sync: browse page {value} failed: {result['error']}")
+                else:
+                    diff_page(result["data"])
+                return
+
+            sbdb_result = await sbdb.get_orbital_parameters(value["id"], refresh=True)
+            if sbdb_result["error"] not in (None, SBDB_NOT_FOUND_ERROR):
+                stats["failed"] += 1
+                logger.warning(f"Catalog sync: SBDB lookup for {value['id']} failed: {sbdb_result['error']}")
+                return
+            await asyncio.to_thread(catalog.upsert, merge_asteroid_data(value, sbdb_result),
+                                    neo_orbit_epoch=value.get("orbit_epoch"))
+            stats[change] += 1
+
+        async def worker():
+            while True:
+                kind, value, change = await queue.get()
+                try:
+                    await handle(kind, value, change)
+                except Exception as e:
+                    logger.error(f"Catalog sync: {kind} {value if kind == 'page' else value.get('id')} failed: {e}")
+                    stats["pages_failed" if kind == "page" else "failed"] += 1
+                finally:
+                    queue.task_done()
+
+        tasks = [asyncio.create_task(worker()) for _ in range(workers)]
+        try:
+            await queue.join()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    if not stats["pages_failed"] and stats["pages_total"] == total_pages:
+        stats["not_seen"] = len(known.keys() - seen)
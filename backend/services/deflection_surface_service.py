@@ -0,0 +1,159 @@
+"""
+This service builds deflection surfaces (miss distance and success probability
+over a lead-time x Δv grid) for individual asteroids and keeps them in a
+small LRU cache, so chart requests don't recompute the grid.
+
+Surfaces are stored as little-endian float32 arrays, ready to be served as
+raw binary for plotting clients. The encounter is the asteroid's next close
+approach after now; asteroids without one get no surface.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from config.constants import EARTH_RADIUS_M
+from backend.clients.nasa_api import UNIX_EPOCH_JD
+from backend.physics.mitigation import MitigationStrategies
+from backend.services.asteroid_service import (
+    get_cached_asteroids,
+    find_asteroid_in_cache,
+    get_complete_asteroid_data
+)
+from backend.services.catalog_service import find_asteroid_in_catalog
+
+logger = logging.getLogger(__name__)
+
+SURFACE_FIELDS = ("miss_distance_m", "success_probability")
+SURFACE_DTYPE = np.dtype("<f4")
+
+DEFAULT_GRID = {
+    "lead_time_min_years": 0.1,
+    "lead_time_max_years": 20.0,
+    "n_lead_times": 120,
+    "delta_v_min_ms": 1e-4,
+    "delta_v_max_ms": 0.1,
+    "n_delta_v": 120,
+    "required_deflection_m": EARTH_RADIUS_M,
+    "delta_v_log_sigma": 0.3,
+}
+
+_surface_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _encounter_jd(asteroid: Dict[str, Any]) -> Optional[float]:
+    """Julian date of the asteroid's next close approach, or None if none is known (or it has passed)."""
+    jd = asteroid.get("next_close_approach_jd")
+    if jd is None or jd <= time.time() / 86400.0 + UNIX_EPOCH_JD:
+        return None
+    return jd
+
+
+def _has_surface_inputs(asteroid: Optional[Dict[str, Any]]) -> bool:
+    """Whether a record has propagatable elements (with an epoch) and an upcoming encounter."""
+    orbital_elements = (asteroid or {}).get("orbital_elements") or {}
+    return ("a" in orbital_elements and orbital_elements.get("epoch") is not None
+            and _encounter_jd(asteroid) is not None)
+
+
+def _find_asteroid(asteroid_id: str) -> Optional[Dict[str, Any]]:
+    """Looks up an asteroid in the local cache and catalog, falling back to the live APIs."""
+    for asteroid in (find_asteroid_in_cache(asteroid_id, get_cached_asteroids()),
+                     find_asteroid_in_catalog(asteroid_id)):
+        if _has_surface_inputs(asteroid):
+            return asteroid
+    return get_complete_asteroid_data(asteroid_id)
+
+
+def parse_grid(args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Builds grid settings from request arguments, filling in defaults.
+
+    Raises:
+        ValueError: If a value is not numeric or the grid is invalid.
+    """
+    grid = dict(DEFAULT_GRID)
+    for key, default in DEFAULT_GRID.items():
+        if key in args and args[key] is not None:
+            grid[key] = type(default)(args[key])
+
+    if not 0 <= grid["lead_time_min_years"] < grid["lead_time_max_years"]:
+        raise ValueError("lead_time_min_years must be >= 0 and below lead_time_max_years")
+    if not 0 < grid["delta_v_min_ms"] < grid["delta_v_max_ms"]:
+        raise ValueError("delta_v_min_ms must be > 0 and below delta_v_max_ms")
+    if not (2 <= grid["n_lead_times"] <= 1000 and 2 <= grid["n_delta_v"] <= 1000):
+        raise ValueError("Grid sizes must be between 2 and 1000")
+    if grid["required_deflection_m"] <= 0 or grid["delta_v_log_sigma"] < 0:
+        raise ValueError("required_deflection_m must be > 0 and delta_v_log_sigma >= 0")
+    return grid
+
+
+def get_deflection_surface(asteroid_id: str, grid: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Returns the deflection surface of an asteroid, computing it on first use.
+
+    Args:
+        asteroid_id: NEO reference ID.
+        grid: Grid settings from parse_grid.
+
+    Returns:
+        A dictionary with 'meta' (JSON-friendly axes and settings) and
+        'arrays' (float32 surfaces by field name), or None if the asteroid,
+        its orbital elements or an upcoming close approach are unavailable.
+    """
+    key = (asteroid_id,) + tuple(sorted(grid.items()))
+    with _cache_lock:
+        surface = _surface_cache.get(key)
+        if surface is not None:
+            _surface_cache.move_to_end(key)
+            return surface
+
+    asteroid = _find_asteroid(asteroid_id)
+    if not _has_surface_inputs(asteroid):
+        return None
+    orbital_elements = asteroid["orbital_elements"]
+
+    lead_times = np.linspace(grid["lead_time_min_years"], grid["lead_time_max_years"], grid["n_lead_times"])
+    delta_v = np.geomspace(grid["delta_v_min_ms"], grid["delta_v_max_ms"], grid["n_delta_v"])
+    result = MitigationStrategies.deflection_surface(
+        orbital_elements,
+        lead_times,
+        delta_v,
+        impact_jd=_encounter_jd(asteroid),
+        required_deflection_m=grid["required_deflection_m"],
+        delta_v_log_sigma=grid["delta_v_log_sigma"]
+    )
+
+    surface = {
+        "meta": {
+            "asteroid_id": asteroid_id,
+            "name": asteroid.get("name"),
+            "shape": [len(lead_times), len(delta_v)],
+            "dtype": "float32",
+            "byte_order": "little",
+            "layout": "row-major, rows = lead time, columns = delta-v",
+            "fields": list(SURFACE_FIELDS),
+            "lead_times_years": lead_times.tolist(),
+            "delta_v_ms": delta_v.tolist(),
+            "orbital_period_years": float(result["orbital_period_years"]),
+            "impact_jd": float(result["impact_jd"]),
+            "impact_date": asteroid.get("next_close_approach_date"),
+            **grid,
+        },
+        "arrays": {
+            field: np.ascontiguousarray(result[field], dtype=SURFACE_DTYPE)
+            for field in SURFACE_FIELDS
+        },
+    }
+
+    with _cache_lock:
+        _surface_cache[key] = surface
+        while len(_surface_cache) > config.MITIGATION_SURFACE_CACHE_SIZE:
+            _surface_cache.popitem(last=False)
+    logger.info(f"Computed deflection surface for asteroid {asteroid_id} ({len(lead_times)}x{len(delta_v)})")
+    return surface
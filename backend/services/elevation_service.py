@@ -6,10 +6,13 @@ and then derive contextual information such as whether an impact is in the ocean
 the type of terrain, and an estimate of ocean depth. This data is intended to be
 used by downstream physics calculations (e.g., tsunami modeling).
 """
+import asyncio
 from functools import lru_cache
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 
-from backend.clients.elevation_api import elevation_client
+from backend.clients.async_base_api_client import run_async
+from backend.clients.elevation_api import AsyncOpenElevationClient, elevation_client
+from backend.utils.land_mask import get_land_mask
 
 @lru_cache(maxsize=1000)
 def get_elevation_at_point(lat: float, lng: float) -> Optional[float]:
@@ -29,6 +32,34 @@ def get_elevation_at_point(lat: float, lng: float) -> Optional[float]:
     
     return elevation_client.get_elevation(lat, lng)
 
+def get_elevations_at_points(coordinates: List[Tuple[float, float]],
+                             batch_size: int = 100) -> List[Optional[float]]:
+    """
+    Gets elevations for many points, fetching the batches concurrently.
+
+    Args:
+        coordinates: A list of (latitude, longitude) tuples.
+        batch_size: Points per upstream batch request.
+
+    Returns:
+        Elevations in meters in input order; None for invalid or failed points.
+    """
+    valid = [i for i, (lat, lng) in enumerate(coordinates) if -90 <= lat <= 90 and -180 <= lng <= 180]
+    batches = [valid[i:i + batch_size] for i in range(0, len(valid), batch_size)]
+
+    async def fetch():
+        async with AsyncOpenElevationClient() as client:
+            return await asyncio.gather(*(
+                client.get_elevations_batch([coordinates[i] for i in batch]) for batch in batches
+            ))
+
+    elevations: List[Optional[float]] = [None] * len(coordinates)
+    if batches:
+        for batch, results in zip(batches, run_async(fetch())):
+            for i, elevation in zip(batch, results):
+                elevations[i] = elevation
+    return elevations
+
 def is_ocean_impact(lat: float, lng: float) -> bool:
     """
     Determines if a given coordinate is over the ocean.
@@ -38,9 +69,16 @@ def is_ocean_impact(lat: float, lng: float) -> bool:
         lng: Longitude of the point.
 
     Returns:
-        True if the location is at or below sea level, False otherwise.
-        If elevation data is unavailable, it safely defaults to False (land).
+        True if the location is over ocean according to the local land mask.
+        Without a mask, True if the location is at or below sea level; if
+        elevation data is unavailable, it safely defaults to False (land).
     """
+    land_mask = get_land_mask()
+    if land_mask is not None:
+        if not -90 <= lat <= 90 or not -180 <= lng <= 180:
+            return False
+        return land_mask.is_ocean(lat, lng)
+
     elevation = get_elevation_at_point(lat, lng)
     
     if elevation is None:
@@ -0,0 +1,301 @@
+"""
+This service answers NeoWs feed queries (close approaches by date) from per-day buckets.
+
+The NeoWs /feed endpoint takes a window of at most seven days after its
+start date. Caching its responses by exact window means overlapping queries
+never share results: "the next 7 days" asked on consecutive days are
+different requests. Here each day's close approaches are stored as their
+own bucket in a local SQLite database. A query for an arbitrary date range
+is assembled from the cached days, and only the missing or expired days are
+fetched. Nearby gaps are filled together in windows that respect the /feed
+limit, fetched concurrently over the pooled NASA client. A sliding window
+therefore costs at most one request for the day that entered it.
+
+The NASA quota is small (30 requests per hour with DEMO_KEY), so a single
+query may fetch at most MAX_FEED_REQUESTS_PER_QUERY windows; a range with
+more uncached days than that is refused rather than draining the budget.
+
+Days in the past hardly change and are kept for NEO_FEED_PAST_DAY_CACHE_TTL_S.
+Today and future days expire after NEO_FEED_CACHE_TTL_S. If a fetch fails,
+expired buckets for those days are served instead. Alongside the buckets, a
+close_approaches table indexes every cached approach by date, for range
+queries such as "hazardous approaches this month".
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import config
+from backend.clients.nasa_api import NEO_FEED_MAX_SPAN_DAYS, nasa_api_client
+from backend.clients.transport import fan_out
+
+logger = logging.getLogger(__name__)
+
+# Longest range a single query may assemble
+MAX_RANGE_DAYS = 366
+
+# Most /feed windows one query may fetch (about four weeks of uncached days)
+MAX_FEED_REQUESTS_PER_QUERY = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feed_days (
+    day TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS close_approaches (
+    day TEXT NOT NULL,
+    asteroid_id TEXT NOT NULL,
+    name TEXT,
+    is_hazardous INTEGER,
+    close_approach_date TEXT,
+    velocity_kms REAL,
+    PRIMARY KEY (day, asteroid_id)
+);
+"""
+
+
+class FeedRequestBudgetError(ValueError):
+    """Raised when a query would need more than MAX_FEED_REQUESTS_PER_QUERY /feed requests."""
+
+
+class FeedCache:
+    """SQLite store of per-day NeoWs feed buckets and their close-approach index."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._counts = {"day_hits": 0, "days_fetched": 0, "requests": 0, "stale_days": 0}
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread and process (connections must not cross a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counts[name] += n
+
+    def load_days(self, days: List[str]) -> Dict[str, Tuple[List[Dict[str, Any]], float]]:
+        """Cached buckets for the given days: {day: (asteroids, expires_at)}."""
+        placeholders = ",".join("?" * len(days))
+        rows = self._connection().execute(
+            f"SELECT day, data, expires_at FROM feed_days WHERE day IN ({placeholders})", days
+        )
+        return {day: (json.loads(data), expires_at) for day, data, expires_at in rows}
+
+    def store_days(self, buckets: Dict[str, List[Dict[str, Any]]], ttls: Dict[str, float]):
+        """Replaces the buckets (and their index rows) of the given days in one transaction."""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN")
+            for day, asteroids in buckets.items():
+                conn.execute("INSERT OR REPLACE INTO feed_days (day, data, fetched_at, expires_at) VALUES (?, ?, ?, ?)",
+                             (day, json.dumps(asteroids), now, now + ttls[day]))
+                conn.execute("DELETE FROM close_approaches WHERE day = ?", (day,))
+                conn.executemany(
+                    "INSERT OR REPLACE INTO close_approaches "
+                    "(day, asteroid_id, name, is_hazardous, close_approach_date, velocity_kms) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(day, str(asteroid["id"]), asteroid.get("name"), asteroid.get("is_hazardous"),
+                      asteroid.get("close_approach_date"), _to_float(asteroid.get("velocity_kms")))
+                     for asteroid in asteroids if asteroid and asteroid.get("id")]
+                )
+
+    def approaches_between(self, start_day: str, end_day: str, hazardous_only: bool = False) -> List[Dict[str, Any]]:
+        """Cached close approaches in a date range, in time order."""
+        query = ("SELECT day, asteroid_id, name, is_hazardous, close_approach_date, velocity_kms "
+                 "FROM close_approaches WHERE day BETWEEN ? AND ?")
+        if hazardous_only:
+            query += " AND is_hazardous = 1"
+        rows = self._connection().execute(query + " ORDER BY day, close_approach_date", (start_day, end_day))
+        return [
+            {"date": day, "id": asteroid_id, "name": name,
+             "is_hazardous": None if hazardous is None else bool(hazardous),
+             "close_approach_date": full, "velocity_kms": velocity}
+            for day, asteroid_id, name, hazardous, full, velocity in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Number of cached days and approaches, plus this process's counters."""
+        with self._lock:
+            counts = dict(self._counts)
+        try:
+            conn = self._connection()
+            days = conn.execute("SELECT COUNT(*) FROM feed_days").fetchone()[0]
+            approaches = conn.execute("SELECT COUNT(*) FROM close_approaches").fetchone()[0]
+        except sqlite3.Error:
+            days, approaches = None, None
+        return {"days": days, "approaches": approaches, **counts}
+
+
+def _to_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def default_feed_cache_path() -> str:
+    """Configured feed cache database (FEED_CACHE_PATH, or neo_feed.sqlite3 in DATA_DIR)."""
+    return config.FEED_CACHE_PATH or os.path.join(config.DATA_DIR, "neo_feed.sqlite3")
+
+
+@lru_cache(maxsize=2)
+def _load_feed_cache(path: str) -> FeedCache:
+    return FeedCache(path)
+
+
+def get_feed_cache(path: Optional[str] = None) -> FeedCache:
+    """
+    Returns the shared feed cache.
+
+    Args:
+        path: Cache database; defaults to default_feed_cache_path()
+    """
+    return _load_feed_cache(path or default_feed_cache_path())
+
+
+def parse_date_range(start_date: str, end_date: str) -> List[date]:
+    """
+    Expands an inclusive 'YYYY-MM-DD' range into its days.
+
+    Raises:
+        ValueError: If a date is malformed, the range is reversed, or it
+            spans more than MAX_RANGE_DAYS days.
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError("end_date must not be before start_date")
+    length = (end - start).days + 1
+    if length > MAX_RANGE_DAYS:
+        raise ValueError(f"Date range must not exceed {MAX_RANGE_DAYS} days")
+    return [start + timedelta(days=offset) for offset in range(length)]
+
+
+def plan_feed_requests(missing: List[date]) -> List[Tuple[date, date]]:
+    """
+    Groups missing days into /feed windows spanning at most NEO_FEED_MAX_SPAN_DAYS.
+
+    Each window starts at the earliest uncovered day and ends at the last
+    missing day within reach, so short gaps between missing days are
+    fetched together rather than costing a request each.
+    """
+    windows = []
+    for day in sorted(missing):
+        if windows and day <= windows[-1][0] + timedelta(days=NEO_FEED_MAX_SPAN_DAYS):
+            windows[-1] = (windows[-1][0], day)
+        else:
+            windows.append((day, day))
+    return windows
+
+
+def _day_ttl(day: date, today: date) -> float:
+    return config.NEO_FEED_PAST_DAY_CACHE_TTL_S if day < today else config.NEO_FEED_CACHE_TTL_S
+
+
+def get_asteroids_by_date(start_date: str, end_date: str, cache: Optional[FeedCache] = None) -> Dict[str, Any]:
+    """
+    Returns the asteroids making close approaches in a date range.
+
+    Args:
+        start_date: First day, 'YYYY-MM-DD'
+        end_date: Last day (inclusive), 'YYYY-MM-DD'
+        cache: Bucket store; defaults to get_feed_cache()
+
+    Returns:
+        A dictionary with 'data' (asteroids in date order, as parsed by
+        NasaApiClient.get_asteroids_by_date) and 'error'.
+
+    Raises:
+        FeedRequestBudgetError: If the uncached days would take more than
+            MAX_FEED_REQUESTS_PER_QUERY /feed requests.
+    """
+    try:
+        days = parse_date_range(start_date, end_date)
+    except ValueError as e:
+        return {"data": None, "error": str(e)}
+
+    cache = cache or get_feed_cache()
+    keys = [day.isoformat() for day in days]
+    cached = cache.load_days(keys)
+    now = time.time()
+    missing = [day for day, key in zip(days, keys) if key not in cached or cached[key][1] <= now]
+    cache.count("day_hits", len(days) - len(missing))
+
+    if missing:
+        windows = plan_feed_requests(missing)
+        if len(windows) > MAX_FEED_REQUESTS_PER_QUERY:
+            raise FeedRequestBudgetError(
+                f"{len(missing)} uncached days would take {len(windows)} NASA feed requests "
+                f"(at most {MAX_FEED_REQUESTS_PER_QUERY} per query); request a shorter range"
+            )
+        cache.count("requests", len(windows))
+        buckets, errors = _fetch_windows(windows)
+        if buckets:
+            today = date.today()
+            cache.store_days(buckets, {key: _day_ttl(date.fromisoformat(key), today) for key in buckets})
+            cache.count("days_fetched", len(buckets))
+            cached.update({key: (asteroids, 0.0) for key, asteroids in buckets.items()})
+        if errors:
+            unavailable = [day.isoformat() for day in missing if day.isoformat() not in buckets]
+            if any(key not in cached for key in unavailable):
+                logger.error(f"Feed for {start_date}..{end_date} unavailable: {errors[0]}")
+                return {"data": None, "error": errors[0]}
+            cache.count("stale_days", len(unavailable))
+            logger.warning(f"Serving {len(unavailable)} expired feed days: {errors[0]}")
+
+    return {"data": [asteroid for key in keys for asteroid in cached[key][0]], "error": None}
+
+
+def _fetch_windows(windows: List[Tuple[date, date]]) -> Tuple[Dict[str, List[Dict[str, Any]]], List[str]]:
+    """Fetches /feed windows concurrently; returns (buckets for every day of the good windows, errors)."""
+    results = fan_out(*(
+        lambda first=first, last=last: nasa_api_client.get_feed_days(first.isoformat(), last.isoformat())
+        for first, last in windows
+    ))
+
+    buckets, errors = {}, []
+    for (first, last), result in zip(windows, results):
+        if result["error"]:
+            errors.append(result["error"])
+            continue
+        for offset in range((last - first).days + 1):
+            key = (first + timedelta(days=offset)).isoformat()
+            buckets[key] = result["data"].get(key, [])
+    return buckets, errors
+
+
+def get_close_approaches(start_date: str, end_date: str, hazardous_only: bool = False) -> Dict[str, Any]:
+    """
+    Lists close approaches in a date range from the close-approach index.
+
+    Missing days are fetched first, as for get_asteroids_by_date() (which
+    may raise FeedRequestBudgetError).
+
+    Returns:
+        A dictionary with 'data' (approaches in time order: date, id, name,
+        is_hazardous, close_approach_date, velocity_kms) and 'error'.
+    """
+    cache = get_feed_cache()
+    result = get_asteroids_by_date(start_date, end_date, cache)
+    if result["error"]:
+        return result
+    return {"data": cache.approaches_between(start_date, end_date, hazardous_only), "error": None}
+
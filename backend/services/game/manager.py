@@ -5,8 +5,7 @@ from backend.services.game.session import GameSession
 from backend.services.game.defense import simulate_defense_attempt
 # Import the physics calculation class, assuming the user meant backend.physics
 from backend.physics.impact import ImpactPhysics
-# This service is not yet implemented, so we will use mock data.
-# from services.population_service import get_population_in_radius
+from backend.services.population_service import estimate_casualties
 
 # Note: get_level_unlocks is not directly used in the manager but is part of the game logic suite.
 from backend.services.game.progression import get_level_unlocks
@@ -113,10 +112,13 @@ class GameManager:
             impact_angle_degrees=asteroid.get("impact_angle_deg", 45),
         )
         
-        # MOCK DATA for population as the service doesn't exist yet
-        # A real implementation would call:
-        # population_data = get_population_in_radius(impact_lat, impact_lng, radius_km)
-        casualties = int(impact_effects.get("effects", {}).get("thermal_radius_km", 0) * 10000)
+        # Casualties from the population inside each damage ring; without the
+        # local population grid fall back to a rough estimate from the thermal radius
+        casualty_estimate = estimate_casualties(impact_lat, impact_lng, impact_effects.get("effects", {}))
+        if casualty_estimate is not None:
+            casualties = casualty_estimate["casualties"]
+        else:
+            casualties = int(impact_effects.get("effects", {}).get("thermal_radius_km", 0) * 10000)
 
         # Calculate score based on impact
         energy_megatons = impact_effects.get("impact_energy", {}).get("effective_energy_tnt_mt", 0)
@@ -129,6 +131,7 @@ class GameManager:
         return {
             "impact_effects": impact_effects,
             "casualties": casualties,
+            "population_exposure": casualty_estimate["rings"] if casualty_estimate else None,
             "score_added": score,
             "leveled_up": score_result["leveled_up"],
             "new_level": score_result["new_level"],
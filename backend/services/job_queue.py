@@ -0,0 +1,248 @@
+"""
+A local job queue for slow analyses, backed by a bounded process pool.
+
+Request handlers submit work and return immediately with a job ID; clients
+poll for status, progress and results. Results are cached by a hash of the
+task name and its inputs, so identical submissions share one computation.
+
+Job state (status, progress, results) lives in the memory of the process that
+owns the queue. A job can only be polled or cancelled through the process it
+was submitted to, so the job API requires the app to run as a single worker
+process (e.g. gunicorn -w 1 --threads N); the pool provides the parallelism.
+"""
+import hashlib
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Worker-side handles to the shared progress/cancellation maps (set per process)
+_worker_progress = None
+_worker_cancelled = None
+
+
+class JobCancelledError(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+class JobQueueFullError(Exception):
+    """Raised when the queue already holds the maximum number of pending jobs."""
+
+
+def _init_worker(progress, cancelled):
+    """Process pool initializer: keep the shared maps for report_progress."""
+    global _worker_progress, _worker_cancelled
+    _worker_progress = progress
+    _worker_cancelled = cancelled
+
+
+def _run_job(job_id: str, fn: Callable, params: Dict[str, Any]) -> Any:
+    """Executes a job in a worker process with a progress callback."""
+    def report_progress(fraction: float):
+        # Doubles as the cooperative cancellation point for long tasks
+        if _worker_cancelled is not None and _worker_cancelled.get(job_id):
+            raise JobCancelledError(job_id)
+        if _worker_progress is not None:
+            _worker_progress[job_id] = max(0.0, min(1.0, float(fraction)))
+
+    report_progress(0.0)
+    result = fn(params, report_progress)
+    report_progress(1.0)
+    return result
+
+
+def input_hash(task: str, params: Dict[str, Any]) -> str:
+    """Stable hash of a task name and its JSON-serializable parameters."""
+    payload = json.dumps({"task": task, "params": params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Job:
+    """State of a single submitted job."""
+
+    def __init__(self, job_id: str, task: str, params: Dict[str, Any], params_hash: str):
+        self.job_id = job_id
+        self.task = task
+        self.params = params
+        self.input_hash = params_hash
+        self.status = "queued"
+        self.progress = 0.0
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.submitted_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.future = None
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ("queued", "running", "cancelling")
+
+    def to_dict(self, include_result: bool = True) -> Dict[str, Any]:
+        data = {
+            "job_id": self.job_id,
+            "task": self.task,
+            "status": self.status,
+            "progress": self.progress,
+            "input_hash": self.input_hash,
+            "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+        if include_result and self.status == "completed":
+            data["result"] = self.result
+        return data
+
+
+class JobQueue:
+    """
+    Submits callables of the form fn(params, report_progress) to a bounded
+    process pool and tracks them by job ID.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16,
+                 result_cache_size: int = 128, job_ttl_s: float = 3600):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.result_cache_size = result_cache_size
+        self.job_ttl_s = job_ttl_s
+
+        # Re-entrant: future callbacks may fire synchronously inside submit/cancel
+        self._lock = threading.RLock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._jobs_by_hash: Dict[str, str] = {}
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress = None
+        self._cancelled = None
+
+    def _ensure_executor(self):
+        """Starts the pool (and the shared progress maps) on first use."""
+        if self._executor is None:
+            context = multiprocessing.get_context("spawn")
+            self._manager = context.Manager()
+            self._progress = self._manager.dict()
+            self._cancelled = self._manager.dict()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(self._progress, self._cancelled),
+            )
+            logger.info(f"Started job queue with {self.max_workers} worker processes")
+
+    def submit(self, task: str, fn: Callable, params: Dict[str, Any]) -> Job:
+        """
+        Submits a job, or returns the existing job for identical inputs.
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued or running.
+        """
+        params_hash = input_hash(task, params)
+
+        with self._lock:
+            self._purge_expired()
+
+            existing_id = self._jobs_by_hash.get(params_hash)
+            existing = self._jobs.get(existing_id) if existing_id else None
+            if existing and (existing.is_active or existing.status == "completed"):
+                self._jobs.move_to_end(existing.job_id)
+                return existing
+
+            pending = sum(1 for job in self._jobs.values() if job.is_active)
+            if pending >= self.max_pending:
+                raise JobQueueFullError(f"Job queue is full ({pending} pending jobs)")
+
+            self._ensure_executor()
+            job = Job(str(uuid.uuid4()), task, params, params_hash)
+            self._jobs[job.job_id] = job
+            self._jobs_by_hash[params_hash] = job.job_id
+
+            job.future = self._executor.submit(_run_job, job.job_id, fn, params)
+            job.future.add_done_callback(lambda future, job=job: self._on_done(job, future))
+            return job
+
+    def _on_done(self, job: Job, future):
+        """Records the outcome of a finished future (runs off the request thread)."""
+        with self._lock:
+            job.finished_at = time.time()
+            if future.cancelled():
+                job.status = "cancelled"
+            else:
+                error = future.exception()
+                if error is None:
+                    job.status = "completed"
+                    job.result = future.result()
+                    job.progress = 1.0
+                elif isinstance(error, JobCancelledError):
+                    job.status = "cancelled"
+                else:
+                    job.status = "failed"
+                    job.error = str(error)
+                    logger.error(f"Job {job.job_id} ({job.task}) failed: {error}")
+
+            if self._progress is not None:
+                self._progress.pop(job.job_id, None)
+                self._cancelled.pop(job.job_id, None)
+            self._trim_results()
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Returns a job with its latest progress, or None if unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in ("queued", "running") and self._progress is not None:
+                progress = self._progress.get(job_id)
+                if progress is not None:
+                    job.status = "running"
+                    job.progress = progress
+            return job
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """
+        Cancels a job. Queued jobs are dropped immediately; running jobs are
+        asked to stop at their next progress report.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.is_active:
+                return job
+            if job.future.cancel():
+                job.status = "cancelled"
+                job.finished_at = time.time()
+            else:
+                self._cancelled[job_id] = True
+                job.status = "cancelling"
+            return job
+
+    def _purge_expired(self):
+        """Forgets finished jobs older than the TTL (lock held by caller)."""
+        cutoff = time.time() - self.job_ttl_s
+        for job_id in [jid for jid, job in self._jobs.items()
+                       if not job.is_active and job.finished_at and job.finished_at < cutoff]:
+            self._forget(job_id)
+
+    def _trim_results(self):
+        """Bounds the number of cached finished jobs (lock held by caller)."""
+        finished = [jid for jid, job in self._jobs.items() if not job.is_active]
+        for job_id in finished[:max(0, len(finished) - self.result_cache_size)]:
+            self._forget(job_id)
+
+    def _forget(self, job_id: str):
+        job = self._jobs.pop(job_id, None)
+        if job and self._jobs_by_hash.get(job.input_hash) == job_id:
+            del self._jobs_by_hash[job.input_hash]
+
+    def shutdown(self):
+        """Stops the worker pool without waiting for running jobs."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._manager.shutdown()
+            self._executor = None
@@ -0,0 +1,207 @@
+"""
+This service exposes the mitigation physics (deflection sweeps, launch windows,
+campaign planning) as background jobs.
+
+Each task is a top-level function taking (params, report_progress) so it can
+run in a worker process of the shared job queue. report_progress is also the
+cancellation checkpoint, so every task calls it regularly (per porkchop
+chunk, per scenario, per block of campaign search nodes). Results are
+converted to plain JSON types before they leave the worker.
+"""
+import math
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+from config import config
+from config.constants import DEFAULT_MAX_LAUNCH_C3_KM2_S2
+from backend.services.job_queue import JobQueue
+
+# Porkchop rows per chunk (one progress / cancellation checkpoint each); at least 10 chunks
+PORKCHOP_CHUNK_ROWS = 16
+
+# Keyword arguments the tasks pass themselves; not accepted from clients
+RESERVED_PARAMS = ("porkchop", "progress")
+
+# --- Task implementations (executed in worker processes) ---
+
+def to_serializable(value: Any) -> Any:
+    """Recursively converts NumPy types to JSON-friendly Python types (NaN -> None)."""
+    if isinstance(value, dict):
+        return {str(key): to_serializable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_serializable(item) for item in value]
+    if isinstance(value, np.ndarray):
+        return to_serializable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def run_mission_comparison(params: Dict[str, Any], report_progress: Callable) -> Dict[str, Any]:
+    """Compares single-method missions for one asteroid."""
+    from backend.physics.mitigation import MitigationStrategies
+
+    result = MitigationStrategies.mission_comparison(
+        params["asteroid_params"],
+        params.get("orbital_params", {}),
+        params.get("mission_scenarios"),
+        progress=report_progress
+    )
+    return to_serializable(result)
+
+
+def _porkchop_in_chunks(params: Dict[str, Any], step_days: float, report_progress: Callable,
+                        progress_share: float = 1.0) -> Dict[str, Any]:
+    """Computes a porkchop grid in departure-date chunks, reporting progress per chunk."""
+    from backend.physics.lambert import LambertSolver
+
+    departure_start = params["departure_start_jd"]
+    departure_stop = params["departure_stop_jd"]
+    if step_days <= 0 or departure_stop < departure_start:
+        raise ValueError("departure_stop_jd must not precede departure_start_jd and step_days must be > 0")
+    n_departures = int(np.floor((departure_stop - departure_start) / step_days + 1e-9)) + 1
+    n_chunks = min(max(1, n_departures), max(10, -(-n_departures // PORKCHOP_CHUNK_ROWS)))
+    chunk_bounds = np.array_split(np.arange(n_departures), n_chunks)
+
+    chunks = []
+    for index, rows in enumerate(chunk_bounds):
+        report_progress(progress_share * index / n_chunks)
+        chunks.append(LambertSolver.porkchop(
+            params["orbital_elements"],
+            departure_start + rows[0] * step_days,
+            departure_start + rows[-1] * step_days,
+            params["arrival_start_jd"],
+            params["arrival_stop_jd"],
+            departure_step_days=step_days,
+            arrival_step_days=step_days,
+            min_tof_days=params.get("min_tof_days", 30.0)
+        ))
+
+    porkchop = {
+        "departure_jd": np.concatenate([chunk["departure_jd"] for chunk in chunks]),
+        "arrival_jd": chunks[0]["arrival_jd"],
+    }
+    for key in ("tof_days", "c3_km2_s2", "arrival_relative_velocity_ms"):
+        porkchop[key] = np.concatenate([chunk[key] for chunk in chunks], axis=0)
+    return porkchop
+
+
+def run_porkchop(params: Dict[str, Any], report_progress: Callable) -> Dict[str, Any]:
+    """Computes a porkchop grid and its best launch window."""
+    from backend.physics.lambert import LambertSolver
+
+    porkchop = _porkchop_in_chunks(params, params.get("step_days", 1.0), report_progress)
+    porkchop["best_launch_window"] = LambertSolver.best_launch_window(
+        porkchop,
+        params.get("max_c3_km2_s2", DEFAULT_MAX_LAUNCH_C3_KM2_S2),
+        params.get("objective", "max_relative_velocity")
+    )
+    return to_serializable(porkchop)
+
+
+def run_kinetic_impactor_launch_window(params: Dict[str, Any], report_progress: Callable) -> Dict[str, Any]:
+    """Sizes a kinetic impactor from the best reachable launch window (porkchop computed in chunks)."""
+    from backend.physics.mitigation import MitigationStrategies
+
+    porkchop = _porkchop_in_chunks(params, params.get("step_days", 2.0), report_progress, progress_share=0.95)
+    # min_tof_days only shapes the porkchop; everything else left over goes to kinetic_impactor_mission
+    kwargs = {key: value for key, value in params.items() if key not in ("min_tof_days",) + RESERVED_PARAMS}
+    return to_serializable(MitigationStrategies.kinetic_impactor_launch_window(**kwargs, porkchop=porkchop))
+
+
+def run_kinetic_impactor_monte_carlo(params: Dict[str, Any], report_progress: Callable) -> Dict[str, Any]:
+    """Samples uncertain β, density, diameter and geometry for a kinetic impactor."""
+    from backend.physics.mitigation import MitigationStrategies
+
+    kwargs = dict(params)
+    for key in ("asteroid_diameter_m", "beta_range", "density_range_kg_m3", "percentiles"):
+        if isinstance(kwargs.get(key), list):
+            kwargs[key] = tuple(kwargs[key])
+    return to_serializable(MitigationStrategies.kinetic_impactor_monte_carlo(**kwargs))
+
+
+def run_campaign_plan(params: Dict[str, Any], report_progress: Callable) -> Dict[str, Any]:
+    """Plans a multi-launch deflection campaign."""
+    from backend.physics.campaign import CampaignPlanner
+
+    kwargs = {key: value for key, value in params.items() if key not in RESERVED_PARAMS}
+    return to_serializable(CampaignPlanner.plan_campaign(**kwargs, progress=report_progress))
+
+
+# --- Task registry and queue ---
+
+MITIGATION_TASKS: Dict[str, Dict[str, Any]] = {
+    "mission_comparison": {
+        "function": run_mission_comparison,
+        "description": "Compare kinetic impactor, gravity tractor and nuclear options.",
+        "required_params": ["asteroid_params"],
+    },
+    "porkchop": {
+        "function": run_porkchop,
+        "description": "Launch C3 and arrival relative velocity over a departure x arrival grid.",
+        "required_params": ["orbital_elements", "departure_start_jd", "departure_stop_jd",
+                            "arrival_start_jd", "arrival_stop_jd"],
+    },
+    "kinetic_impactor_launch_window": {
+        "function": run_kinetic_impactor_launch_window,
+        "description": "Kinetic impactor sized from the best reachable launch window.",
+        "required_params": ["asteroid_mass_kg", "asteroid_velocity_ms", "orbital_elements",
+                            "departure_start_jd", "departure_stop_jd",
+                            "arrival_start_jd", "arrival_stop_jd"],
+    },
+    "kinetic_impactor_monte_carlo": {
+        "function": run_kinetic_impactor_monte_carlo,
+        "description": "Distribution of Δv and miss distance under β, density and geometry uncertainty.",
+        "required_params": ["asteroid_diameter_m", "orbital_period_years", "time_to_impact_years"],
+    },
+    "campaign_plan": {
+        "function": run_campaign_plan,
+        "description": "Cheapest multi-launch campaigns reaching a target miss distance.",
+        "required_params": ["asteroid_params", "orbital_params", "candidates",
+                            "target_miss_distance_m"],
+    },
+}
+
+_job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    """Returns the process-wide mitigation job queue (created lazily)."""
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = JobQueue(
+            max_workers=config.MITIGATION_MAX_WORKERS,
+            max_pending=config.MITIGATION_MAX_PENDING_JOBS,
+            result_cache_size=config.MITIGATION_RESULT_CACHE_SIZE,
+            job_ttl_s=config.MITIGATION_JOB_TTL_S,
+        )
+    return _job_queue
+
+
+def submit_mitigation_job(task: str, params: Dict[str, Any]):
+    """
+    Validates and submits a mitigation task.
+
+    Returns:
+        The submitted (or already cached) Job.
+
+    Raises:
+        ValueError: If the task is unknown, required parameters are missing or
+            reserved ones (RESERVED_PARAMS) are given.
+        JobQueueFullError: If the queue is at capacity.
+    """
+    task_spec = MITIGATION_TASKS.get(task)
+    if task_spec is None:
+        raise ValueError(f"Unknown mitigation task '{task}'. Available: {sorted(MITIGATION_TASKS)}")
+
+    missing = [name for name in task_spec["required_params"] if name not in params]
+    if missing:
+        raise ValueError(f"Missing required parameters for '{task}': {missing}")
+    reserved = [name for name in RESERVED_PARAMS if name in params]
+    if reserved:
+        raise ValueError(f"Parameters {reserved} are set by the server and cannot be submitted")
+
+    return get_job_queue().submit(task, task_spec["function"], params)
@@ -0,0 +1,274 @@
+"""
+This service answers population exposure queries from a local gridded
+population raster (e.g. GPW v4 or GHS-POP counts).
+
+The grid is stored as row-wise summed-area tables: a memory-mapped float64
+.npy of shape (n_rows, n_cols + 1) where entry [i, j] is the population of
+the first j cells of row i. Row 0 starts at 90°N and column 0 at 180°W; the
+cell size follows from the row count (180° / n_rows). For a circle on the
+sphere every row it crosses contributes one contiguous longitude span (the
+span narrows with latitude), so a disc costs two table lookups per row and
+damage rings are differences of discs. Queries for many sites and radii are
+evaluated together as flat arrays.
+
+Build the file with backend/scripts/build_population_grid.py.
+"""
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from config import config
+from config.constants import CASUALTY_RATES, EARTH_RADIUS_KM
+from backend.utils.geodesy import small_circle_half_width
+
+logger = logging.getLogger(__name__)
+
+
+class PopulationGrid:
+    """Memory-mapped row-prefix-sum population grid with vectorized disc queries."""
+
+    # Upper bound on (query, row) pairs evaluated per vectorized chunk
+    MAX_SPANS_PER_CHUNK = 2_000_000
+
+    def __init__(self, path: str):
+        self.path = path
+        self.prefix = np.load(path, mmap_mode='r')
+        if self.prefix.dtype != np.float64 or self.prefix.ndim != 2:
+            raise ValueError(f"Population grid {path} must be a 2D float64 array")
+
+        self.n_rows = self.prefix.shape[0]
+        self.n_cols = self.prefix.shape[1] - 1
+        if self.n_cols != 2 * self.n_rows:
+            raise ValueError(f"Population grid {path} has {self.n_cols} columns, expected {2 * self.n_rows}")
+        self.cell_size_deg = 180.0 / self.n_rows
+
+    @property
+    def resolution_arcmin(self) -> float:
+        return self.cell_size_deg * 60.0
+
+    @property
+    def total_population(self) -> float:
+        return float(self.prefix[:, -1].sum())
+
+    def population_in_discs(self, latitudes: np.ndarray, longitudes: np.ndarray,
+                            radii_km: np.ndarray) -> np.ndarray:
+        """
+        Population whose cell centers lie within each great-circle disc.
+
+        Args:
+            latitudes: Disc center latitudes in degrees
+            longitudes: Disc center longitudes in degrees
+            radii_km: Disc radii in km (broadcastable with the centers)
+
+        Returns:
+            Array of populations with the broadcast shape of the inputs
+        """
+        latitudes, longitudes, radii_km = np.broadcast_arrays(
+            np.asarray(latitudes, dtype=float), np.asarray(longitudes, dtype=float),
+            np.asarray(radii_km, dtype=float)
+        )
+        shape = latitudes.shape
+        lat0 = latitudes.ravel()
+        lon0 = longitudes.ravel()
+        radius_km = radii_km.ravel()
+        radius_deg = np.degrees(np.clip(radius_km / EARTH_RADIUS_KM, 0.0, np.pi))
+
+        # Rows whose center latitude is within the angular radius of the center
+        d = self.cell_size_deg
+        top = lat0 + radius_deg
+        bottom = lat0 - radius_deg
+        first_row = np.clip(np.ceil((90.0 - top) / d - 0.5), 0, self.n_rows).astype(np.int64)
+        last_row = np.clip(np.floor((90.0 - bottom) / d - 0.5), -1, self.n_rows - 1).astype(np.int64)
+        row_counts = np.where(radius_km > 0, np.maximum(last_row - first_row + 1, 0), 0)
+
+        totals = np.zeros(len(lat0))
+        query_ends = np.cumsum(row_counts)
+        start = 0
+        while start < len(lat0):
+            # Chunk whole queries so the flat (query, row) arrays stay bounded
+            offset = query_ends[start - 1] if start else 0
+            stop = max(int(np.searchsorted(query_ends, offset + self.MAX_SPANS_PER_CHUNK, side='right')), start + 1)
+            queries = np.arange(start, stop)
+            counts = row_counts[queries]
+            owner = np.repeat(queries, counts)
+            if len(owner):
+                first_span = np.repeat(np.cumsum(counts) - counts, counts)
+                rows = first_row[owner] + np.arange(len(owner)) - first_span
+                totals[start:stop] = np.bincount(
+                    owner - start, weights=self._row_spans(rows, lat0[owner], lon0[owner], radius_km[owner]),
+                    minlength=stop - start
+                )
+            start = stop
+        return totals.reshape(shape)
+
+    def _row_spans(self, rows: np.ndarray, lat0: np.ndarray, lon0: np.ndarray,
+                   radius_km: np.ndarray) -> np.ndarray:
+        """Population of the longitude span of a disc on each given row."""
+        d = self.cell_size_deg
+        half_width = small_circle_half_width(lat0, radius_km, 90.0 - (rows + 0.5) * d)
+
+        first_col = np.ceil((lon0 - half_width + 180.0) / d - 0.5).astype(np.int64)
+        n_cells = np.floor((lon0 + half_width + 180.0) / d - 0.5).astype(np.int64) - first_col + 1
+        n_cells = np.clip(n_cells, 0, self.n_cols)
+        first_col = np.mod(first_col, self.n_cols)
+        end_col = first_col + n_cells
+
+        row_total = self.prefix[rows, self.n_cols]
+        wraps = end_col > self.n_cols
+        spans = self.prefix[rows, np.minimum(end_col, self.n_cols)] - self.prefix[rows, first_col]
+        spans += np.where(wraps, self.prefix[rows, np.where(wraps, end_col - self.n_cols, 0)], 0.0)
+        return np.where(n_cells >= self.n_cols, row_total, spans)
+
+    def population_in_rings(self, latitudes: Union[float, np.ndarray], longitudes: Union[float, np.ndarray],
+                            radii_km: Sequence[float]) -> np.ndarray:
+        """
+        Population in concentric annuli around one or more sites.
+
+        Args:
+            latitudes: Site latitudes in degrees (scalar or (M,))
+            longitudes: Site longitudes in degrees (scalar or (M,))
+            radii_km: Ring outer radii in km, ascending (R,)
+
+        Returns:
+            Array of shape (M, R) (or (R,) for a scalar site); column k is the
+            population between radii_km[k-1] and radii_km[k]
+        """
+        radii_km = np.asarray(radii_km, dtype=float)
+        if np.any(np.diff(radii_km) < 0):
+            raise ValueError("radii_km must be in ascending order")
+        lats = np.atleast_1d(np.asarray(latitudes, dtype=float))
+        lons = np.atleast_1d(np.asarray(longitudes, dtype=float))
+
+        discs = self.population_in_discs(lats[:, None], lons[:, None], radii_km[None, :])
+        rings = np.diff(discs, axis=1, prepend=0.0)
+        return rings[0] if np.ndim(latitudes) == 0 else rings
+
+
+def default_population_grid_path() -> str:
+    """Configured grid location (POPULATION_GRID_PATH, or population_prefix.npy in DATA_DIR)."""
+    return config.POPULATION_GRID_PATH or os.path.join(config.DATA_DIR, "population_prefix.npy")
+
+
+@lru_cache(maxsize=2)
+def _load_population_grid(path: str) -> Optional[PopulationGrid]:
+    if not os.path.exists(path):
+        logger.warning(f"Population grid not found at {path}")
+        return None
+    try:
+        grid = PopulationGrid(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load population grid {path}: {e}")
+        return None
+    logger.info(f"Loaded population grid {path} ({grid.resolution_arcmin:g} arc-minute cells)")
+    return grid
+
+
+def get_population_grid(path: Optional[str] = None) -> Optional[PopulationGrid]:
+    """
+    Returns the shared population grid, or None if no grid file is available.
+
+    Args:
+        path: Grid file; defaults to default_population_grid_path()
+    """
+    return _load_population_grid(path or default_population_grid_path())
+
+
+def get_population_in_radius(lat: float, lng: float, radius_km: float) -> Optional[float]:
+    """
+    Population within radius_km of a point, or None without a population grid.
+    """
+    grid = get_population_grid()
+    if grid is None:
+        return None
+    return float(grid.population_in_discs(lat, lng, radius_km))
+
+
+def get_population_exposure(lat: float, lng: float, rings_km: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    """
+    Population inside each named damage ring, innermost ring first.
+
+    Args:
+        lat: Impact latitude
+        lng: Impact longitude
+        rings_km: Ring name -> outer radius in km
+
+    Returns:
+        A dictionary with one entry per ring ('radius_km', 'population' in the
+        annulus and 'cumulative_population'), or None without a population grid.
+    """
+    grid = get_population_grid()
+    if grid is None:
+        return None
+
+    names = sorted(rings_km, key=rings_km.get)
+    radii = [rings_km[name] for name in names]
+    rings = grid.population_in_rings(lat, lng, radii)
+    cumulative = np.cumsum(rings)
+    return {
+        name: {
+            "radius_km": radii[k],
+            "population": float(rings[k]),
+            "cumulative_population": float(cumulative[k]),
+        }
+        for k, name in enumerate(names)
+    }
+
+
+def get_population_exposure_batch(lats: Sequence[float], lngs: Sequence[float],
+                                  radii_km: Sequence[float]) -> Optional[np.ndarray]:
+    """
+    Annulus populations for many impact sites at once.
+
+    Args:
+        lats: Site latitudes (M,)
+        lngs: Site longitudes (M,)
+        radii_km: Ascending ring radii shared by all sites (R,)
+
+    Returns:
+        Array of shape (M, R), or None without a population grid.
+    """
+    grid = get_population_grid()
+    if grid is None:
+        return None
+    return grid.population_in_rings(np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float), radii_km)
+
+
+def estimate_casualties(lat: float, lng: float, effects: Dict[str, float]) -> Optional[Dict[str, Any]]:
+    """
+    Expected casualties from the damage radii of ImpactPhysics.impact_effects_radius.
+
+    Each annulus between consecutive damage radii is weighted by the highest
+    CASUALTY_RATES entry among the effects that reach it.
+
+    Args:
+        lat: Impact latitude
+        lng: Impact longitude
+        effects: Effect radii in km, keyed as in CASUALTY_RATES
+
+    Returns:
+        A dictionary with 'casualties', 'exposed_population' and per-ring
+        'rings', or None without a population grid.
+    """
+    rings_km = {name: effects[name] for name in CASUALTY_RATES if effects.get(name, 0) > 0}
+    exposure = get_population_exposure(lat, lng, rings_km)
+    if exposure is None:
+        return None
+
+    # Every effect reaching past an annulus also applies inside it
+    names = list(exposure)
+    rates = np.maximum.accumulate([CASUALTY_RATES[name] for name in reversed(names)])[::-1]
+    casualties = 0.0
+    for name, rate in zip(names, rates):
+        ring = exposure[name]
+        ring["casualty_rate"] = float(rate)
+        ring["casualties"] = ring["population"] * float(rate)
+        casualties += ring["casualties"]
+
+    return {
+        "casualties": int(round(casualties)),
+        "exposed_population": int(round(max((r["cumulative_population"] for r in exposure.values()), default=0))),
+        "rings": exposure,
+    }
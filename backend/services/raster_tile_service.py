@@ -0,0 +1,230 @@
+"""
+This service renders global intensity rasters (MMI, blast overpressure and
+thermal fluence) for an impact as XYZ web-map tiles.
+
+Fields are evaluated on the Web Mercator pixel grid of each tile in
+vectorized row chunks and encoded either as a colorized PNG or as raw
+little-endian float16 values. Log-scale fields (overpressure, thermal
+fluence) span far more than float16's range (max 65504), so their raw
+tiles hold log10 of the value; see tile_value_encoding(). Rendered tiles are kept in a byte-bounded LRU
+cache keyed by the field, tile address, quantized impact energy and
+quantized impact location, so panning mostly hits cached tiles.
+"""
+import logging
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+import numpy as np
+
+from config import config
+from backend.physics.environmental import EnvironmentalEffects
+from backend.utils.geodesy import haversine_km
+
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256
+TILE_FORMATS = ("png", "f16")
+
+# Cache key resolution: 0.05 dex in energy (~12%) and 0.01 degrees in location
+ENERGY_LOG10_STEP = 0.05
+LOCATION_STEP_DEG = 0.01
+
+# Color ramp anchors (position, RGB) shared by all fields
+_RAMP_STOPS = np.array([0.0, 0.25, 0.5, 0.75, 1.0])
+_RAMP_COLORS = np.array([
+    [255, 255, 178],
+    [254, 204, 92],
+    [253, 141, 60],
+    [240, 59, 32],
+    [189, 0, 38],
+], dtype=float)
+
+
+def _mmi_field(energy_j: float, distances_km: np.ndarray) -> np.ndarray:
+    magnitude = (np.log10(energy_j) - 4.8) / 1.5 if energy_j > 0 else 0
+    _, mmi = EnvironmentalEffects.seismic_intensity_at_distance(magnitude, distances_km)
+    return mmi
+
+
+FIELDS: Dict[str, Dict[str, Any]] = {
+    "mmi": {
+        "function": _mmi_field,
+        "units": "MMI",
+        "description": "Modified Mercalli Intensity from the equivalent earthquake magnitude.",
+        "scale": "linear",
+        "range": (2.0, 10.0),
+    },
+    "overpressure": {
+        "function": EnvironmentalEffects.overpressure_at_distance,
+        "units": "psi",
+        "description": "Peak blast overpressure.",
+        "scale": "log",
+        "range": (0.1, 100.0),
+    },
+    "thermal": {
+        "function": EnvironmentalEffects.thermal_fluence_at_distance,
+        "units": "J/m^2",
+        "description": "Thermal radiation fluence from the fireball.",
+        "scale": "log",
+        "range": (1e4, 1e8),
+    },
+}
+
+_tile_cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+_tile_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def quantize_impact(energy_j: float, impact_lat: float, impact_lon: float) -> Tuple[float, float, float]:
+    """Snaps an impact to the cache grid; tiles are rendered for the snapped values."""
+    log_energy = round(np.log10(energy_j) / ENERGY_LOG10_STEP) * ENERGY_LOG10_STEP
+    return (
+        float(10.0 ** log_energy),
+        round(round(impact_lat / LOCATION_STEP_DEG) * LOCATION_STEP_DEG, 6),
+        round(round(impact_lon / LOCATION_STEP_DEG) * LOCATION_STEP_DEG, 6),
+    )
+
+
+def tile_pixel_coordinates(z: int, x: int, y: int, tile_size: int = TILE_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Latitudes (rows) and longitudes (columns) of the pixel centers of an
+    XYZ Web Mercator tile.
+    """
+    n = 2 ** z
+    offsets = (np.arange(tile_size) + 0.5) / tile_size
+    lons = (x + offsets) / n * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / n))))
+    return lats, lons
+
+
+def evaluate_field(field: str, energy_j: float, impact_lat: float, impact_lon: float,
+                   lats: np.ndarray, lons: np.ndarray, chunk_rows: int = 64) -> np.ndarray:
+    """
+    Evaluates a field on the grid lats x lons in chunks of rows.
+
+    Args:
+        field: One of FIELDS
+        energy_j: Impact energy in Joules
+        impact_lat: Impact latitude in degrees
+        impact_lon: Impact longitude in degrees
+        lats: Row latitudes in degrees
+        lons: Column longitudes in degrees
+        chunk_rows: Rows evaluated per vectorized chunk
+
+    Returns:
+        float32 array of shape (len(lats), len(lons))
+    """
+    function = FIELDS[field]["function"]
+    lats = np.asarray(lats, dtype=float)
+    lons = np.asarray(lons, dtype=float)
+    grid = np.empty((len(lats), len(lons)), dtype=np.float32)
+
+    for start in range(0, len(lats), chunk_rows):
+        rows = lats[start:start + chunk_rows, None]
+        distances_km = haversine_km(impact_lat, impact_lon, rows, lons[None, :])
+        grid[start:start + chunk_rows] = function(energy_j, distances_km)
+    return grid
+
+
+def _normalize(field: str, values: np.ndarray) -> np.ndarray:
+    """Maps field values to [0, 1] on the field's display scale (NaN below range)."""
+    low, high = FIELDS[field]["range"]
+    if FIELDS[field]["scale"] == "log":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (np.log10(values) - np.log10(low)) / (np.log10(high) - np.log10(low))
+    else:
+        t = (values - low) / (high - low)
+    return np.where(values >= low, np.clip(t, 0.0, 1.0), np.nan)
+
+
+def tile_value_encoding(field: str) -> str:
+    """How raw tiles of a field store values: 'log10' for log-scale fields, else 'linear'."""
+    return "log10" if FIELDS[field]["scale"] == "log" else "linear"
+
+
+def encode_f16(field: str, values: np.ndarray) -> bytes:
+    """Encodes values as little-endian float16, as log10(value) for log-scale fields (-inf where 0)."""
+    if tile_value_encoding(field) == "log10":
+        with np.errstate(divide='ignore'):
+            values = np.log10(values)
+    return values.astype("<f2").tobytes()
+
+
+def encode_png(rgba: np.ndarray) -> bytes:
+    """Encodes an (H, W, 4) uint8 array as a PNG (no filtering, zlib level 6)."""
+    height, width, _ = rgba.shape
+    raw = np.zeros((height, width * 4 + 1), dtype=np.uint8)  # filter byte 0 per row
+    raw[:, 1:] = rgba.reshape(height, width * 4)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)) + chunk(b"IEND", b""))
+
+
+def colorize(field: str, values: np.ndarray) -> np.ndarray:
+    """Applies the shared color ramp; values below the field range are transparent."""
+    t = _normalize(field, values)
+    visible = ~np.isnan(t)
+    t = np.nan_to_num(t)
+
+    rgba = np.zeros(values.shape + (4,), dtype=np.uint8)
+    for channel in range(3):
+        rgba[..., channel] = np.interp(t, _RAMP_STOPS, _RAMP_COLORS[:, channel])
+    rgba[..., 3] = np.where(visible, 80 + 150 * t, 0)
+    return rgba
+
+
+def render_tile(field: str, z: int, x: int, y: int, energy_j: float,
+                impact_lat: float, impact_lon: float, fmt: str = "png") -> bytes:
+    """
+    Returns an encoded tile, rendering it only on a cache miss.
+
+    Raises:
+        ValueError: If the field, format or tile address is invalid.
+    """
+    if field not in FIELDS:
+        raise ValueError(f"Unknown field '{field}'. Available: {sorted(FIELDS)}")
+    if fmt not in TILE_FORMATS:
+        raise ValueError(f"Unknown tile format '{fmt}'. Available: {list(TILE_FORMATS)}")
+    if not (0 <= z <= 22 and 0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise ValueError(f"Invalid tile address {z}/{x}/{y}")
+    if energy_j <= 0:
+        raise ValueError("energy_j must be positive")
+
+    energy_q, lat_q, lon_q = quantize_impact(energy_j, impact_lat, impact_lon)
+    key = (field, fmt, z, x, y, energy_q, lat_q, lon_q)
+
+    global _tile_cache_bytes
+    with _cache_lock:
+        tile = _tile_cache.get(key)
+        if tile is not None:
+            _tile_cache.move_to_end(key)
+            return tile
+
+    lats, lons = tile_pixel_coordinates(z, x, y)
+    values = evaluate_field(field, energy_q, lat_q, lon_q, lats, lons)
+    if fmt == "png":
+        tile = encode_png(colorize(field, values))
+    else:
+        tile = encode_f16(field, values)
+
+    with _cache_lock:
+        if key not in _tile_cache:
+            _tile_cache[key] = tile
+            _tile_cache_bytes += len(tile)
+            while _tile_cache_bytes > config.RASTER_TILE_CACHE_MAX_BYTES and len(_tile_cache) > 1:
+                _, evicted = _tile_cache.popitem(last=False)
+                _tile_cache_bytes -= len(evicted)
+    return tile
+
+
+def tile_cache_stats() -> Dict[str, int]:
+    """Number of cached tiles and their total size."""
+    with _cache_lock:
+        return {"tiles": len(_tile_cache), "bytes": _tile_cache_bytes}
@@ -0,0 +1,413 @@
+"""
+This service runs the gridded tsunami models for an ocean impact, combining
+the impact source from EnvironmentalEffects.tsunami_generation with the
+local bathymetry grid.
+
+Travel-time maps depend only on the source cell, so they are cached per
+(resolution, source cell); repeat impacts near the same spot are served
+from the cache. They are computed on a global graph per resolution, which
+is large (millions of edges), so only the resolutions in
+TRAVEL_TIME_RESOLUTIONS_DEG are offered. Graphs are built one at a time on
+a background thread, either at startup (prepare_travel_time_graphs) or on
+first use. Requests made while a graph is still being built raise
+TravelTimeGraphNotReady.
+"""
+import csv
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from config import config
+from backend.physics.environmental import EnvironmentalEffects
+from backend.physics.tsunami import ShallowWaterModel, TravelTimeModel
+from backend.services.bathymetry_service import load_bathymetry
+from backend.utils.geodesy import great_circle_points, haversine_km
+from config.constants import EARTH_RADIUS_KM
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ISOCHRONE_LEVELS_H = [0.5, 1, 2, 3, 4, 6, 8, 10, 12, 15, 18, 24]
+
+# Grid resolutions with a global travel-time graph; requests snap to the nearest
+TRAVEL_TIME_RESOLUTIONS_DEG = (0.25, 0.5, 1.0, 2.0)
+
+_travel_time_cache: "OrderedDict[Tuple[float, int], np.ndarray]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+_graph_executor: Optional[ThreadPoolExecutor] = None
+_graph_builds: Dict[float, Future] = {}
+_graphs_lock = threading.Lock()
+
+
+class TravelTimeGraphNotReady(Exception):
+    """The travel-time graph for a resolution is still being built."""
+
+    def __init__(self, resolution_deg: float):
+        super().__init__(f"The {resolution_deg} degree travel-time grid is being prepared; try again shortly.")
+        self.resolution_deg = resolution_deg
+
+
+def simulate_impact_tsunami(
+    impact_energy_j: float,
+    impact_lat: float,
+    impact_lon: float,
+    region_radius_deg: float = 30.0,
+    resolution_deg: float = 0.5,
+    duration_h: float = 6.0,
+    snapshot_interval_min: Optional[float] = None,
+    n_workers: Optional[int] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Simulates tsunami propagation from an ocean impact on the bathymetry grid.
+
+    Args:
+        impact_energy_j: Impact energy in Joules.
+        impact_lat: Impact latitude.
+        impact_lon: Impact longitude.
+        region_radius_deg: Half-width of the simulated window around the impact.
+        resolution_deg: Model cell size (coarsened from the bathymetry grid).
+        duration_h: Simulated time in hours.
+        snapshot_interval_min: Interval between stored surface snapshots.
+        n_workers: Worker processes (default: TSUNAMI_MAX_WORKERS).
+
+    Returns:
+        The ShallowWaterModel result plus the source parameters, or None if
+        no bathymetry is available or the impact point is on land.
+    """
+    bathymetry = load_bathymetry()
+    if bathymetry is None:
+        return None
+
+    water_depth_m = float(bathymetry.depth_at(impact_lat, impact_lon))
+    if water_depth_m <= 0:
+        return None
+
+    grid = bathymetry.region(
+        max(impact_lat - region_radius_deg, -80.0), min(impact_lat + region_radius_deg, 80.0),
+        impact_lon - region_radius_deg, impact_lon + region_radius_deg,
+        resolution_deg
+    )
+    source = EnvironmentalEffects.tsunami_generation(impact_energy_j, water_depth_m)
+
+    result = ShallowWaterModel.simulate(
+        grid.depth_m, grid.lats, grid.lons,
+        impact_lat, impact_lon,
+        initial_amplitude_m=source['initial_amplitude_m'],
+        source_radius_m=source['crater_diameter_m'] / 2,
+        duration_s=duration_h * 3600,
+        snapshot_interval_s=snapshot_interval_min * 60 if snapshot_interval_min else None,
+        n_workers=n_workers or config.TSUNAMI_MAX_WORKERS
+    )
+    result['source'] = source
+    result['depth_m'] = grid.depth_m
+    logger.info(f"Tsunami simulation at ({impact_lat}, {impact_lon}): "
+                f"max far-field amplitude {np.nanmax(result['max_amplitude_m']):.2f} m")
+    return result
+
+
+def snap_travel_time_resolution(resolution_deg: float) -> float:
+    """The supported travel-time resolution closest to resolution_deg."""
+    return min(TRAVEL_TIME_RESOLUTIONS_DEG, key=lambda supported: abs(supported - resolution_deg))
+
+
+def _build_travel_time_graph(resolution_deg: float):
+    """Global bathymetry at the given resolution and its travel-time graph."""
+    bathymetry = load_bathymetry()
+    if bathymetry is None:
+        return None
+    grid = bathymetry.region(-80.0, 80.0, -180.0, 180.0, resolution_deg)
+    graph = TravelTimeModel.build_graph(grid.depth_m, grid.lats, grid.lons)
+    logger.info(f"Built tsunami travel-time graph at {resolution_deg} deg ({graph.nnz} edges)")
+    return grid, graph
+
+
+def prepare_travel_time_graphs(resolutions_deg: Iterable[float]) -> Dict[float, Future]:
+    """
+    Starts building the travel-time graphs for the given resolutions in the background.
+
+    Each resolution is snapped to TRAVEL_TIME_RESOLUTIONS_DEG and built at
+    most once; graphs are built one at a time.
+
+    Returns:
+        The build future of each (snapped) resolution.
+    """
+    global _graph_executor
+    futures = {}
+    with _graphs_lock:
+        if _graph_executor is None:
+            _graph_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tsunami-graph")
+        for resolution_deg in resolutions_deg:
+            resolution_deg = snap_travel_time_resolution(float(resolution_deg))
+            future = _graph_builds.get(resolution_deg)
+            if future is None:
+                future = _graph_executor.submit(_build_travel_time_graph, resolution_deg)
+                _graph_builds[resolution_deg] = future
+            futures[resolution_deg] = future
+    return futures
+
+
+def _travel_time_graph(resolution_deg: float):
+    """The prepared (grid, graph) for a resolution, scheduling its build if needed."""
+    future = prepare_travel_time_graphs([resolution_deg])[resolution_deg]
+    if not future.done():
+        raise TravelTimeGraphNotReady(resolution_deg)
+    if future.exception() is not None:
+        # Let the next request retry a failed build
+        with _graphs_lock:
+            if _graph_builds.get(resolution_deg) is future:
+                del _graph_builds[resolution_deg]
+    return future.result()
+
+
+def _source_cell(grid, lat: float, lon: float, search_cells: int = 2) -> Optional[int]:
+    """Flattened index of the nearest wet cell to the impact, within a few cells."""
+    ny, nx = grid.elevation_m.shape
+    j = int(np.clip(np.round((lat - grid.lats[0]) / grid.cell_size_deg), 0, ny - 1))
+    i = int(np.round(((lon - grid.lons[0]) % 360.0) / grid.cell_size_deg)) % nx
+
+    depth = grid.depth_m
+    best, best_distance = None, None
+    for dj in range(-search_cells, search_cells + 1):
+        for di in range(-search_cells, search_cells + 1):
+            jj, ii = j + dj, (i + di) % nx
+            if 0 <= jj < ny and depth[jj, ii] >= 1.0 and (best is None or dj * dj + di * di < best_distance):
+                best, best_distance = jj * nx + ii, dj * dj + di * di
+    return best
+
+
+def get_travel_time_map(impact_lat: float, impact_lon: float,
+                        resolution_deg: float = 0.5) -> Optional[Dict[str, Any]]:
+    """
+    Tsunami travel times from an impact to every ocean cell.
+
+    Args:
+        impact_lat: Impact latitude.
+        impact_lon: Impact longitude.
+        resolution_deg: Grid cell size, snapped to TRAVEL_TIME_RESOLUTIONS_DEG.
+
+    Returns:
+        A dictionary with 'travel_time_s' (float32 raster, NaN on land),
+        'lats', 'lons', the resolution used and the source cell, or None if
+        no bathymetry is available or there is no ocean near the impact.
+
+    Raises:
+        TravelTimeGraphNotReady: If the graph for the resolution is still being built.
+    """
+    resolution_deg = snap_travel_time_resolution(float(resolution_deg))
+    prepared = _travel_time_graph(resolution_deg)
+    if prepared is None:
+        return None
+    grid, graph = prepared
+
+    source = _source_cell(grid, impact_lat, impact_lon)
+    if source is None:
+        return None
+
+    key = (float(resolution_deg), source)
+    with _cache_lock:
+        travel_time_s = _travel_time_cache.get(key)
+        if travel_time_s is not None:
+            _travel_time_cache.move_to_end(key)
+
+    if travel_time_s is None:
+        shape = grid.elevation_m.shape
+        travel_time_s = TravelTimeModel.travel_times(graph, shape, source).astype(np.float32)
+        with _cache_lock:
+            _travel_time_cache[key] = travel_time_s
+            while len(_travel_time_cache) > config.TSUNAMI_TRAVEL_TIME_CACHE_SIZE:
+                _travel_time_cache.popitem(last=False)
+
+    nx = grid.elevation_m.shape[1]
+    return {
+        "travel_time_s": travel_time_s,
+        "lats": grid.lats,
+        "lons": grid.lons,
+        "resolution_deg": float(resolution_deg),
+        "source_cell": {
+            "row": source // nx,
+            "col": source % nx,
+            "lat": float(grid.lats[source // nx]),
+            "lon": float(grid.lons[source % nx]),
+        },
+    }
+
+
+def get_isochrones(impact_lat: float, impact_lon: float, resolution_deg: float = 0.5,
+                   levels_h: Optional[List[float]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Tsunami arrival isochrones as a GeoJSON FeatureCollection.
+
+    Returns:
+        The FeatureCollection (with the source cell in its properties), or
+        None if no travel-time map is available for the impact.
+    """
+    travel_map = get_travel_time_map(impact_lat, impact_lon, resolution_deg)
+    if travel_map is None:
+        return None
+
+    geojson = TravelTimeModel.isochrones_geojson(
+        travel_map["travel_time_s"], travel_map["lats"], travel_map["lons"],
+        levels_h or DEFAULT_ISOCHRONE_LEVELS_H
+    )
+    geojson["properties"] = {
+        "source_cell": travel_map["source_cell"],
+        "resolution_deg": travel_map["resolution_deg"],
+    }
+    return geojson
+
+
+# --- Coastal run-up ---
+
+def default_coastal_points_path() -> str:
+    """Configured dataset location (COASTAL_POINTS_PATH, or coastal_points.csv in DATA_DIR)."""
+    return config.COASTAL_POINTS_PATH or os.path.join(config.DATA_DIR, "coastal_points.csv")
+
+
+@lru_cache(maxsize=2)
+def _load_coastal_points(path: str) -> Optional[Dict[str, np.ndarray]]:
+    if os.path.exists(path):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        points = {
+            "lat": np.array([float(row["lat"]) for row in rows]),
+            "lon": np.array([float(row["lon"]) for row in rows]),
+            "name": np.array([row.get("name") or "" for row in rows], dtype=object),
+            "shore_depth_m": np.array([float(row.get("shore_depth_m") or 10.0) for row in rows]),
+            "beach_slope": np.array([float(row.get("beach_slope") or 0.01) for row in rows]),
+        }
+        logger.info(f"Loaded {len(rows)} coastal points from {path}")
+        return points
+
+    bathymetry = load_bathymetry()
+    if bathymetry is None:
+        logger.warning(f"No coastal points at {path} and no bathymetry grid to derive them from")
+        return None
+
+    wet = bathymetry.depth_m > 0
+    land = ~wet
+    next_to_land = np.zeros_like(wet)
+    next_to_land[1:] |= land[:-1]
+    next_to_land[:-1] |= land[1:]
+    next_to_land[:, 1:] |= land[:, :-1]
+    next_to_land[:, :-1] |= land[:, 1:]
+    rows, cols = np.nonzero(wet & next_to_land)
+    logger.info(f"Derived {len(rows)} coastal points from the bathymetry grid")
+    return {
+        "lat": bathymetry.lats[rows],
+        "lon": bathymetry.lons[cols],
+        "name": np.full(len(rows), "", dtype=object),
+        "shore_depth_m": np.full(len(rows), 10.0),
+        "beach_slope": np.full(len(rows), 0.01),
+    }
+
+
+def load_coastal_points(path: Optional[str] = None) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Loads coastal points from a CSV with 'lat' and 'lon' columns and optional
+    'name', 'shore_depth_m' and 'beach_slope' columns. Without a dataset,
+    coast cells (wet cells next to land) of the bathymetry grid are used.
+
+    Args:
+        path: CSV file; defaults to default_coastal_points_path()
+
+    Returns:
+        A dictionary of arrays ('lat', 'lon', 'name', 'shore_depth_m',
+        'beach_slope'), or None if neither source is available.
+    """
+    return _load_coastal_points(path or default_coastal_points_path())
+
+
+def estimate_coastal_runup(
+    impact_energy_j: float,
+    impact_lat: float,
+    impact_lon: float,
+    top_n: int = 50,
+    max_distance_km: Optional[float] = None,
+    n_path_samples: int = 32
+) -> Optional[Dict[str, Any]]:
+    """
+    Ranks coastal points by estimated tsunami run-up from an ocean impact.
+
+    Args:
+        impact_energy_j: Impact energy in Joules.
+        impact_lat: Impact latitude.
+        impact_lon: Impact longitude.
+        top_n: Number of ranked points to return.
+        max_distance_km: Ignore points farther than this.
+        n_path_samples: Bathymetry samples along each great-circle path.
+
+    Returns:
+        A dictionary with the impact type, source parameters, summary counts
+        and the top_n points by run-up, or None if no coastal points are
+        available. Land impacts (by the land mask, as in
+        complete_environmental_analysis) raise no tsunami: 'impact_type' is
+        'land' and the point list is empty.
+    """
+    if not EnvironmentalEffects.is_ocean_impact(impact_lat, impact_lon):
+        return {
+            "impact_type": "land",
+            "impact_coordinates": (impact_lat, impact_lon),
+            "source": None,
+            "n_points": 0,
+            "n_blocked": 0,
+            "n_runup_over_1m": 0,
+            "max_distance_km": max_distance_km or float(EARTH_RADIUS_KM * np.pi),
+            "points": [],
+        }
+
+    points = load_coastal_points()
+    if points is None:
+        return None
+
+    bathymetry = load_bathymetry()
+    water_depth_m = float(bathymetry.depth_at(impact_lat, impact_lon)) if bathymetry else None
+    source = EnvironmentalEffects.tsunami_generation(impact_energy_j, water_depth_m or None)
+
+    distances_km = haversine_km(impact_lat, impact_lon, points["lat"], points["lon"])
+    selected = np.flatnonzero(distances_km <= max_distance_km) if max_distance_km else np.arange(len(distances_km))
+
+    path_depths_m = None
+    if bathymetry is not None:
+        # Interior samples of each great-circle path (endpoints excluded)
+        path_lats, path_lons = great_circle_points(
+            impact_lat, impact_lon, points["lat"][selected], points["lon"][selected],
+            (np.arange(n_path_samples) + 0.5) / n_path_samples
+        )
+        path_depths_m = bathymetry.depth_at(path_lats, path_lons)
+
+    runup = EnvironmentalEffects.coastal_runup(
+        source, distances_km[selected], path_depths_m,
+        points["shore_depth_m"][selected], points["beach_slope"][selected]
+    )
+
+    ranked = []
+    for index in runup["ranking"][:top_n]:
+        point = selected[index]
+        ranked.append({
+            "lat": float(points["lat"][point]),
+            "lon": float(points["lon"][point]),
+            "name": points["name"][point],
+            "distance_km": float(runup["distances_km"][index]),
+            "arrival_time_h": float(runup["arrival_times_h"][index]),
+            "offshore_amplitude_m": float(runup["offshore_amplitudes_m"][index]),
+            "shore_amplitude_m": float(runup["shore_amplitudes_m"][index]),
+            "runup_m": float(runup["runup_m"][index]),
+            "breaking": bool(runup["breaking"][index]),
+        })
+
+    return {
+        "impact_type": "ocean",
+        "impact_coordinates": (impact_lat, impact_lon),
+        "source": source,
+        "n_points": int(len(selected)),
+        "n_blocked": int(runup["path_blocked"].sum()),
+        "n_runup_over_1m": int((runup["runup_m"] > 1.0).sum()),
+        "max_distance_km": max_distance_km or float(EARTH_RADIUS_KM * np.pi),
+        "points": ranked,
+    }
@@ -0,0 +1,177 @@
+"""
+Spatial index of cities and settlements.
+
+Cities are loaded from a local file, either a GeoNames dump (tab-separated
+'cities*.txt' / 'allCountries.txt' without a header) or a CSV with a header
+row containing 'name', 'lat', 'lon' and optionally 'population' and
+'country'. Coordinates are indexed as 3D unit vectors in a KD-tree, so
+great-circle radius and nearest-neighbour queries become Euclidean chord
+queries without any wrap-around or polar special cases.
+
+Without a local file a small built-in set of major cities is used.
+"""
+
+import csv
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import config
+from backend.utils.geodesy import chord_to_km, km_to_chord, unit_vectors
+
+logger = logging.getLogger(__name__)
+
+# Fallback when no city file is available: (name, country, lat, lon, population)
+DEFAULT_CITIES = [
+    ("New York", "US", 40.7128, -74.0060, 8_336_817),
+    ("London", "GB", 51.5074, -0.1278, 8_961_989),
+    ("Tokyo", "JP", 35.6762, 139.6503, 13_960_000),
+    ("Sydney", "AU", -33.8688, 151.2093, 5_312_163),
+    ("Mexico City", "MX", 19.4326, -99.1332, 9_209_944),
+]
+
+# GeoNames dump columns: name (1), latitude (4), longitude (5), country code (8), population (14)
+_GEONAMES_COLUMNS = (1, 4, 5, 8, 14)
+
+
+class CityIndex:
+    """KD-tree over city positions on the unit sphere."""
+
+    def __init__(self, names: Sequence[str], countries: Sequence[str], latitudes: np.ndarray,
+                 longitudes: np.ndarray, populations: np.ndarray):
+        from scipy.spatial import cKDTree
+
+        self.names = np.asarray(names, dtype=object)
+        self.countries = np.asarray(countries, dtype=object)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.populations = np.asarray(populations, dtype=np.int64)
+        self.tree = cKDTree(unit_vectors(self.latitudes, self.longitudes))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def within_radius(self, latitude: float, longitude: float, radius_km: float,
+                      min_population: int = 0) -> Dict[str, np.ndarray]:
+        """
+        Cities within a great-circle radius, nearest first.
+
+        Args:
+            latitude: Query latitude in degrees
+            longitude: Query longitude in degrees
+            radius_km: Search radius in km
+            min_population: Skip smaller settlements
+
+        Returns:
+            Dictionary with 'indices' and 'distances_km' arrays
+        """
+        point = unit_vectors(latitude, longitude)
+        indices = np.asarray(self.tree.query_ball_point(point, km_to_chord(radius_km) * (1 + 1e-12)), dtype=np.int64)
+        if min_population:
+            indices = indices[self.populations[indices] >= min_population]
+
+        distances_km = chord_to_km(np.linalg.norm(self.tree.data[indices] - point, axis=1))
+        order = np.argsort(distances_km, kind='stable')
+        return {"indices": indices[order], "distances_km": distances_km[order]}
+
+    def nearest(self, latitude: float, longitude: float, k: int = 10,
+                min_population: int = 0) -> Dict[str, np.ndarray]:
+        """
+        The k nearest cities, nearest first.
+
+        With min_population the search widens until k large enough cities
+        are found (or the index is exhausted).
+
+        Args:
+            latitude: Query latitude in degrees
+            longitude: Query longitude in degrees
+            k: Number of cities
+            min_population: Skip smaller settlements
+
+        Returns:
+            Dictionary with 'indices' and 'distances_km' arrays
+        """
+        point = unit_vectors(latitude, longitude)
+        n_query = min(k, len(self))
+        while True:
+            chords, indices = self.tree.query(point, k=max(n_query, 1))
+            chords, indices = np.atleast_1d(chords), np.atleast_1d(indices)
+            keep = self.populations[indices] >= min_population
+            if keep.sum() >= k or n_query >= len(self):
+                break
+            n_query = min(n_query * 4, len(self))
+
+        return {"indices": indices[keep][:k], "distances_km": chord_to_km(chords[keep][:k])}
+
+    def records(self, indices: np.ndarray, distances_km: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """City dictionaries for the given indices."""
+        records = []
+        for n, index in enumerate(indices):
+            record = {
+                "name": self.names[index],
+                "country": self.countries[index],
+                "lat": float(self.latitudes[index]),
+                "lon": float(self.longitudes[index]),
+                "population": int(self.populations[index]),
+            }
+            if distances_km is not None:
+                record["distance_km"] = float(distances_km[n])
+            records.append(record)
+        return records
+
+
+def _read_geonames(path: str):
+    name_col, lat_col, lon_col, country_col, population_col = _GEONAMES_COLUMNS
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) <= population_col:
+                continue
+            yield (fields[name_col], fields[country_col], float(fields[lat_col]),
+                   float(fields[lon_col]), int(fields[population_col] or 0))
+
+
+def _read_csv(path: str):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield (row.get("name", ""), row.get("country", ""), float(row["lat"]),
+                   float(row["lon"]), int(float(row.get("population") or 0)))
+
+
+def default_cities_path() -> str:
+    """Configured city file (CITIES_PATH, or cities15000.txt in DATA_DIR)."""
+    return config.CITIES_PATH or os.path.join(config.DATA_DIR, "cities15000.txt")
+
+
+@lru_cache(maxsize=2)
+def _load_city_index(path: str) -> CityIndex:
+    rows = DEFAULT_CITIES
+    if os.path.exists(path):
+        try:
+            reader = _read_csv if path.lower().endswith('.csv') else _read_geonames
+            rows = list(reader(path))
+            logger.info(f"Loaded {len(rows)} cities from {path}")
+        except (OSError, KeyError, ValueError) as e:
+            logger.error(f"Could not load cities from {path}: {e}")
+            rows = DEFAULT_CITIES
+    else:
+        logger.warning(f"City file not found at {path}; using {len(DEFAULT_CITIES)} built-in cities")
+    if not rows:
+        logger.warning(f"No cities in {path}; using {len(DEFAULT_CITIES)} built-in cities")
+        rows = DEFAULT_CITIES
+
+    names, countries, lats, lons, populations = zip(*rows)
+    return CityIndex(names, countries, np.array(lats), np.array(lons), np.array(populations))
+
+
+def get_city_index(path: Optional[str] = None) -> CityIndex:
+    """
+    Returns the shared city index.
+
+    Args:
+        path: City file; defaults to default_cities_path()
+    """
+    return _load_city_index(path or default_cities_path())
@@ -0,0 +1,239 @@
+"""
+Vectorized geodesy kernels.
+
+All functions take latitudes/longitudes in degrees and broadcast over their
+arguments like NumPy ufuncs, so a distance or destination for a whole grid
+or point cloud is a single call. Computation runs in float64 by default;
+pass dtype=np.float32 to halve memory on very large arrays (about 1 m
+precision at Earth scale is lost in exchange).
+
+Distances are on a sphere of radius EARTH_RADIUS_KM except vincenty_km,
+which uses the WGS84 ellipsoid.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from config.constants import EARTH_RADIUS_KM
+
+# WGS84 ellipsoid
+WGS84_A_KM = 6378.137
+WGS84_F = 1 / 298.257223563
+WGS84_B_KM = WGS84_A_KM * (1 - WGS84_F)
+
+
+def _radians(*values, dtype=np.float64):
+    return [np.radians(np.asarray(value, dtype=dtype)) for value in values]
+
+
+def unit_vectors(latitude, longitude, dtype=np.float64) -> np.ndarray:
+    """Unit vectors (x, y, z) on the sphere; output shape is the broadcast shape + (3,)."""
+    lat, lon = _radians(latitude, longitude, dtype=dtype)
+    lat, lon = np.broadcast_arrays(lat, lon)
+    return np.stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)], axis=-1)
+
+
+def from_unit_vectors(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Latitudes and longitudes (degrees) of vectors along the last axis."""
+    x, y, z = vectors[..., 0], vectors[..., 1], vectors[..., 2]
+    return np.degrees(np.arctan2(z, np.hypot(x, y))), np.degrees(np.arctan2(y, x))
+
+
+def chord_to_km(chord, radius_km: float = EARTH_RADIUS_KM) -> np.ndarray:
+    """Great-circle distance for a chord length between unit vectors."""
+    return 2 * radius_km * np.arcsin(np.clip(np.asarray(chord) / 2, 0.0, 1.0))
+
+
+def km_to_chord(distance_km, radius_km: float = EARTH_RADIUS_KM) -> np.ndarray:
+    """Chord length between unit vectors for a great-circle distance."""
+    angle = np.clip(np.asarray(distance_km) / radius_km, 0.0, np.pi)
+    return 2 * np.sin(angle / 2)
+
+
+def haversine_km(lat1, lon1, lat2, lon2, dtype=np.float64,
+                 radius_km: float = EARTH_RADIUS_KM) -> np.ndarray:
+    """
+    Great-circle distance on a sphere.
+
+    Args:
+        lat1, lon1: First point(s) in degrees
+        lat2, lon2: Second point(s) in degrees
+        dtype: Computation dtype (float64 or float32)
+        radius_km: Sphere radius
+
+    Returns:
+        Distances in km with the broadcast shape of the inputs
+    """
+    lat1, lon1, lat2, lon2 = _radians(lat1, lon1, lat2, lon2, dtype=dtype)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return (2 * radius_km) * np.arcsin(np.sqrt(np.minimum(a, 1)))
+
+
+def vincenty_km(lat1, lon1, lat2, lon2, dtype=np.float64, max_iterations: int = 200,
+                tolerance: float = 1e-12) -> np.ndarray:
+    """
+    Geodesic distance on the WGS84 ellipsoid (Vincenty's inverse formula).
+
+    Pairs iterate together, each dropping out once converged; nearly
+    antipodal pairs where the iteration does not converge fall back to the
+    spherical distance.
+
+    Args:
+        lat1, lon1: First point(s) in degrees
+        lat2, lon2: Second point(s) in degrees
+        dtype: Computation dtype (float64 or float32)
+        max_iterations: Iteration limit
+        tolerance: Convergence tolerance on lambda (radians)
+
+    Returns:
+        Distances in km with the broadcast shape of the inputs
+    """
+    lat1, lon1, lat2, lon2 = np.broadcast_arrays(*_radians(lat1, lon1, lat2, lon2, dtype=dtype))
+    f = WGS84_F
+    u1 = np.arctan((1 - f) * np.tan(lat1))
+    u2 = np.arctan((1 - f) * np.tan(lat2))
+    sin_u1, cos_u1 = np.sin(u1), np.cos(u1)
+    sin_u2, cos_u2 = np.sin(u2), np.cos(u2)
+    l = lon2 - lon1
+
+    def iterate(lam, sin_u1, cos_u1, sin_u2, cos_u2, l):
+        sin_lam, cos_lam = np.sin(lam), np.cos(lam)
+        sin_sigma = np.hypot(cos_u2 * sin_lam, cos_u1 * sin_u2 - sin_u1 * cos_u2 * cos_lam)
+        cos_sigma = sin_u1 * sin_u2 + cos_u1 * cos_u2 * cos_lam
+        sigma = np.arctan2(sin_sigma, cos_sigma)
+        sin_alpha = np.where(sin_sigma > 0, cos_u1 * cos_u2 * sin_lam / sin_sigma, 0.0)
+        cos2_alpha = 1 - sin_alpha ** 2
+        # Equatorial lines have cos2_alpha = 0
+        cos_2sigma_m = np.where(cos2_alpha > 0, cos_sigma - 2 * sin_u1 * sin_u2 / cos2_alpha, 0.0)
+        c = f / 16 * cos2_alpha * (4 + f * (4 - 3 * cos2_alpha))
+        lam_next = l + (1 - c) * f * sin_alpha * (
+            sigma + c * sin_sigma * (cos_2sigma_m + c * cos_sigma * (-1 + 2 * cos_2sigma_m ** 2))
+        )
+        return lam_next, sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m
+
+    # Iterate only the pairs that have not converged yet
+    lam = l.ravel().copy()
+    terms = [a.ravel() for a in (sin_u1, cos_u1, sin_u2, cos_u2, l)]
+    converged = np.zeros(lam.shape, dtype=bool)
+    active = np.arange(lam.size)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for _ in range(max_iterations):
+            lam_next = iterate(lam[active], *(t[active] for t in terms))[0]
+            done = np.abs(lam_next - lam[active]) <= tolerance
+            lam[active] = lam_next
+            converged[active[done]] = True
+            active = active[~done]
+            if not len(active):
+                break
+
+        _, sin_sigma, cos_sigma, sigma, cos2_alpha, cos_2sigma_m = iterate(lam, *terms)
+        u_sq = cos2_alpha * (WGS84_A_KM ** 2 - WGS84_B_KM ** 2) / WGS84_B_KM ** 2
+        a_coef = 1 + u_sq / 16384 * (4096 + u_sq * (-768 + u_sq * (320 - 175 * u_sq)))
+        b_coef = u_sq / 1024 * (256 + u_sq * (-128 + u_sq * (74 - 47 * u_sq)))
+        delta_sigma = b_coef * sin_sigma * (cos_2sigma_m + b_coef / 4 * (
+            cos_sigma * (-1 + 2 * cos_2sigma_m ** 2)
+            - b_coef / 6 * cos_2sigma_m * (-3 + 4 * sin_sigma ** 2) * (-3 + 4 * cos_2sigma_m ** 2)
+        ))
+        distance_km = (WGS84_B_KM * a_coef * (sigma - delta_sigma)).reshape(l.shape)
+        converged = converged.reshape(l.shape)
+
+    if not converged.all():
+        spherical = haversine_km(np.degrees(lat1), np.degrees(lon1), np.degrees(lat2), np.degrees(lon2), dtype=dtype)
+        distance_km = np.where(converged & np.isfinite(distance_km), distance_km, spherical)
+    return distance_km
+
+
+def initial_bearing(lat1, lon1, lat2, lon2, dtype=np.float64) -> np.ndarray:
+    """Initial great-circle bearing from point 1 to point 2, degrees clockwise from north in [0, 360)."""
+    lat1, lon1, lat2, lon2 = _radians(lat1, lon1, lat2, lon2, dtype=dtype)
+    dlon = lon2 - lon1
+    y = np.sin(dlon) * np.cos(lat2)
+    x = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return np.degrees(np.arctan2(y, x)) % 360
+
+
+def destination(lat, lon, bearing_deg, distance_km, dtype=np.float64,
+                radius_km: float = EARTH_RADIUS_KM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Point reached by travelling a distance along an initial bearing.
+
+    Args:
+        lat, lon: Start point(s) in degrees
+        bearing_deg: Initial bearing(s), degrees clockwise from north
+        distance_km: Distance(s) along the great circle
+        dtype: Computation dtype (float64 or float32)
+        radius_km: Sphere radius
+
+    Returns:
+        (latitudes, longitudes) in degrees; longitudes in [-180, 180)
+    """
+    lat, lon, bearing = _radians(lat, lon, bearing_deg, dtype=dtype)
+    angle = np.asarray(distance_km, dtype=dtype) / radius_km
+    sin_lat2 = np.sin(lat) * np.cos(angle) + np.cos(lat) * np.sin(angle) * np.cos(bearing)
+    lat2 = np.arcsin(np.clip(sin_lat2, -1, 1))
+    lon2 = lon + np.arctan2(np.sin(bearing) * np.sin(angle) * np.cos(lat),
+                            np.cos(angle) - np.sin(lat) * sin_lat2)
+    return np.degrees(lat2), (np.degrees(lon2) + 180) % 360 - 180
+
+
+def great_circle_points(lat1, lon1, lat2, lon2, fractions, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Points at fractions of the way along great circles (spherical interpolation).
+
+    Args:
+        lat1, lon1: Start point(s) in degrees
+        lat2, lon2: End point(s) in degrees
+        fractions: Positions along each path, 0 = start and 1 = end, shape (K,)
+        dtype: Computation dtype (float64 or float32)
+
+    Returns:
+        (latitudes, longitudes) of shape broadcast(start, end) + (K,)
+    """
+    a = unit_vectors(lat1, lon1, dtype=dtype)
+    b = unit_vectors(lat2, lon2, dtype=dtype)
+    a, b = np.broadcast_arrays(a, b)
+    fractions = np.asarray(fractions, dtype=dtype)
+
+    omega = np.arccos(np.clip(np.sum(a * b, axis=-1), -1, 1))[..., None]
+    short = omega < 1e-9
+    sin_omega = np.where(short, 1, np.sin(omega))
+    # Coincident points fall back to linear interpolation
+    weight_a = np.where(short, 1 - fractions, np.sin((1 - fractions) * omega) / sin_omega)
+    weight_b = np.where(short, fractions, np.sin(fractions * omega) / sin_omega)
+    points = weight_a[..., None] * a[..., None, :] + weight_b[..., None] * b[..., None, :]
+    return from_unit_vectors(points)
+
+
+def small_circle(lat, lon, radius_km, n_points: int = 72, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vertices of circles of constant great-circle distance around centers.
+
+    Args:
+        lat, lon: Center(s) in degrees
+        radius_km: Circle radius (or radii)
+        n_points: Vertices per circle
+        dtype: Computation dtype (float64 or float32)
+
+    Returns:
+        (latitudes, longitudes) of shape broadcast(center, radius) + (n_points,)
+    """
+    bearings = np.linspace(0, 360, n_points, endpoint=False, dtype=dtype)
+    lat, lon, radius_km = (np.asarray(v, dtype=dtype)[..., None] for v in (lat, lon, radius_km))
+    return destination(lat, lon, bearings, radius_km, dtype=dtype)
+
+
+def small_circle_half_width(center_lat, radius_km, lat, dtype=np.float64,
+                            radius_earth_km: float = EARTH_RADIUS_KM) -> np.ndarray:
+    """
+    Longitude half-width (degrees) of a small circle at a given latitude.
+
+    Points at latitude `lat` within radius_km of a center at `center_lat`
+    span center_lon ± half-width. Latitudes the circle does not reach give
+    0 and latitudes inside a polar cap give 180.
+    """
+    center_lat, lat = _radians(center_lat, lat, dtype=dtype)
+    angle = np.clip(np.asarray(radius_km, dtype=dtype) / radius_earth_km, 0, np.pi)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_half_width = (np.cos(angle) - np.sin(lat) * np.sin(center_lat)) / (np.cos(lat) * np.cos(center_lat))
+    return np.degrees(np.arccos(np.clip(np.nan_to_num(cos_half_width, nan=-1), -1, 1)))
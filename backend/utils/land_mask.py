@@ -0,0 +1,112 @@
+"""
+Global land/ocean bitmask lookups.
+
+The mask is a packed-bit equirectangular grid stored as a .npy file
+(uint8, shape (n_rows, n_cols / 8), one bit per cell, little bit order,
+1 = land). Row 0 starts at 90°N and column 0 at 180°W, and the cell size
+follows from the row count (180° / n_rows). The file is memory-mapped, so
+only the pages that are touched are read from disk.
+
+Build the file with backend/scripts/build_land_mask.py.
+"""
+
+import logging
+import os
+from functools import lru_cache
+from typing import Optional, Union
+
+import numpy as np
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+
+class LandMask:
+    """Memory-mapped packed-bit land/ocean mask with O(1) lookups."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.bits = np.load(path, mmap_mode='r')
+        if self.bits.dtype != np.uint8 or self.bits.ndim != 2:
+            raise ValueError(f"Land mask {path} must be a 2D uint8 array")
+
+        self.n_rows = self.bits.shape[0]
+        self.n_cols = 2 * self.n_rows
+        if self.bits.shape[1] * 8 < self.n_cols:
+            raise ValueError(f"Land mask {path} has {self.bits.shape[1]} bytes per row, "
+                             f"expected {(self.n_cols + 7) // 8}")
+        self.cell_size_deg = 180.0 / self.n_rows
+
+    @property
+    def resolution_arcmin(self) -> float:
+        return self.cell_size_deg * 60.0
+
+    def _cells(self, latitude: np.ndarray, longitude: np.ndarray):
+        """Row/column indices of coordinates; longitudes wrap, latitudes clamp."""
+        rows = np.floor((90.0 - latitude) / self.cell_size_deg).astype(np.int64)
+        cols = np.floor((longitude + 180.0) / self.cell_size_deg).astype(np.int64)
+        return np.clip(rows, 0, self.n_rows - 1), np.mod(cols, self.n_cols)
+
+    def is_land_array(self, latitude: Union[float, np.ndarray],
+                      longitude: Union[float, np.ndarray]) -> np.ndarray:
+        """
+        Vectorized land test.
+
+        Args:
+            latitude: Latitudes in degrees (any shape)
+            longitude: Longitudes in degrees (broadcastable to latitude)
+
+        Returns:
+            Boolean array, True over land
+        """
+        latitude, longitude = np.broadcast_arrays(
+            np.asarray(latitude, dtype=float), np.asarray(longitude, dtype=float)
+        )
+        rows, cols = self._cells(latitude, longitude)
+        packed = self.bits[rows, cols >> 3]
+        return ((packed >> (cols & 7).astype(np.uint8)) & 1).astype(bool)
+
+    def is_ocean_array(self, latitude: Union[float, np.ndarray],
+                       longitude: Union[float, np.ndarray]) -> np.ndarray:
+        """Vectorized ocean test (see is_land_array)."""
+        return ~self.is_land_array(latitude, longitude)
+
+    def is_land(self, latitude: float, longitude: float) -> bool:
+        """Scalar land test."""
+        row = min(max(int((90.0 - latitude) // self.cell_size_deg), 0), self.n_rows - 1)
+        col = int((longitude + 180.0) // self.cell_size_deg) % self.n_cols
+        return bool((self.bits[row, col >> 3] >> (col & 7)) & 1)
+
+    def is_ocean(self, latitude: float, longitude: float) -> bool:
+        """Scalar ocean test."""
+        return not self.is_land(latitude, longitude)
+
+
+def default_land_mask_path() -> str:
+    """Configured mask location (LAND_MASK_PATH, or land_mask.npy in DATA_DIR)."""
+    return config.LAND_MASK_PATH or os.path.join(config.DATA_DIR, "land_mask.npy")
+
+
+@lru_cache(maxsize=4)
+def _load_land_mask(path: str) -> Optional[LandMask]:
+    if not os.path.exists(path):
+        logger.warning(f"Land mask not found at {path}; falling back to approximate ocean checks")
+        return None
+    try:
+        mask = LandMask(path)
+    except (OSError, ValueError) as e:
+        logger.error(f"Could not load land mask {path}: {e}")
+        return None
+    logger.info(f"Loaded land mask {path} ({mask.resolution_arcmin:g} arc-minute cells)")
+    return mask
+
+
+def get_land_mask(path: Optional[str] = None) -> Optional[LandMask]:
+    """
+    Returns the shared land mask, or None if no mask file is available.
+
+    Args:
+        path: Mask file; defaults to default_land_mask_path()
+    """
+    return _load_land_mask(path or default_land_mask_path())
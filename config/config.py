@@ -5,7 +5,7 @@ Supports different environments with validation using Pydantic.
 
 import os
 import logging
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from pydantic import field_validator, Field
 from pydantic_settings import BaseSettings
 from pathlib import Path
@@ -48,7 +48,66 @@ class BaseConfig(BaseSettings):
     # Performance settings
     MAX_CONTENT_LENGTH: int = 16 * 1024 * 1024  # 16MB
     REQUEST_TIMEOUT: int = 30  # seconds
-    
+
+    # Upstream HTTP transport (NASA, SBDB, Open-Elevation)
+    HTTP_POOL_CONNECTIONS: int = 10  # hosts with a cached connection pool
+    HTTP_POOL_MAXSIZE: int = 20  # keep-alive connections per host
+    HTTP_MAX_RETRIES: int = 3  # retries on 429/5xx and connection errors
+    HTTP_BACKOFF_BASE_S: float = 0.5
+    HTTP_BACKOFF_MAX_S: float = 8.0
+    ASYNC_HTTP_MAX_CONCURRENCY: int = 16  # in-flight requests per async client
+    HTTP_FANOUT_WORKERS: int = 8  # threads for concurrent sync calls within one request
+
+    # Persistent upstream response cache (shared by all workers)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_PATH: Optional[str] = None  # defaults to DATA_DIR/http_cache.sqlite3
+    HTTP_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB
+    HTTP_CACHE_ERROR_TTL_S: int = 60  # failures are retried after this long
+    HTTP_CACHE_MAX_STALE_S: int = 7 * 24 * 3600  # expired responses served while refreshing or during outages
+    HTTP_REFRESH_WORKERS: int = 2  # background stale-while-revalidate refreshes
+    HTTP_BREAKER_FAILURE_THRESHOLD: int = 5  # consecutive upstream failures that open a circuit
+    HTTP_BREAKER_RESET_TIMEOUT_S: float = 30.0  # open circuits allow a probe after this long
+
+    # Upstream request budgets (token buckets shared by all workers)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PATH: Optional[str] = None  # defaults to DATA_DIR/rate_limits.sqlite3
+    NASA_RATE_LIMIT_PER_HOUR: Optional[int] = None  # defaults to the DEMO_KEY or registered-key quota
+    RATE_LIMIT_BACKGROUND_RESERVE: float = 0.25  # share of each bucket kept for interactive requests
+    RATE_LIMIT_INTERACTIVE_MAX_WAIT_S: float = 2.0  # queueing before falling back to cache
+    RATE_LIMIT_BACKGROUND_MAX_WAIT_S: float = 120.0
+    NEO_LOOKUP_CACHE_TTL_S: int = 24 * 3600
+    NEO_FEED_CACHE_TTL_S: int = 3600  # today and future days of the feed
+    NEO_FEED_PAST_DAY_CACHE_TTL_S: int = 30 * 24 * 3600
+    NEO_BROWSE_CACHE_TTL_S: int = 24 * 3600
+    SBDB_CACHE_TTL_S: int = 24 * 3600
+    ELEVATION_CACHE_TTL_S: int = 30 * 24 * 3600  # terrain does not change
+
+    # Background job settings (mitigation analyses)
+    MITIGATION_MAX_WORKERS: int = 2
+    MITIGATION_MAX_PENDING_JOBS: int = 16
+    MITIGATION_RESULT_CACHE_SIZE: int = 128
+    MITIGATION_JOB_TTL_S: int = 3600
+    MITIGATION_SURFACE_CACHE_SIZE: int = 64
+
+    # Environmental raster tiles
+    RASTER_TILE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+
+    # Local data settings
+    DATA_DIR: str = str(Path(__file__).resolve().parent.parent / "data")
+    LAND_MASK_PATH: Optional[str] = None  # defaults to DATA_DIR/land_mask.npy
+    LAND_MASK_RESOLUTION_ARCMIN: float = 1.0
+    BATHYMETRY_PATH: Optional[str] = None  # defaults to DATA_DIR/bathymetry.npz
+    COASTAL_POINTS_PATH: Optional[str] = None  # defaults to DATA_DIR/coastal_points.csv
+    POPULATION_GRID_PATH: Optional[str] = None  # defaults to DATA_DIR/population_prefix.npy
+    CITIES_PATH: Optional[str] = None  # defaults to DATA_DIR/cities15000.txt (GeoNames dump or CSV)
+    CATALOG_PATH: Optional[str] = None  # defaults to DATA_DIR/asteroid_catalog.sqlite3
+    FEED_CACHE_PATH: Optional[str] = None  # defaults to DATA_DIR/neo_feed.sqlite3
+
+    # Tsunami model settings
+    TSUNAMI_MAX_WORKERS: int = 1  # >1 splits fine grids into row strips across processes
+    TSUNAMI_TRAVEL_TIME_CACHE_SIZE: int = 32
+    TSUNAMI_PRELOAD_RESOLUTIONS_DEG: List[float] = [0.5]  # travel-time graphs built at startup
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -79,6 +79,15 @@ TSUNAMI_EFFICIENCY_OCEAN = 0.5      # Energy transfer efficiency for ocean impac
 TSUNAMI_EFFICIENCY_LAND = 0.1       # Energy transfer efficiency for land impacts
 TSUNAMI_DISSIPATION_LENGTH_KM = 5000  # Typical trans-oceanic dissipation scale
 
+# Casualty rates inside each damage radius (fraction of the exposed population),
+# after Glasstone & Dolan (1977) blast and burn casualty estimates
+CASUALTY_RATES = {
+    'overpressure_20psi_km': 0.95,  # Reinforced structures destroyed
+    'overpressure_5psi_km': 0.50,   # Most buildings collapse
+    'thermal_radius_km': 0.30,      # Third-degree burns
+    'overpressure_1psi_km': 0.01,   # Window breakage, flying glass
+}
+
 # Atmospheric Properties
 ATMOSPHERIC_SCALE_HEIGHT_KM = 8.0  # km
 ATMOSPHERIC_DENSITY_SEA_LEVEL = 1.225  # kg/m^3
@@ -98,6 +107,7 @@ STEEL_YIELD_STRENGTH_PA = 2.5e8  # Pa
 TYPICAL_IMPACTOR_MASS_KG = 1000.0  # kg (1 ton spacecraft)
 TYPICAL_IMPACTOR_VELOCITY_KMS = 10.0  # km/s (relative velocity)
 THRUST_EFFICIENCY_DEFAULT = 0.8  # Default thrust efficiency for spacecraft
+DEFAULT_MAX_LAUNCH_C3_KM2_S2 = 30.0  # km^2/s^2 (medium-lift launcher with a ~1 t payload)
 
 # Deflection efficiency factors for different strategies
 MOMENTUM_TRANSFER_EFFICIENCY = {